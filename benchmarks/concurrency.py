@@ -0,0 +1,121 @@
+# compares fixed concurrency and CONCURRENCY_LIMITER against a local
+# stand-in with injected latency that degrades under load: the service
+# time grows with the square of the requests in flight above capacity
+# and requests above 3 * capacity are answered with 503
+#
+# usage: python benchmarks/concurrency.py [seconds] [latency_ms] [capacity]
+import asyncio
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from league_client.rso.client import RSOClient
+from league_client.rso.concurrency import CONCURRENCY_LIMITER
+
+BODY = b"{}"
+
+
+class StandIn:
+    def __init__(self, latency: float, capacity: int):
+        self.latency = latency
+        self.capacity = capacity
+        self.in_flight = 0
+        self.loop = asyncio.new_event_loop()
+        self.port = 0
+        started = threading.Event()
+        threading.Thread(target=self.run, args=(started,), daemon=True).start()
+        started.wait()
+
+    def run(self, started: threading.Event):
+        asyncio.set_event_loop(self.loop)
+        server = self.loop.run_until_complete(
+            asyncio.start_server(self.handle, "127.0.0.1", 0)
+        )
+        self.port = server.sockets[0].getsockname()[1]
+        started.set()
+        self.loop.run_forever()
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        try:
+            while True:
+                await reader.readuntil(b"\r\n\r\n")
+                writer.write(await self.respond())
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self) -> bytes:
+        if self.in_flight >= self.capacity * 3:
+            return (
+                b"HTTP/1.1 503 Service Unavailable\r\n"
+                b"content-length: 0\r\n\r\n"
+            )
+        self.in_flight += 1
+        try:
+            load = max(self.in_flight / self.capacity, 1)
+            await asyncio.sleep(self.latency * load**2)
+        finally:
+            self.in_flight -= 1
+        return (
+            b"HTTP/1.1 200 OK\r\ncontent-type: application/json\r\n"
+            + f"content-length: {len(BODY)}\r\n\r\n".encode()
+            + BODY
+        )
+
+
+def bench(url: str, threads: int, seconds: float, adaptive: bool):
+    CONCURRENCY_LIMITER.clear()
+    CONCURRENCY_LIMITER.enabled = adaptive
+    ok = 0
+    failed = 0
+    lock = threading.Lock()
+    stop = time.perf_counter() + seconds
+
+    def worker(client: RSOClient):
+        nonlocal ok, failed
+        while time.perf_counter() < stop:
+            try:
+                success = client.get(url).status_code == 200
+            except httpx.HTTPError:
+                success = False
+            with lock:
+                ok += success
+                failed += not success
+
+    with RSOClient(timeout=2, max_connections=threads) as client:
+        with ThreadPoolExecutor(threads) as executor:
+            for _ in range(threads):
+                executor.submit(worker, client)
+    limit = CONCURRENCY_LIMITER.stats().get("127.0.0.1", {}).get("limit")
+    return ok / seconds, failed / seconds, limit
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 50) / 1000
+    capacity = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+    stand_in = StandIn(latency, capacity)
+    url = f"http://127.0.0.1:{stand_in.port}/"
+    print(
+        f"seconds={seconds:.0f} latency={latency * 1000:.0f}ms"
+        f" capacity={capacity}"
+    )
+    for threads, adaptive in [(2, False), (8, False), (64, False), (64, True)]:
+        goodput, errors, limit = bench(url, threads, seconds, adaptive)
+        name = "adaptive" if adaptive else "fixed"
+        print(
+            f"{name:8} threads={threads:<3} goodput={goodput:6.1f}/s"
+            f" errors={errors:6.1f}/s"
+            + (f" limit={limit:.1f}" if limit else "")
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+# compares http/1.1 and http2 for the third phase of get_account_data
+# (loot, rank, honor and 3 inventory requests to one ledge host)
+# against a local tls stand-in server with injected latency
+#
+# requires h2 and the openssl command line tool
+# usage: python benchmarks/http2.py [rounds] [latency_ms]
+import asyncio
+import json
+import os
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import h2.config
+import h2.connection
+import h2.events
+
+CERT_DIR = tempfile.mkdtemp()
+CERT_FILE = os.path.join(CERT_DIR, "cert.pem")
+KEY_FILE = os.path.join(CERT_DIR, "key.pem")
+subprocess.run(
+    [
+        "openssl",
+        "req",
+        "-x509",
+        "-newkey",
+        "rsa:2048",
+        "-nodes",
+        "-days",
+        "1",
+        "-subj",
+        "/CN=localhost",
+        "-addext",
+        "subjectAltName=DNS:localhost",
+        "-keyout",
+        KEY_FILE,
+        "-out",
+        CERT_FILE,
+    ],
+    check=True,
+    capture_output=True,
+)
+# must be set before league_client creates its ssl context
+os.environ["SSL_CERT_FILE"] = CERT_FILE
+
+from league_client.rso.client import RSOClient  # noqa: E402
+from league_client.rso.constants import InventoryTypes  # noqa: E402
+from league_client.rso.honor import get_honor_data  # noqa: E402
+from league_client.rso.inventory import get_inventory_data  # noqa: E402
+from league_client.rso.inventory import get_inventory_data_v2  # noqa: E402
+from league_client.rso.loot import get_loot_data  # noqa: E402
+from league_client.rso.rank import get_rank_data  # noqa: E402
+
+BODY = json.dumps(
+    {"playerLoot": [], "jwt": "", "honorLevel": 2, "data": {"itemsJwt": ""}}
+).encode()
+
+
+class StandIn:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.connections = 0
+        self.loop = asyncio.new_event_loop()
+        self.port = 0
+        started = threading.Event()
+        threading.Thread(target=self.run, args=(started,), daemon=True).start()
+        started.wait()
+
+    def run(self, started: threading.Event):
+        asyncio.set_event_loop(self.loop)
+        ctx = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        ctx.load_cert_chain(CERT_FILE, KEY_FILE)
+        ctx.set_alpn_protocols(["h2", "http/1.1"])
+        server = self.loop.run_until_complete(
+            asyncio.start_server(self.handle, "127.0.0.1", 0, ssl=ctx)
+        )
+        self.port = server.sockets[0].getsockname()[1]
+        started.set()
+        self.loop.run_forever()
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        self.connections += 1
+        ssl_object = writer.get_extra_info("ssl_object")
+        try:
+            if ssl_object.selected_alpn_protocol() == "h2":
+                await self.serve_h2(reader, writer)
+            else:
+                await self.serve_h1(reader, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve_h1(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            await reader.readexactly(length)
+            await asyncio.sleep(self.latency)
+            writer.write(
+                b"HTTP/1.1 200 OK\r\ncontent-type: application/json\r\n"
+                + f"content-length: {len(BODY)}\r\n\r\n".encode()
+                + (b"" if head.startswith(b"HEAD") else BODY)
+            )
+            await writer.drain()
+
+    async def serve_h2(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        config = h2.config.H2Configuration(client_side=False)
+        conn = h2.connection.H2Connection(config=config)
+        conn.initiate_connection()
+        writer.write(conn.data_to_send())
+
+        async def respond(stream_id: int):
+            await asyncio.sleep(self.latency)
+            conn.send_headers(
+                stream_id,
+                [
+                    (":status", "200"),
+                    ("content-type", "application/json"),
+                    ("content-length", str(len(BODY))),
+                ],
+            )
+            conn.send_data(stream_id, BODY, end_stream=True)
+            writer.write(conn.data_to_send())
+
+        while True:
+            data = await reader.read(65535)
+            if not data:
+                return
+            for event in conn.receive_data(data):
+                if isinstance(event, h2.events.StreamEnded):
+                    asyncio.ensure_future(respond(event.stream_id))
+            writer.write(conn.data_to_send())
+
+
+def phase(client: RSOClient, ledge_url: str):
+    args = ("token", "puuid", 1, "location", ledge_url)
+    with ThreadPoolExecutor(6) as executor:
+        futures = [
+            executor.submit(
+                get_loot_data, "token", ledge_url, "puuid", client=client
+            ),
+            executor.submit(get_rank_data, "token", ledge_url, client=client),
+            executor.submit(get_honor_data, "token", ledge_url, client=client),
+            executor.submit(
+                get_inventory_data,
+                *args,
+                [InventoryTypes.champion_skin],
+                client=client,
+            ),
+            executor.submit(
+                get_inventory_data,
+                *args,
+                [InventoryTypes.champion, InventoryTypes.champion_skin],
+                client=client,
+            ),
+            executor.submit(
+                get_inventory_data_v2,
+                *args,
+                [InventoryTypes.queue_entry],
+                client=client,
+            ),
+        ]
+        for future in futures:
+            future.result()
+
+
+def bench(http2: bool, rounds: int, latency: float):
+    stand_in = StandIn(latency)
+    ledge_url = f"https://localhost:{stand_in.port}"
+    start = time.perf_counter()
+    for _ in range(rounds):
+        with RSOClient(http2=http2) as client:
+            phase(client, ledge_url)
+    elapsed = time.perf_counter() - start
+    return stand_in.connections / rounds, elapsed / rounds
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 50) / 1000
+    print(f"rounds={rounds} latency={latency * 1000:.0f}ms")
+    for http2 in [False, True]:
+        connections, wall = bench(http2, rounds, latency)
+        print(
+            f"{'http2' if http2 else 'http/1.1':8} "
+            f"connections/phase={connections:.1f} "
+            f"wall/phase={wall * 1000:.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,11 @@
+import asyncio
 import os
 import time
-import typing
 from pathlib import Path
-from urllib.parse import urljoin
+from typing import Optional
 
+from httpx import AsyncClient
 from httpx import Client
-from httpx.__version__ import __version__
-from httpx._models import Response
-from httpx._types import URLTypes
 
 from league_client.exceptions import LCUConnectionError
 
@@ -16,6 +14,18 @@ RCU_LOCKFILE = os.path.expanduser(
 )
 
 
+def read_lockfile(lockfile: str | Path) -> Optional[tuple[str, str]]:
+    # returns url and password, or None if the client is not ready
+    if not os.path.exists(lockfile):
+        return None
+    with open(lockfile, "r") as fp:
+        data = fp.read()
+        data = data.split(":")
+    if len(data) < 5:
+        return None
+    return f"{data[4]}://127.0.0.1:{data[2]}", data[3]
+
+
 class LeagueConnection(Client):
     def __init__(
         self, lockfile: str | Path = RCU_LOCKFILE, timeout: float = 30
@@ -27,27 +37,51 @@ class LeagueConnection(Client):
                 raise LCUConnectionError(
                     "Please make sure the client is running."
                 )
-            if not os.path.exists(lockfile):
+            data = read_lockfile(lockfile)
+            if data is None:
                 time.sleep(1)
                 continue
-            with open(lockfile, "r") as fp:
-                data = fp.read()
-                data = data.split(":")
-
-                if len(data) < 5:
-                    time.sleep(1)
-                    continue
-                self.url = f"{data[4]}://127.0.0.1:{data[2]}"
-                self.username = "riot"
-                self.password = data[3]
-                break
-
-    def request(
-        self,
-        method: str,
-        url: URLTypes,
-        **kwargs: typing.Any,
-    ) -> Response:
-        kwargs["url"] = urljoin(self.url, str(url))
-        kwargs["auth"] = self.username, self.password
-        return super().request(method, **kwargs)
+            self.url, self.password = data
+            self.username = "riot"
+            break
+        # set once instead of joining url and auth on every request
+        self.base_url = self.url
+        self.auth = self.username, self.password
+
+
+class AsyncLeagueConnection(AsyncClient):
+    # asyncio version of LeagueConnection, the lockfile is awaited in
+    # connect(), which is called when used as async context manager
+    #
+    # async with AsyncLeagueConnection(lockfile) as connection:
+    #     await get_current_summoner(connection)
+    def __init__(
+        self, lockfile: str | Path = RCU_LOCKFILE, timeout: float = 30
+    ):
+        super().__init__(verify=False)
+        self.lockfile = lockfile
+        self.connect_timeout = timeout
+        self.url = ""
+        self.username = "riot"
+        self.password = ""
+
+    async def connect(self):
+        start = time.time()
+        while True:
+            if time.time() - start > self.connect_timeout:
+                raise LCUConnectionError(
+                    "Please make sure the client is running."
+                )
+            data = read_lockfile(self.lockfile)
+            if data is None:
+                await asyncio.sleep(1)
+                continue
+            self.url, self.password = data
+            break
+        self.base_url = self.url
+        self.auth = self.username, self.password
+        return self
+
+    async def __aenter__(self):
+        await super().__aenter__()
+        return await self.connect()
@@ -63,9 +63,16 @@ CHAT_HOSTS = {
 
 CIPHERS = "TLS_AES_128_GCM_SHA256:TLS_AES_256_GCM_SHA384:TLS_CHACHA20_POLY1305_SHA256:ECDHE-ECDSA-AES128-GCM-SHA256:ECDHE-RSA-AES128-GCM-SHA256:ECDHE-ECDSA-AES256-GCM-SHA384:ECDHE-RSA-AES256-GCM-SHA384:ECDHE-ECDSA-CHACHA20-POLY1305:ECDHE-RSA-CHACHA20-POLY1305:ECDHE-RSA-AES128-SHA:ECDHE-RSA-AES256-SHA:AES128-GCM-SHA256:AES256-GCM-SHA384:AES128-SHA:AES256-SHA:DES-CBC3-SHA"
 ECDH_CURVE = "prime256v1"
-SSL_CONTEXT = httpx.create_ssl_context()
-SSL_CONTEXT.set_ciphers(CIPHERS)
-SSL_CONTEXT.set_ecdh_curve(ECDH_CURVE)
+
+
+def create_ssl_context():
+    ssl_context = httpx.create_ssl_context()
+    ssl_context.set_ciphers(CIPHERS)
+    ssl_context.set_ecdh_curve(ECDH_CURVE)
+    return ssl_context
+
+
+SSL_CONTEXT = create_ssl_context()
 
 HEADERS = {
     "User-Agent": (
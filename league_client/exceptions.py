@@ -6,6 +6,14 @@ class RateLimitedError(LeagueClientError):
     pass
 
 
+class DeadlineExceededError(LeagueClientError):
+    pass
+
+
+class WorkerDiedError(LeagueClientError):
+    pass
+
+
 class RSOError(LeagueClientError):
     pass
 
@@ -0,0 +1,212 @@
+import asyncio
+import re
+from typing import Any
+
+from league_client.connection import AsyncLeagueConnection
+from league_client.lcu.aio.loot import get_champion_mastery_chest_count
+from league_client.lcu.aio.loot import get_generic_chest_count
+from league_client.lcu.aio.loot import get_key_count
+from league_client.lcu.aio.loot import get_key_fragment_count
+from league_client.lcu.aio.loot import get_loot
+from league_client.lcu.aio.loot import get_masterwork_chest_count
+
+
+async def craft(
+    connection: AsyncLeagueConnection,
+    recipe: str,
+    data: list[str],
+    repeat: int = 1,
+):
+    await connection.post(
+        f"/lol-loot/v1/recipes/{recipe}/craft?repeat={repeat}", json=data
+    )
+
+
+async def craft_key_from_key_fragments(
+    connection: AsyncLeagueConnection, repeat: int = 1
+):
+    await craft(
+        connection,
+        "MATERIAL_key_fragment_forge",
+        ["MATERIAL_key_fragment"],
+        repeat,
+    )
+
+
+async def craft_keys_and_generic_chests(
+    connection: AsyncLeagueConnection, retry_limit: int = 10
+):
+    for _ in range(retry_limit):
+        loot = await get_loot(connection)
+        if loot == []:
+            await asyncio.sleep(1)
+            continue
+        forgable_keys = int(await get_key_fragment_count(connection) / 3)
+        key_count = await get_key_count(connection)
+        chest_count = await get_generic_chest_count(connection)
+        chest_count += await get_champion_mastery_chest_count(connection)
+        if (forgable_keys == 0 and key_count == 0) or chest_count == 0:
+            return
+        if forgable_keys > 0:
+            await craft_key_from_key_fragments(connection, forgable_keys)
+            continue
+        if min(key_count, chest_count) > 0:
+            await craft_generic_chests(connection)
+            await craft_champion_mastery_chest(connection)
+
+
+async def craft_keys_and_masterwork_chests(
+    connection: AsyncLeagueConnection, retry_limit: int = 10
+):
+    for _ in range(retry_limit):
+        loot = await get_loot(connection)
+        if loot == []:
+            await asyncio.sleep(1)
+            continue
+
+        forgable_keys = int(await get_key_fragment_count(connection) / 3)
+        key_count = await get_key_count(connection)
+        chest_count = await get_masterwork_chest_count(connection)
+
+        if (forgable_keys == 0 and key_count == 0) or chest_count == 0:
+            return
+        if forgable_keys > 0:
+            await craft_key_from_key_fragments(connection, forgable_keys)
+            continue
+        if min(key_count, chest_count) > 0:
+            await craft_masterwork_chests(connection)
+
+
+async def craft_mythic_essence_into_skin_shard(
+    connection: AsyncLeagueConnection,
+):
+    data = await get_loot(connection)
+    loot_result = [m for m in data if m["lootId"] == "CURRENCY_mythic"]
+    if loot_result == []:
+        return
+    for loot in loot_result:
+        if loot["count"] < 10:
+            return
+        url = f'/lol-loot/v1/recipes/CURRENCY_mythic_forge_13/craft?repeat={loot["count"]//10}'
+        data = [loot["lootName"]]
+        await connection.post(url, json=data)
+
+
+async def craft_generic_chests(
+    connection: AsyncLeagueConnection, repeat: int = 1
+):
+    await craft(
+        connection,
+        "CHEST_generic_OPEN",
+        ["CHEST_generic", "MATERIAL_key"],
+        repeat,
+    )
+
+
+async def craft_masterwork_chests(
+    connection: AsyncLeagueConnection, repeat: int = 1
+):
+    await craft(
+        connection, "CHEST_224_OPEN", ["CHEST_224", "MATERIAL_key"], repeat
+    )
+
+
+async def craft_champion_mastery_chest(
+    connection: AsyncLeagueConnection, repeat: int = 1
+):
+    await craft(
+        connection,
+        "CHEST_687_OPEN",
+        ["CHEST_687", "MATERIAL_key"],
+        repeat,
+    )
+
+
+async def craft_chest_by_loot_id(
+    connection: AsyncLeagueConnection,
+    loot_id: str,
+    requires_key: bool = True,
+    repeat: int = 1,
+):
+    data = [loot_id]
+    if requires_key:
+        data.append("MATERIAL_key")
+    await craft(connection, f"{loot_id}_OPEN", data, repeat)
+
+
+async def craft_chest_loots(
+    connection: AsyncLeagueConnection,
+    loots: list[dict[str, Any]],
+    requires_key: bool = True,
+):
+    for loot in loots:
+        count: int = loot["count"]
+        if requires_key:
+            key_count: int = await get_key_count(connection)
+            if key_count == 0:
+                return
+            count: int = min(count, key_count)
+        await craft_chest_by_loot_id(
+            connection, loot["lootId"], requires_key=requires_key, repeat=count
+        )
+        await asyncio.sleep(1)
+
+
+async def craft_orbs(connection: AsyncLeagueConnection, retry_limit: int = 10):
+    for _ in range(retry_limit):
+        loot = await get_loot(connection)
+        if loot == []:
+            await asyncio.sleep(1)
+            continue
+        orbs = [l for l in loot if "orb" in l["localizedName"].lower()]
+        await craft_chest_loots(connection, orbs, requires_key=False)
+
+
+async def craft_bags(connection: AsyncLeagueConnection, retry_limit: int = 10):
+    for _ in range(retry_limit):
+        loot = await get_loot(connection)
+        if loot == []:
+            await asyncio.sleep(1)
+            continue
+        bags = [l for l in loot if "bag" in l["localizedName"].lower()]
+        await craft_chest_loots(connection, bags, requires_key=False)
+
+
+async def craft_eternals_capsules(
+    connection: AsyncLeagueConnection, retry_limit: int = 10
+):
+    for _ in range(retry_limit):
+        loot = await get_loot(connection)
+        if loot == []:
+            await asyncio.sleep(1)
+            continue
+        eternals_capsules = [
+            l
+            for l in loot
+            if "eternals" in l["localizedName"].lower()
+            and "capsule" in l["localizedName"].lower()
+        ]
+        await craft_chest_loots(
+            connection, eternals_capsules, requires_key=False
+        )
+
+
+async def craft_champion_capsules(connection: AsyncLeagueConnection):
+    data = await get_loot(connection)
+    data = [
+        m
+        for m in data
+        if re.fullmatch(
+            "CHEST_((?!(generic|224|champion_mastery|687)).)*", m["lootId"]
+        )
+    ]
+    if data == []:
+        return
+
+    for loot in data:
+        url = "/lol-loot/v1/recipes/%s_OPEN/craft?repeat=%d" % (
+            loot["lootName"],
+            loot["count"],
+        )
+        data = [loot["lootName"]]
+        await connection.post(url, json=data)
@@ -0,0 +1,39 @@
+from typing import Any
+
+from league_client.connection import AsyncLeagueConnection
+from league_client.lcu.aio.loot import get_champion_shards
+from league_client.lcu.aio.loot import get_eternals
+from league_client.lcu.aio.loot import get_ward_skins
+
+
+async def get_disenchant_recipe(
+    connection: AsyncLeagueConnection, loot_id: str
+):
+    res = await connection.get(f"/lol-loot/v1/recipes/initial-item/{loot_id}")
+    res.raise_for_status()
+    recipes = [r for r in res.json() if r["type"] == "DISENCHANT"]
+    return recipes[0]
+
+
+async def disenchant(connection: AsyncLeagueConnection, loot: Any):
+    for data in loot:
+        recipe = await get_disenchant_recipe(connection, data["lootId"])
+        url = f'/lol-loot/v1/recipes/{recipe["recipeName"]}/craft?repeat={data["count"]}'
+        data = [data["lootName"]]
+        res = await connection.post(url, json=data)
+        res.raise_for_status()
+
+
+async def disenchant_eternals(connection: AsyncLeagueConnection):
+    data = await get_eternals(connection)
+    return await disenchant(connection, data)
+
+
+async def disenchant_ward_skins(connection: AsyncLeagueConnection):
+    data = await get_ward_skins(connection)
+    return await disenchant(connection, data)
+
+
+async def disenchant_champion_shards(connection: AsyncLeagueConnection):
+    data = await get_champion_shards(connection)
+    return await disenchant(connection, data)
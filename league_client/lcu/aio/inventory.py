@@ -0,0 +1,25 @@
+from league_client.connection import AsyncLeagueConnection
+from league_client.lcu.inventory import get_is_chroma
+
+
+async def get_inventory_by_type(
+    connection: AsyncLeagueConnection, inventory_type: str
+):
+    res = await connection.get(f"/lol-inventory/v2/inventory/{inventory_type}")
+    res.raise_for_status()
+    return res.json()
+
+
+async def get_owned_skins(
+    connection: AsyncLeagueConnection, filter_chroma: bool = True
+):
+    data = await get_inventory_by_type(connection, "CHAMPION_SKIN")
+    if data is None:
+        return None
+    data = [s["itemId"] for s in data if s["owned"]]
+    if filter_chroma:
+        res = await connection.get("/lol-catalog/v1/items/CHAMPION_SKIN")
+        res.raise_for_status()
+        catalog = res.json()
+        data = [i for i in data if not get_is_chroma(catalog, i)]
+    return data
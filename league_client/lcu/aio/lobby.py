@@ -0,0 +1,79 @@
+from league_client.connection import AsyncLeagueConnection
+
+
+async def get_lobby_data(connection: AsyncLeagueConnection):
+    """Returns the lobby json"""
+    res = await connection.get("/lol-lobby/v2/lobby")
+    res.raise_for_status()
+    return res.json()
+
+
+async def get_lobby_members(connection: AsyncLeagueConnection):
+    """Returns the lobby members json"""
+    res = await connection.get("/lol-lobby/v2/lobby/members")
+    res.raise_for_status()
+    return res.json()
+
+
+async def create_lobby(connection: AsyncLeagueConnection, queue_id: int):
+    """Creates a lobby with the queue id given"""
+    data = {"queueId": queue_id}
+    if queue_id in [2000, 2010, 2020]:
+        res = await connection.post(
+            "/lol-lobby/v2/matchmaking/quick-search", json=data
+        )
+        res.raise_for_status()
+        return res.json()
+
+    res = await connection.post("/lol-lobby/v2/lobby", json=data)
+    res.raise_for_status()
+    return res.json()
+
+
+async def delete_lobby(connection: AsyncLeagueConnection):
+    """Deletes the current lobby"""
+    await connection.delete("/lol-lobby/v2/lobby")
+
+
+async def get_lobby_invitations(connection: AsyncLeagueConnection):
+    """Returns the lobby invitations json"""
+    res = await connection.get("/lol-lobby/v2/lobby/invitations")
+    res.raise_for_status()
+    return res.json()
+
+
+async def invite_summoners_by_id(
+    connection: AsyncLeagueConnection, summoner_ids: list[int]
+):
+    """Invites summoners to the lobby by their summoner id"""
+    data = [{"toSummonerId": id} for id in summoner_ids]
+    res = await connection.post("/lol-lobby/v2/lobby/invitations", json=data)
+    res.raise_for_status()
+    return res.json()
+
+
+async def get_received_invitations(connection: AsyncLeagueConnection):
+    """Returns the received invitations json"""
+    res = await connection.get("/lol-lobby/v2/received-invitations")
+    res.raise_for_status()
+    return res.json()
+
+
+async def accept_invitation(
+    connection: AsyncLeagueConnection, invitation_id: str
+):
+    """Accepts an invitation by the invitation id"""
+    res = await connection.post(
+        f"/lol-lobby/v2/received-invitations/{invitation_id}/accept"
+    )
+    res.raise_for_status()
+
+
+async def decline_invitation(
+    connection: AsyncLeagueConnection, invitation_id: str
+):
+    """Declines an invitation by the invitation id"""
+    res = await connection.post(
+        f"/lol-lobby/v2/received-invitations/{invitation_id}/decline"
+    )
+    res.raise_for_status()
@@ -0,0 +1,104 @@
+import re
+
+from league_client.connection import AsyncLeagueConnection
+
+SKIN_SHARD_RE = "CHAMPION_SKIN_RENTAL_[0-9]+"
+SKIN_SHARD_PERMA_RE = "CHAMPION_SKIN_[0-9]+"
+
+
+async def get_loot(connection: AsyncLeagueConnection):
+    res = await connection.get("/lol-loot/v1/player-loot")
+    res.raise_for_status()
+    return res.json()
+
+
+async def get_player_loot_map(connection: AsyncLeagueConnection):
+    res = await connection.get("/lol-loot/v1/player-loot-map")
+    res.raise_for_status()
+    return res.json()
+
+
+async def get_loot_count(
+    connection: AsyncLeagueConnection, loot_id: str
+) -> int:
+    loot = await get_loot(connection)
+    filtered_loot = [l for l in loot if l["lootId"] == loot_id]
+    if filtered_loot == []:
+        return 0
+    return filtered_loot[0]["count"]
+
+
+async def get_loot_by_id(connection: AsyncLeagueConnection, loot_id: str):
+    res = await connection.get(f"/lol-loot/v1/player-loot/{loot_id}")
+    res.raise_for_status()
+    return res.json()
+
+
+async def get_loot_by_pattern(connection: AsyncLeagueConnection, pattern: str):
+    res = await connection.get("/lol-loot/v1/player-loot-map")
+    res.raise_for_status()
+    data = [
+        s for s in res.json().values() if re.fullmatch(pattern, s["lootId"])
+    ]
+    return data
+
+
+async def get_eternals(connection: AsyncLeagueConnection):
+    loot = await get_loot(connection)
+    return [l for l in loot if l["type"] == "STATSTONE_SHARD"]
+
+
+async def get_ward_skins(connection: AsyncLeagueConnection):
+    loot = await get_loot(connection)
+    return [l for l in loot if l["type"].startswith("WARDSKIN_")]
+
+
+async def get_champion_shards(connection: AsyncLeagueConnection):
+    loot = await get_loot(connection)
+    return [l for l in loot if l["type"] in ["CHAMPION", "CHAMPION_RENTAL"]]
+
+
+async def get_skin_shards(connection: AsyncLeagueConnection):
+    return await get_loot_by_pattern(connection, SKIN_SHARD_RE)
+
+
+async def get_perma_skin_shards(connection: AsyncLeagueConnection):
+    return await get_loot_by_pattern(connection, SKIN_SHARD_PERMA_RE)
+
+
+async def get_skin_shards_ids(connection: AsyncLeagueConnection):
+    return [s["storeItemId"] for s in await get_skin_shards(connection)]
+
+
+async def get_perma_skin_shards_ids(connection: AsyncLeagueConnection):
+    return [s["storeItemId"] for s in await get_perma_skin_shards(connection)]
+
+
+async def get_key_fragment_count(connection: AsyncLeagueConnection) -> int:
+    return await get_loot_count(connection, "MATERIAL_key_fragment")
+
+
+async def get_key_count(connection: AsyncLeagueConnection) -> int:
+    return await get_loot_count(connection, "MATERIAL_key")
+
+
+async def get_generic_chest_count(connection: AsyncLeagueConnection) -> int:
+    return await get_loot_count(connection, "CHEST_generic")
+
+
+async def get_champion_mastery_chest_count(
+    connection: AsyncLeagueConnection,
+) -> int:
+    return await get_loot_count(connection, "CHEST_687")
+
+
+async def get_masterwork_chest_count(connection: AsyncLeagueConnection) -> int:
+    return await get_loot_count(connection, "CHEST_224")
+
+
+async def get_blue_essence_count(connection: AsyncLeagueConnection) -> int:
+    return await get_loot_count(connection, "CURRENCY_champion")
+
+
+async def get_orange_essence_count(connection: AsyncLeagueConnection):
+    return await get_loot_count(connection, "CURRENCY_cosmetic")
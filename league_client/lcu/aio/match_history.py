@@ -0,0 +1,44 @@
+from typing import Any
+
+from league_client.connection import AsyncLeagueConnection
+
+
+async def get_match_history(connection: AsyncLeagueConnection, puuid: str):
+    res = await connection.get(
+        f"/lol-match-history/v1/products/lol/{puuid}/matches"
+    )
+    res.raise_for_status()
+    return res.json()
+
+
+async def get_participants(
+    connection: AsyncLeagueConnection, puuid: str, summoner_id: str
+):
+    history = await get_match_history(connection, puuid)
+    data: list[dict[str, Any]] = []
+    for game in history["games"]["games"]:
+        pid = None
+        for p in game["participantIdentities"]:
+            if p["player"]["summonerId"] == summoner_id:
+                pid = p["participantId"]
+                break
+        if pid is None:
+            continue
+        for p in game["participants"]:
+            if p["participantId"] == pid:
+                data.append(p)
+    return data
+
+
+async def get_flash_key(
+    connection: AsyncLeagueConnection, puuid: str, summoner_id: str
+):
+    participants = await get_participants(connection, puuid, summoner_id)
+    d_count = 0
+    f_count = 0
+    for p in participants:
+        if p["spell1Id"] == 4:
+            d_count += 1
+        if p["spell2Id"] == 4:
+            f_count += 1
+    return "d" if d_count > f_count else "f"
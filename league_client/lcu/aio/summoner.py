@@ -0,0 +1,30 @@
+from league_client.connection import AsyncLeagueConnection
+
+
+async def get_summoners_by_name(
+    connection: AsyncLeagueConnection, names: list[str]
+):
+    res = await connection.post("/lol-summoner/v2/summoners/names", json=names)
+    res.raise_for_status()
+    return res.json()
+
+
+async def get_current_summoner(connection: AsyncLeagueConnection):
+    res = await connection.get("/lol-summoner/v1/current-summoner")
+    res.raise_for_status()
+    return res.json()
+
+
+async def get_summoner_level(connection: AsyncLeagueConnection):
+    data = await get_current_summoner(connection)
+    return data["summonerLevel"] + data["percentCompleteForNextLevel"] / 100
+
+
+async def get_summoner_puuid(connection: AsyncLeagueConnection):
+    data = await get_current_summoner(connection)
+    return data["puuid"]
+
+
+async def get_summoner_id(connection: AsyncLeagueConnection):
+    data = await get_current_summoner(connection)
+    return data["summonerId"]
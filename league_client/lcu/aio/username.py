@@ -0,0 +1,7 @@
+from league_client.connection import AsyncLeagueConnection
+
+
+async def get_username(connection: AsyncLeagueConnection):
+    res = await connection.get("/lol-login/v1/login-platform-credentials")
+    res.raise_for_status()
+    return res.json().get("username")
@@ -0,0 +1,7 @@
+from league_client.connection import AsyncLeagueConnection
+
+
+async def get_wallet(connection: AsyncLeagueConnection):
+    res = await connection.get("/lol-store/v1/wallet")
+    res.raise_for_status()
+    return res.json()
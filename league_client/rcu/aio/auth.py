@@ -0,0 +1,52 @@
+from league_client.connection import AsyncLeagueConnection
+
+
+async def get_rq_data_and_site_key(riot_connection: AsyncLeagueConnection):
+    await riot_connection.delete("/rso-authenticator/v1/authentication")
+    res = await riot_connection.post(
+        "/rso-authenticator/v1/authentication/riot-identity/start",
+        json={
+            "language": "en_GB",
+            "productId": "riot-client",
+            "state": "auth",
+        },
+    )
+    res.raise_for_status()
+    return res.json()["captcha"]["hcaptcha"]
+
+
+async def get_is_authorized(riot_connection: AsyncLeagueConnection):
+    res = await riot_connection.get("/rso-auth/v1/authorization")
+    return res.status_code != 400
+
+
+async def get_is_agreement_required(riot_connection: AsyncLeagueConnection):
+    res = await riot_connection.get("/eula/v1/agreement")
+    if res.status_code == 404:
+        return False
+    res = res.json()
+    if "acceptance" not in res:
+        return False
+    return res["acceptance"] not in ["Accepted", "WaitingForAllServiceData"]
+
+
+async def get_is_age_restricted(
+    riot_connection: AsyncLeagueConnection,
+) -> bool:
+    response = await riot_connection.get(
+        "/age-restriction/v1/age-restriction/products/league_of_legends"
+    )
+    response = response.json()
+    return response.get("restricted", False)
+
+
+async def get_is_country_region_missing(
+    riot_connection: AsyncLeagueConnection,
+) -> bool:
+    response = await riot_connection.get("/riot-client-auth/v1/userinfo")
+    response = response.json()
+    return response.get("country", "npl") == "nan"
+
+
+async def accept_agreement(riot_connection: AsyncLeagueConnection):
+    await riot_connection.put("/eula/v1/agreement/acceptance")
@@ -0,0 +1,8 @@
+from league_client.connection import AsyncLeagueConnection
+
+
+async def get_region(riot_connection: AsyncLeagueConnection):
+    res = await riot_connection.get("/riotclient/region-locale")
+    res.raise_for_status()
+    res = res.json()
+    return res["region"]
@@ -0,0 +1,7 @@
+from league_client.connection import AsyncLeagueConnection
+
+
+async def get_userinfo(riot_connection: AsyncLeagueConnection):
+    res = await riot_connection.get("/riot-client-auth/v1/userinfo")
+    res.raise_for_status()
+    return res.json()
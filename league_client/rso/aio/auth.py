@@ -0,0 +1,227 @@
+import inspect
+from typing import Awaitable
+from typing import Callable
+from typing import Literal
+from typing import Optional
+
+import httpx
+
+from league_client.constants import RIOT_CLIENT_AUTH_PARAMS
+from league_client.exceptions import InvalidSessionError
+from league_client.rso.aio.client import AsyncRSOClient
+from league_client.rso.aio.client import create_async_transport
+from league_client.rso.aio.client import request
+from league_client.rso.aio.tokens import get_or_fetch
+from league_client.rso.auth import build_authorization_request
+from league_client.rso.auth import build_authorize_request
+from league_client.rso.auth import build_captcha_request
+from league_client.rso.auth import build_login_request
+from league_client.rso.auth import process_authorization_response
+from league_client.rso.auth import process_captcha_response
+from league_client.rso.auth import process_login_response
+from league_client.rso.tokens import TOKEN_CACHE
+from league_client.rso.tokens import TokenCache
+from league_client.rso.utils import decode_token
+from league_client.types import ProxyT
+
+
+async def get_pas_token(
+    access_token: str,
+    proxy: Optional[ProxyT] = None,
+    client: Optional[AsyncRSOClient] = None,
+):
+    res = await request(
+        "GET",
+        "https://riot-geo.pas.si.riotgames.com/pas/v1/service/chat",
+        access_token,
+        proxy,
+        client,
+    )
+    res.raise_for_status()
+    return res.text
+
+
+async def get_entitlements_token(
+    access_token: str,
+    proxy: Optional[ProxyT] = None,
+    client: Optional[AsyncRSOClient] = None,
+    cache: Optional[TokenCache] = TOKEN_CACHE,
+) -> str:
+    async def fetch() -> str:
+        res = await request(
+            "POST",
+            "https://entitlements.auth.riotgames.com/api/token/v1",
+            access_token,
+            proxy,
+            client,
+            json={"urn": "urn:entitlement:%"},
+        )
+        res.raise_for_status()
+        return res.json()["entitlements_token"]
+
+    if cache is None:
+        return await fetch()
+    return await get_or_fetch(
+        cache, decode_token(access_token)["sub"], "entitlements", fetch
+    )
+
+
+async def get_login_queue_token(
+    access_token: str,
+    userinfo_token: str,
+    entitlements_token: str,
+    region: str,
+    player_platform_url: str,
+    proxy: Optional[ProxyT] = None,
+    client: Optional[AsyncRSOClient] = None,
+    cache: Optional[TokenCache] = TOKEN_CACHE,
+) -> str:
+    async def fetch() -> str:
+        res = await request(
+            "POST",
+            f"{player_platform_url}"
+            f"/login-queue/v2/login/products/lol/regions/{region}",
+            access_token,
+            proxy,
+            client,
+            json={
+                "clientName": "lcu",
+                "entitlements": entitlements_token,
+                "userinfo": userinfo_token,
+            },
+        )
+        res.raise_for_status()
+        return res.json()["token"]
+
+    if cache is None:
+        return await fetch()
+    return await get_or_fetch(
+        cache, decode_token(access_token)["sub"], "login_queue", fetch
+    )
+
+
+async def get_ledge_token(
+    login_queue_token: str,
+    puuid: str,
+    region: str,
+    player_platform_url: str,
+    proxy: Optional[ProxyT] = None,
+    client: Optional[AsyncRSOClient] = None,
+    cache: Optional[TokenCache] = TOKEN_CACHE,
+) -> str:
+    async def fetch() -> str:
+        res = await request(
+            "POST",
+            f"{player_platform_url}/session-external/v1/session/create",
+            login_queue_token,
+            proxy,
+            client,
+            json={
+                "claims": {"cname": "lcu"},
+                "product": "lol",
+                "puuid": puuid,
+                "region": region.lower(),
+            },
+        )
+        res.raise_for_status()
+        return res.json()
+
+    if cache is None:
+        return await fetch()
+    return await get_or_fetch(cache, puuid, "ledge", fetch)
+
+
+async def get_summoner_token(
+    ledge_token: str,
+    puuid: str,
+    region: str,
+    ledge_url: str,
+    proxy: Optional[ProxyT] = None,
+    client: Optional[AsyncRSOClient] = None,
+    cache: Optional[TokenCache] = TOKEN_CACHE,
+) -> str:
+    async def fetch() -> str:
+        res = await request(
+            "GET",
+            f"{ledge_url}"
+            f"/summoner-ledge/v1/regions/{region}/summoners/puuid/{puuid}/jwt",
+            ledge_token,
+            proxy,
+            client,
+        )
+        res.raise_for_status()
+        return res.json()
+
+    if cache is None:
+        return await fetch()
+    return await get_or_fetch(cache, puuid, "summoner", fetch)
+
+
+async def login_using_ssid(
+    ssid: str,
+    clid: str,
+    auth_params: dict[str, str] = RIOT_CLIENT_AUTH_PARAMS,
+    proxy: Optional[ProxyT] = None,
+) -> tuple[str, str, str, str, str, str, str, str, str]:
+    async with httpx.AsyncClient(
+        transport=create_async_transport(proxy)
+    ) as client:
+        if ssid:
+            client.cookies.set("ssid", ssid, domain="auth.riotgames.com")
+            client.cookies.set("clid", clid, domain="auth.riotgames.com")
+        res = await client.send(
+            build_authorization_request(client, auth_params)
+        )
+        data = process_authorization_response(res, InvalidSessionError)
+        return (client.cookies["ssid"], clid, *data)
+
+
+async def authorize(
+    client: httpx.AsyncClient,
+    username: str,
+    password: str,
+    captcha_solver: Callable[[str, str], str | Awaitable[str]],
+    params: dict[str, str] = RIOT_CLIENT_AUTH_PARAMS,
+    type: Literal["auth", "re-auth"] = "auth",
+):
+    # see league_client.rso.auth.authorize, captcha_solver may be a
+    # coroutine function
+    res = await client.send(
+        build_authorize_request(client, params), follow_redirects=True
+    )
+    res.raise_for_status()
+    res = await client.send(build_captcha_request(client))
+    site_data, site_key = process_captcha_response(res)
+    token = captcha_solver(site_data, site_key)
+    if inspect.isawaitable(token):
+        token = await token
+    res = await client.send(
+        build_login_request(client, username, password, token, type)
+    )
+    request, redirect = process_login_response(client, res, params)
+    res = await client.send(request, follow_redirects=redirect)
+    if not redirect:
+        res.raise_for_status()
+
+
+async def login_using_credentials(
+    username: str,
+    password: str,
+    captcha_solver: Callable[[str, str], str | Awaitable[str]],
+    params: dict[str, str] = RIOT_CLIENT_AUTH_PARAMS,
+    proxy: Optional[ProxyT] = None,
+) -> tuple[str, str, str, str, str, str, str, str, str]:
+    async with httpx.AsyncClient(
+        transport=create_async_transport(proxy)
+    ) as client:
+        await authorize(
+            client,
+            username,
+            password,
+            captcha_solver,
+            params,
+        )
+        # NOTE: IP might be banned at this point
+        res = await client.send(build_authorization_request(client, params))
+        data = process_authorization_response(res)
+        return (client.cookies["ssid"], client.cookies["clid"], *data)
@@ -0,0 +1,350 @@
+import asyncio
+import ssl
+import time
+import weakref
+from collections import defaultdict
+from http.cookiejar import CookieJar
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any
+from typing import AsyncGenerator
+from typing import Awaitable
+from typing import Callable
+from typing import Optional
+
+import httpx
+
+from league_client.constants import HEADERS
+from league_client.constants import SSL_CONTEXT
+from league_client.rso.aio.concurrency import AsyncConcurrencyLimitedTransport
+from league_client.rso.aio.concurrency import LoopRefT
+from league_client.rso.aio.ratelimit import AsyncRateLimitedTransport
+from league_client.rso.aio.retry import AsyncRetryTransport
+from league_client.rso.client import HTTP2_AVAILABLE
+from league_client.rso.client import HTTP2_SSL_CONTEXT
+from league_client.rso.client import BaseClientPool
+from league_client.rso.client import BaseHedger
+from league_client.rso.client import BaseSingleFlight
+from league_client.rso.client import get_endpoint
+from league_client.rso.client import get_pool_key
+from league_client.rso.client import share_json
+from league_client.rso.tokens import REJECTED_STATUS_CODES
+from league_client.rso.tokens import TOKEN_CACHE
+from league_client.rso.utils import get_deadline_timeout
+from league_client.scheduler import get_remaining
+from league_client.types import ProxyT
+
+
+def create_async_transport(
+    proxy: Optional[ProxyT] = None,
+    http2: bool = False,
+    limits: httpx.Limits = httpx.Limits(),
+    ssl_context: ssl.SSLContext = SSL_CONTEXT,
+) -> httpx.AsyncBaseTransport:
+    transport = httpx.AsyncHTTPTransport(
+        verify=ssl_context, http2=http2, limits=limits, proxy=proxy
+    )
+    # requests wait for a token of their host before a request slot,
+    # retries wait for both again
+    return AsyncRetryTransport(
+        AsyncRateLimitedTransport(AsyncConcurrencyLimitedTransport(transport))
+    )
+
+
+class AsyncRSOClient(httpx.AsyncClient):
+    # asyncio version of RSOClient
+    def __init__(
+        self,
+        proxy: Optional[ProxyT] = None,
+        token: str = "",
+        timeout: float = 5,
+        max_connections: int = 100,
+        keepalive_expiry: float = 60,
+        http2: bool = False,
+    ):
+        http2 = http2 and HTTP2_AVAILABLE
+        super().__init__(
+            headers=HEADERS,
+            timeout=timeout,
+            transport=create_async_transport(
+                proxy,
+                http2,
+                httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                    keepalive_expiry=keepalive_expiry,
+                ),
+                HTTP2_SSL_CONTEXT if http2 else SSL_CONTEXT,
+            ),
+            cookies=CookieJar(DefaultCookiePolicy(allowed_domains=[])),
+        )
+        self.proxy = proxy
+        if token:
+            self.headers["Authorization"] = f"Bearer {token}"
+
+    async def request(
+        self, method: str, url: httpx.URL | str, **kwargs: Any
+    ) -> httpx.Response:
+        if "timeout" not in kwargs:
+            kwargs["timeout"] = get_deadline_timeout(self.timeout)
+        return await super().request(method, url, **kwargs)
+
+
+class AsyncClientPool(BaseClientPool[AsyncRSOClient]):
+    # async clients can only be used in the event loop that created
+    # them, so a weak reference to the running loop is part of the key
+    #
+    # the clients of a loop are closed when it shuts down its async
+    # generators, e.g. at the end of asyncio.run, clients of loops that
+    # were closed without are dropped once the next loop is seen
+    def __init__(
+        self,
+        max_clients: int = 128,
+        idle_timeout: float = 120,
+        http2: bool = False,
+    ):
+        super().__init__(max_clients, idle_timeout, http2)
+        # async generator of each loop, closed by loop.shutdown_asyncgens
+        self._hooks: dict[LoopRefT, AsyncGenerator[None, None]] = {}
+        # retired clients of loops that were not running, closed when
+        # their loop shuts down
+        self._pending: defaultdict[LoopRefT, list[AsyncRSOClient]] = (
+            defaultdict(list)
+        )
+        self._client_loops: weakref.WeakKeyDictionary[
+            AsyncRSOClient, LoopRefT
+        ] = weakref.WeakKeyDictionary()
+        # asyncio only keeps weak references to tasks
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def get_key(self, proxy: Optional[ProxyT], url: str) -> tuple[Any, ...]:
+        ref = weakref.ref(asyncio.get_running_loop())
+        with self._lock:
+            if ref not in self._hooks:
+                self._register(ref)
+        return (*get_pool_key(proxy, url), ref)
+
+    def _register(self, ref: LoopRefT):
+        # must be called with self._lock held in the running loop
+        for old in list(self._hooks):
+            loop = old()
+            if loop is None or loop.is_closed():
+                self._remove_loop(old)
+        hook = self._close_on_shutdown(ref)
+        # runs the hook up to its yield, the running loop tracks it from
+        # its first step on
+        try:
+            hook.asend(None).send(None)
+        except StopIteration:
+            pass
+        self._hooks[ref] = hook
+
+    def _remove_loop(self, ref: LoopRefT) -> list[AsyncRSOClient]:
+        # must be called with self._lock held, returns the clients of
+        # the loop
+        self._hooks.pop(ref, None)
+        clients = self._pending.pop(ref, [])
+        for key in [k for k in self._clients if k[-1] is ref]:
+            clients.append(self._clients.pop(key).client)
+        return clients
+
+    async def _close_on_shutdown(
+        self, ref: LoopRefT
+    ) -> AsyncGenerator[None, None]:
+        try:
+            yield
+        finally:
+            with self._lock:
+                clients = self._remove_loop(ref)
+            await asyncio.gather(
+                *(c.aclose() for c in clients), return_exceptions=True
+            )
+
+    def create_client(self, proxy: Optional[ProxyT]) -> AsyncRSOClient:
+        client = AsyncRSOClient(proxy, http2=self.http2)
+        self._client_loops[client] = weakref.ref(asyncio.get_running_loop())
+        return client
+
+    def close_client(self, client: AsyncRSOClient):
+        # must be called with self._lock held, the client is closed in
+        # its loop
+        ref = self._client_loops.pop(client, None)
+        loop = None if ref is None else ref()
+        if ref is None or loop is None or loop.is_closed():
+            # its connections can not be closed without the loop
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if loop is running:
+            task = loop.create_task(client.aclose())
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        elif loop.is_running():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        else:
+            self._pending[ref].append(client)
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        proxy: Optional[ProxyT] = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        pooled = self.acquire(url, proxy)
+        try:
+            return await pooled.client.request(method, url, **kwargs)
+        finally:
+            self.release(pooled)
+
+
+# used by async rso functions when no client is passed
+ASYNC_CLIENT_POOL = AsyncClientPool()
+
+
+class AsyncSingleFlight(BaseSingleFlight):
+    # futures belong to the loop that created them, so the running loop
+    # is part of the key
+    def __init__(self, enabled: bool = False):
+        super().__init__(enabled)
+        self._calls: dict[tuple[Any, ...], asyncio.Future[httpx.Response]] = {}
+
+    async def do(
+        self,
+        key: tuple[Any, ...],
+        fetch: Callable[[], Awaitable[httpx.Response]],
+    ) -> httpx.Response:
+        loop = asyncio.get_running_loop()
+        key = (*key, weakref.ref(loop))
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                self.requests += 1
+                future = self._calls[key] = loop.create_future()
+            else:
+                self.shared += 1
+        if not leader:
+            try:
+                # a cancelled follower must not cancel the leader
+                return await asyncio.wait_for(
+                    asyncio.shield(future), get_remaining()
+                )
+            except asyncio.TimeoutError:
+                raise httpx.ReadTimeout("Timed out waiting for a shared GET.")
+        try:
+            res = await fetch()
+            share_json(res)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # retrieved, followers are optional
+            future.exception()
+            raise
+        else:
+            future.set_result(res)
+            return res
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+# single flight of request, enable with ASYNC_SINGLE_FLIGHT.enabled = True
+ASYNC_SINGLE_FLIGHT = AsyncSingleFlight()
+
+
+class AsyncHedger(BaseHedger):
+    # the loser is cancelled
+    async def timed(
+        self, endpoint: str, fetch: Callable[[], Awaitable[httpx.Response]]
+    ) -> httpx.Response:
+        start = time.perf_counter()
+        res = await fetch()
+        self.record(endpoint, time.perf_counter() - start)
+        return res
+
+    async def do(
+        self, endpoint: str, fetch: Callable[[], Awaitable[httpx.Response]]
+    ) -> httpx.Response:
+        delay = self.get_delay(endpoint)
+        if delay is None:
+            return await self.timed(endpoint, fetch)
+        primary = asyncio.ensure_future(self.timed(endpoint, fetch))
+        pending = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if done:
+                return primary.result()
+            hedge = asyncio.ensure_future(self.timed(endpoint, fetch))
+            pending.add(hedge)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    e = task.exception()
+                    if e is None:
+                        self.count(task is hedge)
+                        return task.result()
+                    error = error or e
+            self.count(False)
+            assert error is not None
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+# hedging of request, enable with ASYNC_HEDGER.enabled = True
+ASYNC_HEDGER = AsyncHedger()
+
+
+async def send(
+    method: str,
+    url: str,
+    token: str,
+    proxy: Optional[ProxyT] = None,
+    client: Optional[AsyncRSOClient] = None,
+    **kwargs: Any,
+) -> httpx.Response:
+    h = {"Authorization": f"Bearer {token}"}
+    if client is not None:
+        res = await client.request(method, url, headers=h, **kwargs)
+    else:
+        res = await ASYNC_CLIENT_POOL.request(
+            method, url, proxy, headers=h, **kwargs
+        )
+    if res.status_code in REJECTED_STATUS_CODES:
+        TOKEN_CACHE.invalidate_token(token)
+    return res
+
+
+async def request(
+    method: str,
+    url: str,
+    token: str,
+    proxy: Optional[ProxyT] = None,
+    client: Optional[AsyncRSOClient] = None,
+    **kwargs: Any,
+) -> httpx.Response:
+    # only GET requests are idempotent, craft, party PUT etc. are never
+    # hedged or shared
+    if method != "GET":
+        return await send(method, url, token, proxy, client, **kwargs)
+
+    async def fetch() -> httpx.Response:
+        if not ASYNC_HEDGER.enabled:
+            return await send(method, url, token, proxy, client, **kwargs)
+        return await ASYNC_HEDGER.do(
+            get_endpoint(url),
+            lambda: send(method, url, token, proxy, client, **kwargs),
+        )
+
+    if not ASYNC_SINGLE_FLIGHT.enabled:
+        return await fetch()
+    key = ASYNC_SINGLE_FLIGHT.get_key(url, token, kwargs.get("params"))
+    return await ASYNC_SINGLE_FLIGHT.do(key, fetch)
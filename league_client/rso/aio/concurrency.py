@@ -0,0 +1,214 @@
+import asyncio
+import time
+import weakref
+from typing import Any
+from typing import AsyncGenerator
+from typing import AsyncIterator
+from typing import Callable
+from typing import Optional
+
+import httpx
+
+from league_client.rso.concurrency import DROP_STATUS_CODES
+from league_client.rso.concurrency import AdaptiveLimit
+from league_client.rso.concurrency import BaseConcurrencyLimiter
+from league_client.rso.concurrency import get_pool_timeout
+
+LoopRefT = weakref.ref[asyncio.AbstractEventLoop]
+
+
+class AsyncConcurrencyLimiter(BaseConcurrencyLimiter):
+    # waiters are futures of the running loop, so a weak reference to
+    # the loop is part of the key, stats are summed up per host
+    #
+    # the limits of a loop are dropped when it shuts down its async
+    # generators, e.g. at the end of asyncio.run, limits of loops that
+    # were closed without are dropped once the next loop is seen
+    def __init__(
+        self,
+        enabled: bool = False,
+        initial: float = 8,
+        min_limit: float = 1,
+        max_limit: float = 64,
+        backoff: float = 0.5,
+        tolerance: float = 2,
+        smoothing: float = 0.2,
+        drift: float = 0.001,
+    ):
+        super().__init__(
+            enabled,
+            initial,
+            min_limit,
+            max_limit,
+            backoff,
+            tolerance,
+            smoothing,
+            drift,
+        )
+        # async generator of each loop, closed by loop.shutdown_asyncgens
+        self._hooks: dict[LoopRefT, AsyncGenerator[None, None]] = {}
+        # requests of the dropped limits of each host, kept for stats
+        self._dropped: dict[str, AdaptiveLimit] = {}
+
+    def get_key(self, host: str) -> Any:
+        # must be called with self._lock held in the running loop
+        ref = weakref.ref(asyncio.get_running_loop())
+        if ref not in self._hooks:
+            self._register(ref)
+        return host, ref
+
+    def get_host(self, key: Any) -> str:
+        return key[0]
+
+    def _get_host_limits(self) -> dict[str, list[AdaptiveLimit]]:
+        # must be called with self._lock held
+        hosts = super()._get_host_limits()
+        for host, limit in self._dropped.items():
+            hosts.setdefault(host, []).append(limit)
+        return hosts
+
+    def _register(self, ref: LoopRefT):
+        # must be called with self._lock held in the running loop
+        for old in list(self._hooks):
+            loop = old()
+            if loop is None or loop.is_closed():
+                self._remove_loop(old)
+        hook = self._drop_on_shutdown(ref)
+        # runs the hook up to its yield, the running loop tracks it from
+        # its first step on
+        try:
+            hook.asend(None).send(None)
+        except StopIteration:
+            pass
+        self._hooks[ref] = hook
+
+    def _remove_loop(self, ref: LoopRefT):
+        # must be called with self._lock held
+        self._hooks.pop(ref, None)
+        for key in [k for k in self._limits if k[-1] is ref]:
+            dropped = self._dropped.get(key[0])
+            if dropped is None:
+                dropped = self._dropped[key[0]] = AdaptiveLimit(0, 0, 0)
+            dropped.add(self._limits.pop(key))
+
+    def clear(self):
+        with self._lock:
+            self._limits.clear()
+            self._dropped.clear()
+
+    async def _drop_on_shutdown(
+        self, ref: LoopRefT
+    ) -> AsyncGenerator[None, None]:
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._remove_loop(ref)
+
+    async def acquire(
+        self, host: str, timeout: Optional[float] = None
+    ) -> tuple[AdaptiveLimit, float]:
+        start = time.monotonic()
+        with self._lock:
+            limit = self._get_limit(host)
+            if limit.has_room() and not limit.waiters:
+                limit.in_flight += 1
+                self._record(limit, 0)
+                return limit, start
+            waiter = asyncio.get_running_loop().create_future()
+            limit.waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except BaseException as e:
+            with self._lock:
+                if waiter.done() and not waiter.cancelled():
+                    # the slot was handed over while cancelling
+                    self._complete(limit, start, None, False)
+                    self._wake(limit)
+            if isinstance(e, asyncio.TimeoutError):
+                raise httpx.PoolTimeout(
+                    f"Timed out waiting for a request slot of {host}."
+                )
+            raise
+        now = time.monotonic()
+        with self._lock:
+            self._record(limit, now - start)
+        return limit, now
+
+    def release(
+        self,
+        limit: AdaptiveLimit,
+        started: float,
+        latency: Optional[float],
+        dropped: bool,
+    ):
+        with self._lock:
+            self._complete(limit, started, latency, dropped)
+            self._wake(limit)
+
+
+# used by all async rso transports,
+# enable with ASYNC_CONCURRENCY_LIMITER.enabled = True
+ASYNC_CONCURRENCY_LIMITER = AsyncConcurrencyLimiter()
+
+
+class AsyncReleasingStream(httpx.AsyncByteStream):
+    # frees the slot of a request once its body is read
+    def __init__(
+        self, stream: httpx.AsyncByteStream, release: Callable[[], None]
+    ):
+        self.stream = stream
+        self.release = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self.stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self.stream.aclose()
+        finally:
+            self.release()
+
+
+class AsyncConcurrencyLimitedTransport(httpx.AsyncBaseTransport):
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        limiter: AsyncConcurrencyLimiter = ASYNC_CONCURRENCY_LIMITER,
+    ):
+        self.transport = transport
+        self.limiter = limiter
+
+    async def handle_async_request(
+        self, request: httpx.Request
+    ) -> httpx.Response:
+        if not self.limiter.enabled:
+            return await self.transport.handle_async_request(request)
+        limit, started = await self.limiter.acquire(
+            request.url.host, get_pool_timeout(request)
+        )
+        try:
+            response = await self.transport.handle_async_request(request)
+        except (httpx.TimeoutException, httpx.NetworkError):
+            self.limiter.release(limit, started, None, True)
+            raise
+        except BaseException:
+            self.limiter.release(limit, started, None, False)
+            raise
+        dropped = response.status_code in DROP_STATUS_CODES
+        released = False
+
+        def release():
+            nonlocal released
+            if not released:
+                released = True
+                latency = time.monotonic() - started
+                self.limiter.release(limit, started, latency, dropped)
+
+        assert isinstance(response.stream, httpx.AsyncByteStream)
+        response.stream = AsyncReleasingStream(response.stream, release)
+        return response
+
+    async def aclose(self):
+        await self.transport.aclose()
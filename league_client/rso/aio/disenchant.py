@@ -0,0 +1,92 @@
+from typing import Optional
+
+from league_client.rso.aio.client import AsyncRSOClient
+from league_client.rso.aio.craft import craft
+from league_client.rso.aio.loot import get_loot_data
+from league_client.types import ProxyT
+
+
+async def disenchant_champion_shards(
+    ledge_token: str,
+    ledge_url: str,
+    puuid: str,
+    proxy: Optional[ProxyT] = None,
+    client: Optional[AsyncRSOClient] = None,
+):
+    loot_data = await get_loot_data(
+        ledge_token, ledge_url, puuid, proxy, client
+    )
+    champion_shards = [
+        item
+        for item in loot_data["playerLoot"]  # ? ["lootItemList"]["lootItems"]
+        if item["lootItemType"] in ["CHAMPION", "CHAMPION_RENTAL"]
+    ]
+    for shard in champion_shards:
+        recipe_name = f"{'CHAMPION_RENTAL' if 'CHAMPION_RENTAL' in shard['lootItemType'] else 'CHAMPION'}_disenchant"
+        await craft(
+            ledge_token,
+            ledge_url,
+            puuid,
+            recipe_name,
+            [shard["lootName"]],
+            shard["count"],
+            proxy,
+            client,
+        )
+
+
+async def disenchant_eternals(
+    ledge_token: str,
+    ledge_url: str,
+    puuid: str,
+    proxy: Optional[ProxyT] = None,
+    client: Optional[AsyncRSOClient] = None,
+):
+    loot_data = await get_loot_data(
+        ledge_token, ledge_url, puuid, proxy, client
+    )
+    eternals = [
+        item
+        for item in loot_data["playerLoot"]  # ? ["lootItemList"]["lootItems"]
+        if item["lootItemType"] in ["STATSTONE_SHARD"]
+    ]
+    for eternal in eternals:
+        await craft(
+            ledge_token,
+            ledge_url,
+            puuid,
+            "STATSTONE_SHARD_DISENCHANT",
+            [eternal["lootName"]],
+            eternal["count"],
+            proxy,
+            client,
+        )
+
+
+async def disenchant_ward_skins(
+    ledge_token: str,
+    ledge_url: str,
+    puuid: str,
+    proxy: Optional[ProxyT] = None,
+    client: Optional[AsyncRSOClient] = None,
+):
+    loot_data = await get_loot_data(
+        ledge_token, ledge_url, puuid, proxy, client
+    )
+    ward_skins = [
+        item
+        for item in loot_data["playerLoot"]  # ? ["lootItemList"]["lootItems"]
+        if item["lootItemType"] in ["WARDSKIN_RENTAL", "WARDSKIN"]
+    ]
+    for skin in ward_skins:
+        recipe_name = f"{skin['lootItemType']}_disenchant"
+        await craft(
+            ledge_token,
+            ledge_url,
+            puuid,
+            recipe_name,
+            [skin["lootName"]],
+            skin["count"],
+            proxy,
+            client,
+        )
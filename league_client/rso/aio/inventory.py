@@ -0,0 +1,114 @@
+import asyncio
+from typing import List
+from typing import Optional
+
+from league_client.rso.aio.client import AsyncRSOClient
+from league_client.rso.aio.client import request
+from league_client.rso.constants import InventoryTypes
+from league_client.rso.inventory import get_merged_slice
+from league_client.rso.inventory import merge_inventory_types
+from league_client.types import ProxyT
+
+
+async def _inventory_data_from_url(
+    inventory_url: str,
+    ledge_token: str,
+    puuid: str,
+    account_id: int,
+    service_location: str,
+    inventory_types: List[InventoryTypes],
+    proxy: Optional[ProxyT] = None,
+    client: Optional[AsyncRSOClient] = None,
+):
+    res = await request(
+        "GET",
+        inventory_url,
+        ledge_token,
+        proxy,
+        client,
+        params={
+            "puuid": puuid,
+            "accountId": account_id,
+            "location": service_location,
+            "inventoryTypes": [item.value for item in inventory_types],
+            "signed": True,
+        },
+    )
+    res.raise_for_status()
+    return res.json()["data"]
+
+
+async def get_inventory_data(
+    ledge_token: str,
+    puuid: str,
+    account_id: int,
+    service_location: str,
+    ledge_url: str,
+    inventory_types: List[InventoryTypes],
+    proxy: Optional[ProxyT] = None,
+    client: Optional[AsyncRSOClient] = None,
+):
+    return await _inventory_data_from_url(
+        f"{ledge_url}/lolinventoryservice-ledge/v1/inventories/simple",
+        ledge_token,
+        puuid,
+        account_id,
+        service_location,
+        inventory_types,
+        proxy,
+        client,
+    )
+
+
+async def get_inventory_data_v2(
+    ledge_token: str,
+    puuid: str,
+    account_id: int,
+    service_location: str,
+    ledge_url: str,
+    inventory_types: List[InventoryTypes],
+    proxy: Optional[ProxyT] = None,
+    client: Optional[AsyncRSOClient] = None,
+):
+    return await _inventory_data_from_url(
+        f"{ledge_url}/lolinventoryservice-ledge/v2/inventoriesWithLoyalty",
+        ledge_token,
+        puuid,
+        account_id,
+        service_location,
+        inventory_types,
+        proxy,
+        client,
+    )
+
+
+async def get_inventory_data_many(
+    ledge_token: str,
+    puuid: str,
+    account_id: int,
+    service_location: str,
+    ledge_url: str,
+    type_sets: List[List[InventoryTypes]],
+    proxy: Optional[ProxyT] = None,
+    client: Optional[AsyncRSOClient] = None,
+):
+    # see league_client.rso.inventory.get_inventory_data_many
+    merged = merge_inventory_types(type_sets)
+    inventory_datas = await asyncio.gather(
+        *[
+            get_inventory_data(
+                ledge_token,
+                puuid,
+                account_id,
+                service_location,
+                ledge_url,
+                types,
+                proxy,
+                client,
+            )
+            for types in merged
+        ]
+    )
+    return [
+        get_merged_slice(merged, inventory_datas, types) for types in type_sets
+    ]
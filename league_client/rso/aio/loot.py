@@ -0,0 +1,27 @@
+from typing import Optional
+
+from league_client.rso.aio.client import AsyncRSOClient
+from league_client.rso.aio.client import request
+from league_client.rso.loot import LOOT_DEFINITIONS
+from league_client.rso.loot import LootDefinitionsCache
+from league_client.rso.loot import parse_loot_data
+from league_client.types import ProxyT
+
+
+async def get_loot_data(
+    ledge_token: str,
+    ledge_url: str,
+    puuid: str,
+    proxy: Optional[ProxyT] = None,
+    client: Optional[AsyncRSOClient] = None,
+    cache: Optional[LootDefinitionsCache] = LOOT_DEFINITIONS,
+):
+    res = await request(
+        "GET",
+        f"{ledge_url}/loot/v2/player/{puuid}/loot/definitions",
+        ledge_token,
+        proxy,
+        client,
+    )
+    res.raise_for_status()
+    return parse_loot_data(res.text, ledge_url, cache)
@@ -0,0 +1,27 @@
+from typing import Optional
+
+from league_client.rso.aio.client import AsyncRSOClient
+from league_client.rso.aio.client import request
+from league_client.types import ProxyT
+
+
+async def get_match_data(
+    access_token: str,
+    puuid: str,
+    player_platform_edge_url: str,
+    proxy: Optional[ProxyT] = None,
+    count: int = 30,
+    client: Optional[AsyncRSOClient] = None,
+):
+    res = await request(
+        "GET",
+        (
+            f"{player_platform_edge_url}/match-history-query/v1/products"
+            f"/lol/player/{puuid}/SUMMARY?startIndex=0&count={count}"
+        ),
+        access_token,
+        proxy,
+        client,
+    )
+    res.raise_for_status()
+    return res.json()
@@ -0,0 +1,154 @@
+from typing import Awaitable
+from typing import Callable
+from typing import Mapping
+from typing import Optional
+
+import httpx
+
+from league_client.rso.aio.client import AsyncRSOClient
+from league_client.rso.aio.client import request
+from league_client.rso.party import PARTY_CACHE
+from league_client.rso.party import PartyCache
+from league_client.rso.party import get_party_id
+from league_client.rso.party import invalidate_rejected_tokens
+from league_client.rso.party import is_stale_party
+from league_client.types import ProxyT
+
+
+async def get_party_data(
+    ledge_token: str,
+    ledge_url: str,
+    puuid: str,
+    account_id: int,
+    region: str,
+    id_token: str,
+    entitlement_token: str,
+    userinfo_token: str,
+    summoner_token: str,
+    ranked_overview_token: str,
+    inventory_token: str,  # champion, champion_skin, skin_border, skin_augment
+    inventory_token_v2: str,  # queue_entry
+    proxy: Optional[ProxyT] = None,
+    client: Optional[AsyncRSOClient] = None,
+):
+    res = await request(
+        "PUT",
+        f"{ledge_url}/parties-ledge/v1/players/{puuid}",
+        ledge_token,
+        proxy,
+        client,
+        json={
+            "accountId": account_id,
+            "createdAt": 0,
+            "currentParty": None,
+            "eligibilityHash": 0,
+            "parties": None,
+            "platformId": region,
+            "puuid": puuid,
+            "registration": {
+                "experiments": {},
+                # https://sieve.services.riotcdn.net/api/v1/products/lol/version-sets/EUW1
+                "gameClientVersion": (
+                    "14.13.5989749+branch.releases-14-13.code.public.content.release.anticheat.vanguard"
+                ),
+                "inventoryToken": None,
+                "inventoryTokens": [
+                    inventory_token_v2,
+                ],
+                "playerTokens": {
+                    "entitlementsToken": entitlement_token,
+                    "idToken": id_token,
+                    "summonerToken": summoner_token,
+                    "userInfoToken": userinfo_token,
+                },
+                "rankedOverviewToken": ranked_overview_token,
+                "simpleInventoryToken": inventory_token,
+                "summonerToken": None,
+            },
+            "serverUtcMillis": 0,
+            "summonerId": account_id,
+            "tftGamesPlayed": 0,
+            "tftGamesWon": 0,
+            "version": 0,
+        },
+    )
+    invalidate_rejected_tokens(
+        res,
+        [
+            entitlement_token,
+            summoner_token,
+            inventory_token,
+            inventory_token_v2,
+        ],
+    )
+    res.raise_for_status()
+    return res.json()
+
+
+async def get_party_restrictions(
+    ledge_token: str,
+    ledge_url: str,
+    party_id: str,
+    proxy: Optional[ProxyT] = None,
+    client: Optional[AsyncRSOClient] = None,
+):
+    res = await request(
+        "GET",
+        f"{ledge_url}/parties-ledge/v1/parties/{party_id}/restrictions",
+        ledge_token,
+        proxy,
+        client,
+    )
+    res.raise_for_status()
+    return res.json()
+
+
+async def get_registered_party_restrictions(
+    ledge_token: str,
+    ledge_url: str,
+    puuid: str,
+    account_id: int,
+    region: str,
+    id_token: str,
+    entitlement_token: str,
+    userinfo_token: str,
+    get_tokens: Callable[[], Awaitable[Mapping[str, str]]],
+    proxy: Optional[ProxyT] = None,
+    client: Optional[AsyncRSOClient] = None,
+    cache: Optional[PartyCache] = PARTY_CACHE,
+):
+    # see league_client.rso.party.get_registered_party_restrictions
+
+    async def register():
+        tokens = await get_tokens()
+        party_data = await get_party_data(
+            ledge_token,
+            ledge_url,
+            puuid,
+            account_id,
+            region,
+            id_token=id_token,
+            entitlement_token=entitlement_token,
+            userinfo_token=userinfo_token,
+            proxy=proxy,
+            client=client,
+            **tokens,
+        )
+        if cache is not None:
+            used = [id_token, entitlement_token, userinfo_token]
+            cache.set(puuid, party_data, [*used, *tokens.values()])
+        return party_data
+
+    cached = None if cache is None else cache.get(puuid)
+    if cache is not None and cached is not None:
+        try:
+            return await get_party_restrictions(
+                ledge_token, ledge_url, get_party_id(cached), proxy, client
+            )
+        except httpx.HTTPStatusError as e:
+            if not is_stale_party(e):
+                raise
+        cache.invalidate(puuid, stale=True)
+    return await get_party_restrictions(
+        ledge_token, ledge_url, get_party_id(await register()), proxy, client
+    )
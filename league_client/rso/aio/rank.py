@@ -0,0 +1,22 @@
+from typing import Optional
+
+from league_client.rso.aio.client import AsyncRSOClient
+from league_client.rso.aio.client import request
+from league_client.types import ProxyT
+
+
+async def get_rank_data(
+    ledge_token: str,
+    ledge_url: str,
+    proxy: Optional[ProxyT] = None,
+    client: Optional[AsyncRSOClient] = None,
+):
+    res = await request(
+        "GET",
+        f"{ledge_url}/leagues-ledge/v2/signedRankedStats",
+        ledge_token,
+        proxy,
+        client,
+    )
+    res.raise_for_status()
+    return res.json()
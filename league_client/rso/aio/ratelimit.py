@@ -0,0 +1,42 @@
+import asyncio
+import time
+
+import httpx
+
+from league_client.rso.ratelimit import RATE_LIMITER
+from league_client.rso.ratelimit import RateLimiter
+
+
+async def acquire(host: str, limiter: RateLimiter = RATE_LIMITER):
+    bucket, ticket, wait = limiter.reserve(host)
+    if wait <= 0:
+        return
+    start = time.monotonic()
+    while wait > 0:
+        await asyncio.sleep(wait)
+        wait = limiter.get_wait(bucket, ticket)
+    limiter.record(bucket, time.monotonic() - start)
+
+
+class AsyncRateLimitedTransport(httpx.AsyncBaseTransport):
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        limiter: RateLimiter = RATE_LIMITER,
+    ):
+        self.transport = transport
+        self.limiter = limiter
+
+    async def handle_async_request(
+        self, request: httpx.Request
+    ) -> httpx.Response:
+        if not self.limiter.enabled:
+            return await self.transport.handle_async_request(request)
+        host = request.url.host
+        await acquire(host, self.limiter)
+        response = await self.transport.handle_async_request(request)
+        self.limiter.update(host, response)
+        return response
+
+    async def aclose(self):
+        await self.transport.aclose()
@@ -0,0 +1,43 @@
+import asyncio
+
+import httpx
+
+from league_client.rso.retry import RETRY_POLICY
+from league_client.rso.retry import RetryPolicy
+from league_client.rso.retry import cap_timeout
+
+
+class AsyncRetryTransport(httpx.AsyncBaseTransport):
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        policy: RetryPolicy = RETRY_POLICY,
+    ):
+        self.transport = transport
+        self.policy = policy
+
+    async def handle_async_request(
+        self, request: httpx.Request
+    ) -> httpx.Response:
+        if not self.policy.enabled:
+            return await self.transport.handle_async_request(request)
+        self.policy.budget.deposit()
+        attempt = 1
+        while True:
+            try:
+                response = await self.transport.handle_async_request(request)
+            except Exception as e:
+                delay = self.policy.get_retry_delay(request, attempt, error=e)
+                if delay is None:
+                    raise
+            else:
+                delay = self.policy.get_retry_delay(request, attempt, response)
+                if delay is None:
+                    return response
+                await response.aclose()
+            await asyncio.sleep(delay)
+            cap_timeout(request)
+            attempt += 1
+
+    async def aclose(self):
+        await self.transport.aclose()
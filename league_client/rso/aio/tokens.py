@@ -0,0 +1,42 @@
+import asyncio
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+
+from league_client.rso.tokens import TokenCache
+
+# references to background refreshes, tasks are only weakly
+# referenced by the event loop
+_refreshes: set["asyncio.Task[Any]"] = set()
+
+
+async def refresh(
+    cache: TokenCache,
+    puuid: str,
+    kind: str,
+    fetch: Callable[[], Awaitable[str]],
+):
+    try:
+        token = await fetch()
+    except Exception:
+        token = None
+    cache.refresh_done(puuid, kind, token)
+
+
+async def get_or_fetch(
+    cache: TokenCache,
+    puuid: str,
+    kind: str,
+    fetch: Callable[[], Awaitable[str]],
+) -> str:
+    # asyncio version of TokenCache.get_or_fetch
+    token, should_refresh = cache.lookup(puuid, kind)
+    if token is None:
+        token = await fetch()
+        cache.set(puuid, kind, token)
+        return token
+    if should_refresh:
+        task = asyncio.create_task(refresh(cache, puuid, kind, fetch))
+        _refreshes.add(task)
+        task.add_done_callback(_refreshes.discard)
+    return token
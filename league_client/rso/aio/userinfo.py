@@ -0,0 +1,25 @@
+from typing import Any
+from typing import Optional
+
+from league_client.rso.aio.client import AsyncRSOClient
+from league_client.rso.aio.client import request
+from league_client.types import ProxyT
+
+
+async def get_userinfo(
+    access_token: str,
+    proxy: Optional[ProxyT] = None,
+    client: Optional[AsyncRSOClient] = None,
+) -> str | dict[str, Any]:
+    res = await request(
+        "POST",
+        "https://auth.riotgames.com/userinfo",
+        access_token,
+        proxy,
+        client,
+    )
+    res.raise_for_status()
+    # see league_client.rso.userinfo.get_userinfo
+    if res.headers["content-type"].lower().startswith("application/jwt;"):
+        return res.text
+    return res.json()
@@ -8,11 +8,16 @@ import httpx
 
 from league_client.constants import HEADERS
 from league_client.constants import RIOT_CLIENT_AUTH_PARAMS
-from league_client.constants import SSL_CONTEXT
 from league_client.exceptions import AuthFailureError
 from league_client.exceptions import AuthMultifactorError
 from league_client.exceptions import InvalidSessionError
 from league_client.exceptions import RateLimitedError
+from league_client.exceptions import RSOError
+from league_client.rso.client import RSOClient
+from league_client.rso.client import request
+from league_client.rso.network import create_transport
+from league_client.rso.tokens import TOKEN_CACHE
+from league_client.rso.tokens import TokenCache
 from league_client.rso.utils import decode_token
 from league_client.types import ProxyT
 
@@ -49,31 +54,45 @@ def process_access_token(access_token: str) -> tuple[str, str, int]:
     return data["sub"], data["dat"]["r"], data["dat"]["u"]
 
 
-def get_pas_token(access_token: str, proxy: Optional[ProxyT] = None):
-    h = HEADERS.copy()
-    h["Authorization"] = f"Bearer {access_token}"
-    res = httpx.get(
+def get_pas_token(
+    access_token: str,
+    proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
+):
+    res = request(
+        "GET",
         "https://riot-geo.pas.si.riotgames.com/pas/v1/service/chat",
-        headers=h,
-        proxy=proxy,
+        access_token,
+        proxy,
+        client,
     )
     res.raise_for_status()
     return res.text
 
 
 def get_entitlements_token(
-    access_token: str, proxy: Optional[ProxyT] = None
+    access_token: str,
+    proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
+    cache: Optional[TokenCache] = TOKEN_CACHE,
 ) -> str:
-    h = HEADERS.copy()
-    h["Authorization"] = f"Bearer {access_token}"
-    res = httpx.post(
-        "https://entitlements.auth.riotgames.com/api/token/v1",
-        headers=h,
-        proxy=proxy,
-        json={"urn": "urn:entitlement:%"},
+    def fetch() -> str:
+        res = request(
+            "POST",
+            "https://entitlements.auth.riotgames.com/api/token/v1",
+            access_token,
+            proxy,
+            client,
+            json={"urn": "urn:entitlement:%"},
+        )
+        res.raise_for_status()
+        return res.json()["entitlements_token"]
+
+    if cache is None:
+        return fetch()
+    return cache.get_or_fetch(
+        decode_token(access_token)["sub"], "entitlements", fetch
     )
-    res.raise_for_status()
-    return res.json()["entitlements_token"]
 
 
 def get_login_queue_token(
@@ -83,22 +102,31 @@ def get_login_queue_token(
     region: str,
     player_platform_url: str,
     proxy: Optional[ProxyT] = None,
-):
-    h = HEADERS.copy()
-    h["Authorization"] = f"Bearer {access_token}"
-    res = httpx.post(
-        f"{player_platform_url}"
-        f"/login-queue/v2/login/products/lol/regions/{region}",
-        headers=h,
-        json={
-            "clientName": "lcu",
-            "entitlements": entitlements_token,
-            "userinfo": userinfo_token,
-        },
-        proxy=proxy,
+    client: Optional[RSOClient] = None,
+    cache: Optional[TokenCache] = TOKEN_CACHE,
+) -> str:
+    def fetch() -> str:
+        res = request(
+            "POST",
+            f"{player_platform_url}"
+            f"/login-queue/v2/login/products/lol/regions/{region}",
+            access_token,
+            proxy,
+            client,
+            json={
+                "clientName": "lcu",
+                "entitlements": entitlements_token,
+                "userinfo": userinfo_token,
+            },
+        )
+        res.raise_for_status()
+        return res.json()["token"]
+
+    if cache is None:
+        return fetch()
+    return cache.get_or_fetch(
+        decode_token(access_token)["sub"], "login_queue", fetch
     )
-    res.raise_for_status()
-    return res.json()["token"]
 
 
 def get_ledge_token(
@@ -107,22 +135,29 @@ def get_ledge_token(
     region: str,
     player_platform_url: str,
     proxy: Optional[ProxyT] = None,
-):
-    h = HEADERS.copy()
-    h["Authorization"] = f"Bearer {login_queue_token}"
-    res = httpx.post(
-        f"{player_platform_url}/session-external/v1/session/create",
-        headers=h,
-        json={
-            "claims": {"cname": "lcu"},
-            "product": "lol",
-            "puuid": puuid,
-            "region": region.lower(),
-        },
-        proxy=proxy,
-    )
-    res.raise_for_status()
-    return res.json()
+    client: Optional[RSOClient] = None,
+    cache: Optional[TokenCache] = TOKEN_CACHE,
+) -> str:
+    def fetch() -> str:
+        res = request(
+            "POST",
+            f"{player_platform_url}/session-external/v1/session/create",
+            login_queue_token,
+            proxy,
+            client,
+            json={
+                "claims": {"cname": "lcu"},
+                "product": "lol",
+                "puuid": puuid,
+                "region": region.lower(),
+            },
+        )
+        res.raise_for_status()
+        return res.json()
+
+    if cache is None:
+        return fetch()
+    return cache.get_or_fetch(puuid, "ledge", fetch)
 
 
 def get_summoner_token(
@@ -131,83 +166,94 @@ def get_summoner_token(
     region: str,
     ledge_url: str,
     proxy: Optional[ProxyT] = None,
-):
-    h = HEADERS.copy()
-    h["Authorization"] = f"Bearer {ledge_token}"
-    res = httpx.get(
-        f"{ledge_url}"
-        f"/summoner-ledge/v1/regions/{region}/summoners/puuid/{puuid}/jwt",
-        headers=h,
-        proxy=proxy,
-    )
-    res.raise_for_status()
-    return res.json()
-
-
-def login_using_ssid(
-    ssid: str,
-    clid: str,
-    auth_params: dict[str, str] = RIOT_CLIENT_AUTH_PARAMS,
-    proxy: Optional[ProxyT] = None,
-) -> tuple[str, str, str, str, str, str, str, str, str]:
-    with httpx.Client(verify=SSL_CONTEXT, proxy=proxy) as client:
-        if ssid:
-            client.cookies.set("ssid", ssid, domain="auth.riotgames.com")
-            client.cookies.set("clid", clid, domain="auth.riotgames.com")
-        res = client.post(
-            "https://auth.riotgames.com/api/v1/authorization",
-            json=auth_params,
-            headers=HEADERS,
+    client: Optional[RSOClient] = None,
+    cache: Optional[TokenCache] = TOKEN_CACHE,
+) -> str:
+    def fetch() -> str:
+        res = request(
+            "GET",
+            f"{ledge_url}"
+            f"/summoner-ledge/v1/regions/{region}/summoners/puuid/{puuid}/jwt",
+            ledge_token,
+            proxy,
+            client,
         )
         res.raise_for_status()
-        data = res.json()
-        if "response" in data:
-            ssid = client.cookies["ssid"]
-            redirect_url = data["response"]["parameters"]["uri"]
-            data = process_redirect_url(redirect_url)
-            return (ssid, clid, *data)
-        raise InvalidSessionError(res.text, res.status_code)
+        return res.json()
 
+    if cache is None:
+        return fetch()
+    return cache.get_or_fetch(puuid, "summoner", fetch)
+
+
+# httpx.Client or httpx.AsyncClient, the requests of the authorization
+# flow are built and parsed by the same functions for both
+AuthClientT = httpx.Client | httpx.AsyncClient
 
-def authorize(
-    client: httpx.Client,
-    username: str,
-    password: str,
-    captcha_solver: Callable[[str, str], str],
-    params: dict[str, str] = RIOT_CLIENT_AUTH_PARAMS,
-    type: Literal["auth", "re-auth"] = "auth",
-):
-    # the authorization flow is different for
-    # website (prod-xsso-riotgames, accountodactyl-prod)
-    # and client (riot-client, lol)
-    #
-    # this flow is based on website but works
-    # for (riot-client, lol)
-    #
-    # if this flow stops working for (riot-client, lol)
-    # revert to commit 5f1bbba
 
-    # step 1: set authorization params
-    url = "https://auth.riotgames.com/authorize"
-    res = client.get(
-        url, params=params, headers=HEADERS, follow_redirects=True
+def build_authorization_request(
+    client: AuthClientT, params: dict[str, str]
+) -> httpx.Request:
+    return client.build_request(
+        "POST",
+        "https://auth.riotgames.com/api/v1/authorization",
+        json=params,
+        headers=HEADERS,
     )
+
+
+def process_authorization_response(
+    res: httpx.Response,
+    error: type[RSOError] = AuthFailureError,
+) -> tuple[str, str, str, str, str, str, str]:
+    # data of the redirect url, error is raised if there is none
     res.raise_for_status()
+    data = res.json()
+    if "response" not in data:
+        raise error(res.text, res.status_code)
+    return process_redirect_url(data["response"]["parameters"]["uri"])
+
+
+def build_authorize_request(
+    client: AuthClientT, params: dict[str, str]
+) -> httpx.Request:
+    # step 1 of authorize, sets the authorization params
+    return client.build_request(
+        "GET",
+        "https://auth.riotgames.com/authorize",
+        params=params,
+        headers=HEADERS,
+    )
+
+
+def build_captcha_request(client: AuthClientT) -> httpx.Request:
+    # step 2 of authorize, gets the hcaptcha details
+    return client.build_request(
+        "GET",
+        "https://authenticate.riotgames.com/api/v1/login",
+        headers=HEADERS,
+    )
+
 
-    # step 2: get hcaptcha details (sitekey and rqdata)
-    url = "https://authenticate.riotgames.com/api/v1/login"
-    res = client.get(url, headers=HEADERS)
+def process_captcha_response(res: httpx.Response) -> tuple[str, str]:
+    # site data (rqdata) and site key of the hcaptcha
     res.raise_for_status()
     data = res.json()
-    site_key = data["captcha"]["hcaptcha"]["key"]
-    site_data = data["captcha"]["hcaptcha"]["data"]
+    return (
+        data["captcha"]["hcaptcha"]["data"],
+        data["captcha"]["hcaptcha"]["key"],
+    )
 
-    # step 3: solve captcha
-    token = captcha_solver(site_data, site_key)
 
-    # step 4: put authentication data (username/password)
-    # the response contains login token
-    url = "https://authenticate.riotgames.com/api/v1/login"
+def build_login_request(
+    client: AuthClientT,
+    username: str,
+    password: str,
+    token: str,
+    type: Literal["auth", "re-auth"] = "auth",
+) -> httpx.Request:
+    # step 4 of authorize, puts the authentication data, the response
+    # contains the login token
     if type == "auth":
         body = {
             "language": "en_US",
@@ -229,10 +275,20 @@ def authorize(
                 "captcha": f"hcaptcha {token}",
             },
         }
-    res = client.put(url, json=body, headers=HEADERS)
-    res.raise_for_status()
+    return client.build_request(
+        "PUT",
+        "https://authenticate.riotgames.com/api/v1/login",
+        json=body,
+        headers=HEADERS,
+    )
+
 
-    # step 5: post login token/redirect to complete authentication
+def process_login_response(
+    client: AuthClientT, res: httpx.Response, params: dict[str, str]
+) -> tuple[httpx.Request, bool]:
+    # step 5 of authorize, returns the request that posts the login
+    # token or follows the redirect, and whether it is the redirect
+    res.raise_for_status()
     data = res.json()
     response_type = data["type"]
     if response_type == "success":
@@ -246,20 +302,17 @@ def authorize(
                 "login_token": data["success"]["login_token"],
                 "persist_login": True,
             }
-            res = client.post(
+            request = client.build_request(
+                "POST",
                 "https://auth.riotgames.com/api/v1/login-token",
                 json=body,
                 headers=HEADERS,
             )
-            res.raise_for_status()
-        else:
-            # NOTE: not raising for status because it can raise false
-            # positive when success
-            client.get(
-                data["success"]["redirect_url"],
-                headers=HEADERS,
-                follow_redirects=True,
-            )
+            return request, False
+        request = client.build_request(
+            "GET", data["success"]["redirect_url"], headers=HEADERS
+        )
+        return request, True
     elif response_type == "multifactor":
         raise AuthMultifactorError(res.text, res.status_code)
     elif response_type == "auth" and data["error"] == "auth_failure":
@@ -270,6 +323,57 @@ def authorize(
         raise AuthFailureError(res.text, res.status_code)
 
 
+def login_using_ssid(
+    ssid: str,
+    clid: str,
+    auth_params: dict[str, str] = RIOT_CLIENT_AUTH_PARAMS,
+    proxy: Optional[ProxyT] = None,
+) -> tuple[str, str, str, str, str, str, str, str, str]:
+    with httpx.Client(transport=create_transport(proxy)) as client:
+        if ssid:
+            client.cookies.set("ssid", ssid, domain="auth.riotgames.com")
+            client.cookies.set("clid", clid, domain="auth.riotgames.com")
+        res = client.send(build_authorization_request(client, auth_params))
+        data = process_authorization_response(res, InvalidSessionError)
+        return (client.cookies["ssid"], clid, *data)
+
+
+def authorize(
+    client: httpx.Client,
+    username: str,
+    password: str,
+    captcha_solver: Callable[[str, str], str],
+    params: dict[str, str] = RIOT_CLIENT_AUTH_PARAMS,
+    type: Literal["auth", "re-auth"] = "auth",
+):
+    # the authorization flow is different for
+    # website (prod-xsso-riotgames, accountodactyl-prod)
+    # and client (riot-client, lol)
+    #
+    # this flow is based on website but works
+    # for (riot-client, lol)
+    #
+    # if this flow stops working for (riot-client, lol)
+    # revert to commit 5f1bbba
+    res = client.send(
+        build_authorize_request(client, params), follow_redirects=True
+    )
+    res.raise_for_status()
+    res = client.send(build_captcha_request(client))
+    site_data, site_key = process_captcha_response(res)
+    # step 3: solve captcha
+    token = captcha_solver(site_data, site_key)
+    res = client.send(
+        build_login_request(client, username, password, token, type)
+    )
+    request, redirect = process_login_response(client, res, params)
+    res = client.send(request, follow_redirects=redirect)
+    # NOTE: not raising for status after the redirect because it can
+    # raise false positive when success
+    if not redirect:
+        res.raise_for_status()
+
+
 def login_using_credentials(
     username: str,
     password: str,
@@ -277,7 +381,7 @@ def login_using_credentials(
     params: dict[str, str] = RIOT_CLIENT_AUTH_PARAMS,
     proxy: Optional[ProxyT] = None,
 ) -> tuple[str, str, str, str, str, str, str, str, str]:
-    with httpx.Client(verify=SSL_CONTEXT, proxy=proxy) as client:
+    with httpx.Client(transport=create_transport(proxy)) as client:
         authorize(
             client,
             username,
@@ -285,18 +389,7 @@ def login_using_credentials(
             captcha_solver,
             params,
         )
-        res = client.post(
-            "https://auth.riotgames.com/api/v1/authorization",
-            json=params,
-            headers=HEADERS,
-        )
         # NOTE: IP might be banned at this point
-        res.raise_for_status()
-        data = res.json()
-        ssid = client.cookies["ssid"]
-        clid = client.cookies["clid"]
-        if "response" not in data:
-            raise AuthFailureError(res.text, res.status_code)
-        redirect_url = data["response"]["parameters"]["uri"]
-        data = process_redirect_url(redirect_url)
-        return (ssid, clid, *data)
+        res = client.send(build_authorization_request(client, params))
+        data = process_authorization_response(res)
+        return (client.cookies["ssid"], client.cookies["clid"], *data)
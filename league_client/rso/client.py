@@ -0,0 +1,505 @@
+import contextvars
+import importlib.util
+import re
+import threading
+import time
+from abc import ABC
+from abc import abstractmethod
+from collections import OrderedDict
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures import as_completed
+from concurrent.futures import wait
+from http.cookiejar import CookieJar
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any
+from typing import Callable
+from typing import Generic
+from typing import Optional
+from typing import TypeVar
+
+import httpx
+
+from league_client.constants import HEADERS
+from league_client.constants import SSL_CONTEXT
+from league_client.constants import create_ssl_context
+from league_client.rso.network import create_transport
+from league_client.rso.network import trace_first_byte
+from league_client.rso.tokens import REJECTED_STATUS_CODES
+from league_client.rso.tokens import TOKEN_CACHE
+from league_client.rso.utils import get_deadline_timeout
+from league_client.scheduler import get_remaining
+from league_client.types import ProxyT
+
+# http2 requires optional h2 package, pip install league-client[http2]
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+HTTP2_SSL_CONTEXT = create_ssl_context()
+
+
+class RSOClient(httpx.Client):
+    # pooled keep-alive client for rso endpoints
+    # reuse one instance for multiple requests to avoid a new
+    # tcp connection and tls handshake per request
+    #
+    # with http2=True, concurrent requests to the same edge host are
+    # multiplexed over a single connection, falls back to http/1.1 when
+    # h2 is not installed or the server does not negotiate h2
+    def __init__(
+        self,
+        proxy: Optional[ProxyT] = None,
+        token: str = "",
+        timeout: float = 5,
+        max_connections: int = 20,
+        keepalive_expiry: float = 60,
+        http2: bool = False,
+    ):
+        http2 = http2 and HTTP2_AVAILABLE
+        super().__init__(
+            headers=HEADERS,
+            timeout=timeout,
+            transport=create_transport(
+                proxy,
+                http2,
+                httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                    keepalive_expiry=keepalive_expiry,
+                ),
+                # httpcore sets alpn protocols on the ssl context while
+                # connecting, http2 clients need their own context
+                HTTP2_SSL_CONTEXT if http2 else SSL_CONTEXT,
+            ),
+            # rso endpoints are token based, cookies must not be
+            # shared between accounts using the same client
+            cookies=CookieJar(DefaultCookiePolicy(allowed_domains=[])),
+            event_hooks={"request": [trace_first_byte]},
+        )
+        self.proxy = proxy
+        if token:
+            self.headers["Authorization"] = f"Bearer {token}"
+
+    def request(
+        self, method: str, url: httpx.URL | str, **kwargs: Any
+    ) -> httpx.Response:
+        if "timeout" not in kwargs:
+            kwargs["timeout"] = get_deadline_timeout(self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+ClientT = TypeVar("ClientT")
+
+
+class PooledClient(Generic[ClientT]):
+    def __init__(self, client: ClientT):
+        self.client = client
+        self.last_used = time.monotonic()
+        self.in_flight = 0
+        self.retired = False
+
+
+def get_pool_key(proxy: Optional[ProxyT], url: str) -> tuple[str, str]:
+    if isinstance(proxy, httpx.Proxy):
+        proxy = proxy.url
+    u = httpx.URL(url)
+    return str(proxy or ""), f"{u.scheme}://{u.netloc.decode()}"
+
+
+class BaseClientPool(ABC, Generic[ClientT]):
+    # registry of pooled clients keyed by (proxy, origin)
+    # regions sharing an edge host (e.g. EUW1, EUN1 -> euc1-red) share
+    # the same warm connections
+    #
+    # least recently used clients are closed when there are more than
+    # max_clients, clients unused for idle_timeout seconds are reaped
+    def __init__(
+        self,
+        max_clients: int = 128,
+        idle_timeout: float = 120,
+        http2: bool = False,
+    ):
+        self.max_clients = max_clients
+        self.idle_timeout = idle_timeout
+        self.http2 = http2
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.reaped = 0
+        self._clients: OrderedDict[tuple[Any, ...], PooledClient[ClientT]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._last_reap = time.monotonic()
+
+    def get_key(self, proxy: Optional[ProxyT], url: str) -> tuple[Any, ...]:
+        return get_pool_key(proxy, url)
+
+    @abstractmethod
+    def create_client(self, proxy: Optional[ProxyT]) -> ClientT: ...
+
+    @abstractmethod
+    def close_client(self, client: ClientT): ...
+
+    def _retire(self, pooled: PooledClient[ClientT]):
+        # clients with in flight requests are closed on release
+        pooled.retired = True
+        if pooled.in_flight == 0:
+            self.close_client(pooled.client)
+
+    def _reap(self, now: float):
+        for key, pooled in list(self._clients.items()):
+            if now - pooled.last_used < self.idle_timeout:
+                # ordered by last use, the rest are newer
+                break
+            if pooled.in_flight > 0:
+                continue
+            del self._clients[key]
+            self.reaped += 1
+            self._retire(pooled)
+        self._last_reap = now
+
+    def acquire(
+        self, url: str, proxy: Optional[ProxyT] = None
+    ) -> PooledClient[ClientT]:
+        key = self.get_key(proxy, url)
+        with self._lock:
+            now = time.monotonic()
+            pooled = self._clients.get(key)
+            if pooled is None:
+                self.misses += 1
+                pooled = PooledClient(self.create_client(proxy))
+                self._clients[key] = pooled
+            else:
+                self.hits += 1
+                self._clients.move_to_end(key)
+            pooled.in_flight += 1
+            pooled.last_used = now
+            while len(self._clients) > self.max_clients:
+                _, lru = self._clients.popitem(last=False)
+                self.evictions += 1
+                self._retire(lru)
+            if now - self._last_reap > self.idle_timeout / 2:
+                self._reap(now)
+            return pooled
+
+    def release(self, pooled: PooledClient[ClientT]):
+        with self._lock:
+            pooled.in_flight -= 1
+            pooled.last_used = time.monotonic()
+            if pooled.retired and pooled.in_flight == 0:
+                self.close_client(pooled.client)
+
+    def reap(self):
+        with self._lock:
+            self._reap(time.monotonic())
+
+    def stats(self):
+        with self._lock:
+            return {
+                "clients": len(self._clients),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "reaped": self.reaped,
+            }
+
+    def close(self):
+        with self._lock:
+            for pooled in self._clients.values():
+                self._retire(pooled)
+            self._clients.clear()
+
+
+class ClientPool(BaseClientPool[RSOClient]):
+    # process wide pool of RSOClient
+    def create_client(self, proxy: Optional[ProxyT]) -> RSOClient:
+        return RSOClient(proxy, http2=self.http2)
+
+    def close_client(self, client: RSOClient):
+        client.close()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        proxy: Optional[ProxyT] = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        pooled = self.acquire(url, proxy)
+        try:
+            return pooled.client.request(method, url, **kwargs)
+        finally:
+            self.release(pooled)
+
+
+# used by rso functions when no client is passed
+CLIENT_POOL = ClientPool()
+
+
+def share_json(res: httpx.Response):
+    # decodes the body once for every caller sharing the response
+    try:
+        data = res.json()
+    except ValueError:
+        return
+    res.json = lambda **kwargs: data  # type: ignore[method-assign]
+
+
+class BaseSingleFlight:
+    # identical GET requests in flight at the same time share one
+    # request and one decoded response, requests with the same url,
+    # params and token are identical
+    #
+    # off by default, callers sharing a response also share the decoded
+    # json and must not modify it
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.requests = 0
+        self.shared = 0
+        self._lock = threading.Lock()
+
+    def get_key(
+        self, url: str, token: str, params: Any = None
+    ) -> tuple[Any, ...]:
+        return str(httpx.URL(url, params=params)), token
+
+    def stats(self):
+        with self._lock:
+            total = self.requests + self.shared
+            return {
+                "requests": self.requests,
+                "shared": self.shared,
+                "dedupe_rate": self.shared / total if total else 0.0,
+            }
+
+
+class SingleFlight(BaseSingleFlight):
+    def __init__(self, enabled: bool = False):
+        super().__init__(enabled)
+        self._calls: dict[tuple[Any, ...], Future[httpx.Response]] = {}
+
+    def do(
+        self, key: tuple[Any, ...], fetch: Callable[[], httpx.Response]
+    ) -> httpx.Response:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                self.requests += 1
+                future = self._calls[key] = Future()
+            else:
+                self.shared += 1
+        if not leader:
+            try:
+                return future.result(get_remaining())
+            except FutureTimeoutError:
+                raise httpx.ReadTimeout("Timed out waiting for a shared GET.")
+        try:
+            res = fetch()
+            share_json(res)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(res)
+            return res
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+# single flight of request, enable with SINGLE_FLIGHT.enabled = True
+SINGLE_FLIGHT = SingleFlight()
+
+# path segments that are ids, e.g. puuids, account and summoner ids
+ID_SEGMENT = re.compile(r"^(?=.*\d)[\w.-]{8,}$|^\d+$")
+
+
+def get_endpoint(url: str) -> str:
+    # url without query and ids, e.g. host/loot/v2/player/*/loot/definitions
+    u = httpx.URL(url)
+    path = "/".join(
+        "*" if ID_SEGMENT.match(s) else s for s in u.path.split("/")
+    )
+    return f"{u.host}{path}"
+
+
+class BaseHedger:
+    # hedged GET requests, when a GET has not answered within the
+    # percentile of the latencies observed for its endpoint, a second
+    # copy is sent and the first response wins
+    #
+    # only GET requests are hedged, endpoints are not hedged until
+    # min_samples latencies are observed, off by default
+    def __init__(
+        self,
+        enabled: bool = False,
+        percentile: float = 95,
+        min_samples: int = 20,
+        max_samples: int = 200,
+    ):
+        self.enabled = enabled
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.max_samples = max_samples
+        self.requests = 0
+        self.hedged = 0
+        self.wins = 0
+        self._latencies: dict[str, deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, latency: float):
+        with self._lock:
+            latencies = self._latencies.get(endpoint)
+            if latencies is None:
+                latencies = self._latencies[endpoint] = deque(
+                    maxlen=self.max_samples
+                )
+            latencies.append(latency)
+
+    def _get_delay(self, endpoint: str) -> Optional[float]:
+        # must be called with self._lock held
+        latencies = self._latencies.get(endpoint)
+        if latencies is None or len(latencies) < self.min_samples:
+            return None
+        ordered = sorted(latencies)
+        i = round(self.percentile / 100 * (len(ordered) - 1))
+        return ordered[i]
+
+    def get_delay(self, endpoint: str) -> Optional[float]:
+        # seconds to wait before sending the second copy, None if
+        # the endpoint must not be hedged yet
+        with self._lock:
+            self.requests += 1
+            return self._get_delay(endpoint)
+
+    def count(self, won: bool):
+        with self._lock:
+            self.hedged += 1
+            self.wins += won
+
+    def stats(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "hedged": self.hedged,
+                "wins": self.wins,
+                "hedge_rate": (
+                    self.hedged / self.requests if self.requests else 0.0
+                ),
+                "win_rate": self.wins / self.hedged if self.hedged else 0.0,
+                "delays": {
+                    endpoint: self._get_delay(endpoint)
+                    for endpoint in self._latencies
+                },
+            }
+
+    def clear(self):
+        with self._lock:
+            self._latencies.clear()
+
+
+class Hedger(BaseHedger):
+    # both copies run on a thread pool, a loser that already started
+    # can not be interrupted, it finishes in the background and its
+    # response is discarded
+    def __init__(
+        self,
+        enabled: bool = False,
+        percentile: float = 95,
+        min_samples: int = 20,
+        max_samples: int = 200,
+        max_workers: int = 256,
+    ):
+        super().__init__(enabled, percentile, min_samples, max_samples)
+        self._executor = ThreadPoolExecutor(
+            max_workers, thread_name_prefix="hedger"
+        )
+
+    def timed(
+        self, endpoint: str, fetch: Callable[[], httpx.Response]
+    ) -> httpx.Response:
+        start = time.perf_counter()
+        res = fetch()
+        self.record(endpoint, time.perf_counter() - start)
+        return res
+
+    def submit(
+        self, endpoint: str, fetch: Callable[[], httpx.Response]
+    ) -> Future[httpx.Response]:
+        # copies the context, so that the step deadline still applies
+        context = contextvars.copy_context()
+        return self._executor.submit(context.run, self.timed, endpoint, fetch)
+
+    def do(
+        self, endpoint: str, fetch: Callable[[], httpx.Response]
+    ) -> httpx.Response:
+        delay = self.get_delay(endpoint)
+        if delay is None:
+            return self.timed(endpoint, fetch)
+        primary = self.submit(endpoint, fetch)
+        done, _ = wait([primary], delay)
+        if done:
+            return primary.result()
+        hedge = self.submit(endpoint, fetch)
+        error: Optional[BaseException] = None
+        for future in as_completed([primary, hedge]):
+            e = future.exception()
+            if e is None:
+                self.count(future is hedge)
+                (hedge if future is primary else primary).cancel()
+                return future.result()
+            error = error or e
+        self.count(False)
+        assert error is not None
+        raise error
+
+
+# hedging of request, enable with HEDGER.enabled = True
+HEDGER = Hedger()
+
+
+def send(
+    method: str,
+    url: str,
+    token: str,
+    proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
+    **kwargs: Any,
+) -> httpx.Response:
+    h = {"Authorization": f"Bearer {token}"}
+    if client is not None:
+        res = client.request(method, url, headers=h, **kwargs)
+    else:
+        res = CLIENT_POOL.request(method, url, proxy, headers=h, **kwargs)
+    if res.status_code in REJECTED_STATUS_CODES:
+        TOKEN_CACHE.invalidate_token(token)
+    return res
+
+
+def request(
+    method: str,
+    url: str,
+    token: str,
+    proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
+    **kwargs: Any,
+) -> httpx.Response:
+    # only GET requests are idempotent, craft, party PUT etc. are never
+    # hedged or shared
+    if method != "GET":
+        return send(method, url, token, proxy, client, **kwargs)
+
+    def fetch() -> httpx.Response:
+        if not HEDGER.enabled:
+            return send(method, url, token, proxy, client, **kwargs)
+        return HEDGER.do(
+            get_endpoint(url),
+            lambda: send(method, url, token, proxy, client, **kwargs),
+        )
+
+    if not SINGLE_FLIGHT.enabled:
+        return fetch()
+    key = SINGLE_FLIGHT.get_key(url, token, kwargs.get("params"))
+    return SINGLE_FLIGHT.do(key, fetch)
@@ -0,0 +1,381 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextvars import ContextVar
+from typing import Any
+from typing import Callable
+from typing import Iterator
+from typing import Optional
+
+import httpx
+
+# responses that mean the host is overloaded
+DROP_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def get_pool_timeout(request: httpx.Request) -> Optional[float]:
+    # requests wait for a slot as long as they would wait for a
+    # connection of the pool
+    return request.extensions.get("timeout", {}).get("pool")
+
+
+class AdaptiveLimit:
+    # AIMD concurrency limit of one host, the limit grows by one per
+    # limit completed requests while it is used up and is multiplied by
+    # backoff on a drop or when the smoothed latency rises above
+    # tolerance times the lowest smoothed latency seen, the lowest
+    # latency drifts up slowly to follow changes of the host
+    #
+    # the limit is only cut once per round trip, requests that started
+    # before the last cut do not cut it again
+    def __init__(self, limit: float, min_limit: float, max_limit: float):
+        self.limit = limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.in_flight = 0
+        self.latency = 0.0
+        self.min_latency = 0.0
+        self.last_decrease = 0.0
+        # futures of the requests waiting for a slot
+        self.waiters: deque[Any] = deque()
+        self.requests = 0
+        self.drops = 0
+        self.increases = 0
+        self.decreases = 0
+        self.waits = 0
+        self.wait_time = 0.0
+
+    def has_room(self) -> bool:
+        return self.in_flight < max(int(self.limit), 1)
+
+    def decrease(self, now: float, started: float, backoff: float):
+        if started <= self.last_decrease:
+            return
+        self.limit = max(self.limit * backoff, self.min_limit)
+        self.last_decrease = now
+        self.decreases += 1
+
+    def complete(
+        self,
+        started: float,
+        latency: Optional[float],
+        dropped: bool,
+        backoff: float,
+        tolerance: float,
+        smoothing: float,
+        drift: float,
+    ):
+        # latency is None for requests that did not complete, e.g.
+        # cancelled ones, they only free their slot
+        now = time.monotonic()
+        saturated = self.in_flight >= int(self.limit)
+        self.in_flight -= 1
+        if dropped:
+            self.drops += 1
+            self.decrease(now, started, backoff)
+            return
+        if latency is None:
+            return
+        if self.min_latency == 0:
+            self.latency = self.min_latency = latency
+        self.latency += (latency - self.latency) * smoothing
+        self.min_latency = min(self.latency, self.min_latency * (1 + drift))
+        if self.latency > self.min_latency * tolerance:
+            self.decrease(now, started, backoff)
+        elif saturated and self.limit < self.max_limit:
+            self.limit = min(self.limit + 1 / self.limit, self.max_limit)
+            self.increases += 1
+
+    def add(self, other: "AdaptiveLimit"):
+        # adds the requests of other, latencies are weighted by requests
+        requests = self.requests + other.requests
+        if requests:
+            self.latency = (
+                self.latency * self.requests + other.latency * other.requests
+            ) / requests
+        self.min_latency = min(
+            (m for m in (self.min_latency, other.min_latency) if m),
+            default=0.0,
+        )
+        self.requests = requests
+        self.drops += other.drops
+        self.increases += other.increases
+        self.decreases += other.decreases
+        self.waits += other.waits
+        self.wait_time += other.wait_time
+
+    def stats(self):
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "latency": self.latency,
+            "min_latency": self.min_latency,
+            "requests": self.requests,
+            "drops": self.drops,
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "waits": self.waits,
+            "avg_wait": self.wait_time / self.waits if self.waits else 0.0,
+        }
+
+
+class BaseConcurrencyLimiter:
+    # adaptive concurrency limit per host, requests wait for a slot of
+    # their host for at most the pool timeout of the request, off by
+    # default
+    def __init__(
+        self,
+        enabled: bool = False,
+        initial: float = 8,
+        min_limit: float = 1,
+        max_limit: float = 64,
+        backoff: float = 0.5,
+        tolerance: float = 2,
+        smoothing: float = 0.2,
+        drift: float = 0.001,
+    ):
+        self.enabled = enabled
+        self.initial = initial
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.drift = drift
+        self._limits: dict[Any, AdaptiveLimit] = {}
+        self._lock = threading.Lock()
+
+    def get_key(self, host: str) -> Any:
+        return host
+
+    def _get_limit(self, host: str) -> AdaptiveLimit:
+        # must be called with self._lock held
+        key = self.get_key(host)
+        limit = self._limits.get(key)
+        if limit is None:
+            limit = self._limits[key] = AdaptiveLimit(
+                self.initial, self.min_limit, self.max_limit
+            )
+        return limit
+
+    def _complete(
+        self,
+        limit: AdaptiveLimit,
+        started: float,
+        latency: Optional[float],
+        dropped: bool,
+    ):
+        # must be called with self._lock held
+        limit.complete(
+            started,
+            latency,
+            dropped,
+            self.backoff,
+            self.tolerance,
+            self.smoothing,
+            self.drift,
+        )
+
+    def _wake(self, limit: AdaptiveLimit):
+        # must be called with self._lock held, hands free slots to the
+        # waiters in order
+        while limit.waiters and limit.has_room():
+            waiter = limit.waiters.popleft()
+            if not waiter.done():
+                limit.in_flight += 1
+                waiter.set_result(None)
+
+    def _record(self, limit: AdaptiveLimit, wait: float):
+        # must be called with self._lock held
+        limit.requests += 1
+        if wait > 0:
+            limit.waits += 1
+            limit.wait_time += wait
+
+    def get_host(self, key: Any) -> str:
+        return key
+
+    def _get_host_limits(self) -> dict[str, list[AdaptiveLimit]]:
+        # must be called with self._lock held
+        hosts: dict[str, list[AdaptiveLimit]] = {}
+        for key, limit in self._limits.items():
+            hosts.setdefault(self.get_host(key), []).append(limit)
+        return hosts
+
+    def stats(self):
+        # {host: {"limit": 12.4, "in_flight": 12, ...}}, the limits of a
+        # host under several keys are summed up
+        stats: dict[str, dict[str, Any]] = {}
+        with self._lock:
+            for host, limits in self._get_host_limits().items():
+                total = AdaptiveLimit(sum(m.limit for m in limits), 0, 0)
+                total.in_flight = sum(m.in_flight for m in limits)
+                for limit in limits:
+                    total.add(limit)
+                stats[host] = total.stats()
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._limits.clear()
+
+
+class ConcurrencyLimiter(BaseConcurrencyLimiter):
+    def acquire(
+        self, host: str, timeout: Optional[float] = None
+    ) -> tuple[AdaptiveLimit, float]:
+        start = time.monotonic()
+        with self._lock:
+            limit = self._get_limit(host)
+            if limit.has_room() and not limit.waiters:
+                limit.in_flight += 1
+                self._record(limit, 0)
+                return limit, start
+            waiter: Future[None] = Future()
+            limit.waiters.append(waiter)
+        try:
+            waiter.result(timeout)
+        except FutureTimeoutError:
+            with self._lock:
+                # fails if the slot was handed over meanwhile
+                if waiter.cancel():
+                    raise httpx.PoolTimeout(
+                        f"Timed out waiting for a request slot of {host}."
+                    )
+        now = time.monotonic()
+        with self._lock:
+            self._record(limit, now - start)
+        return limit, now
+
+    def release(
+        self,
+        limit: AdaptiveLimit,
+        started: float,
+        latency: Optional[float],
+        dropped: bool,
+    ):
+        with self._lock:
+            self._complete(limit, started, latency, dropped)
+            self._wake(limit)
+
+
+# used by all rso transports, enable with CONCURRENCY_LIMITER.enabled = True
+CONCURRENCY_LIMITER = ConcurrencyLimiter()
+
+
+class RequestSlots:
+    # fixed limit of requests in flight per host for the code running
+    # with it in REQUEST_SLOTS, e.g. all sessions of a SessionExecutor
+    def __init__(self, max_per_host: int):
+        self.max_per_host = max_per_host
+        self.waits = 0
+        self._semaphores: dict[str, threading.Semaphore] = {}
+        self._lock = threading.Lock()
+
+    def acquire(
+        self, host: str, timeout: Optional[float] = None
+    ) -> threading.Semaphore:
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = self._semaphores[host] = threading.Semaphore(
+                    self.max_per_host
+                )
+        if semaphore.acquire(blocking=False):
+            return semaphore
+        with self._lock:
+            self.waits += 1
+        if not semaphore.acquire(timeout=timeout):
+            raise httpx.PoolTimeout(
+                f"Timed out waiting for a request slot of {host}."
+            )
+        return semaphore
+
+
+# request slots of the running code, copied into graph steps
+REQUEST_SLOTS: ContextVar[Optional[RequestSlots]] = ContextVar(
+    "request_slots", default=None
+)
+
+
+class ReleasingStream(httpx.SyncByteStream):
+    # frees the slot of a request once its body is read
+    def __init__(
+        self, stream: httpx.SyncByteStream, release: Callable[[], None]
+    ):
+        self.stream = stream
+        self.release = release
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield from self.stream
+
+    def close(self):
+        try:
+            self.stream.close()
+        finally:
+            self.release()
+
+
+class ConcurrencyLimitedTransport(httpx.BaseTransport):
+    def __init__(
+        self,
+        transport: httpx.BaseTransport,
+        limiter: ConcurrencyLimiter = CONCURRENCY_LIMITER,
+    ):
+        self.transport = transport
+        self.limiter = limiter
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        slots = REQUEST_SLOTS.get()
+        if slots is None:
+            return self.handle_limited_request(request)
+        semaphore = slots.acquire(request.url.host, get_pool_timeout(request))
+        try:
+            response = self.handle_limited_request(request)
+        except BaseException:
+            semaphore.release()
+            raise
+        released = False
+
+        def release():
+            nonlocal released
+            if not released:
+                released = True
+                semaphore.release()
+
+        assert isinstance(response.stream, httpx.SyncByteStream)
+        response.stream = ReleasingStream(response.stream, release)
+        return response
+
+    def handle_limited_request(self, request: httpx.Request) -> httpx.Response:
+        if not self.limiter.enabled:
+            return self.transport.handle_request(request)
+        limit, started = self.limiter.acquire(
+            request.url.host, get_pool_timeout(request)
+        )
+        try:
+            response = self.transport.handle_request(request)
+        except (httpx.TimeoutException, httpx.NetworkError):
+            self.limiter.release(limit, started, None, True)
+            raise
+        except BaseException:
+            self.limiter.release(limit, started, None, False)
+            raise
+        dropped = response.status_code in DROP_STATUS_CODES
+        released = False
+
+        def release():
+            nonlocal released
+            if not released:
+                released = True
+                latency = time.monotonic() - started
+                self.limiter.release(limit, started, latency, dropped)
+
+        assert isinstance(response.stream, httpx.SyncByteStream)
+        response.stream = ReleasingStream(response.stream, release)
+        return response
+
+    def close(self):
+        self.transport.close()
@@ -4,9 +4,8 @@ import uuid
 from typing import Any
 from typing import Optional
 
-import httpx
-
-from league_client.constants import HEADERS
+from league_client.rso.client import RSOClient
+from league_client.rso.client import request
 from league_client.rso.constants import LootNameTypes
 from league_client.rso.loot import get_champion_mastery_chest_count
 from league_client.rso.loot import get_generic_chest_count
@@ -26,11 +25,9 @@ def craft(
     loot_names: list[LootNameTypes],
     repeat: int = 1,
     proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
 ):
     """Craft or open a chest item"""
-    h = HEADERS.copy()
-    h["Authorization"] = f"Bearer {ledge_token}"
-
     data = {
         "clientId": "LolClient-LEdge",
         "lootNameRefIds": [
@@ -40,11 +37,13 @@ def craft(
         "repeat": repeat,
         "transactionId": str(uuid.uuid4()),
     }
-    res = httpx.post(
+    res = request(
+        "POST",
         f"{ledge_url}/loot/v2/player/{puuid}/craft",
-        headers=h,
+        ledge_token,
+        proxy,
+        client,
         json=data,
-        proxy=proxy,
     )
     res.raise_for_status()
     return res.json()
@@ -56,6 +55,7 @@ def craft_key_from_key_fragments(
     puuid: str,
     repeat: int = 1,
     proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
 ):
     return craft(
         ledge_token,
@@ -65,6 +65,7 @@ def craft_key_from_key_fragments(
         [LootNameTypes.key_fragment],
         repeat,
         proxy,
+        client,
     )
 
 
@@ -74,6 +75,7 @@ def craft_generic_chests(
     puuid: str,
     repeat: int = 1,
     proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
 ):
     return craft(
         ledge_token,
@@ -83,6 +85,7 @@ def craft_generic_chests(
         [LootNameTypes.generic_chest, LootNameTypes.key],
         repeat,
         proxy,
+        client,
     )
 
 
@@ -92,6 +95,7 @@ def craft_champion_mastery_chest(
     puuid: str,
     repeat: int = 1,
     proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
 ):
     return craft(
         ledge_token,
@@ -101,6 +105,7 @@ def craft_champion_mastery_chest(
         [LootNameTypes.champion_mastery_chest, LootNameTypes.key],
         repeat,
         proxy,
+        client,
     )
 
 
@@ -110,10 +115,11 @@ def craft_keys_and_generic_chests(
     puuid: str,
     retry_limit: int = 10,
     proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
 ):
     for _ in range(retry_limit):
 
-        loot_data = get_loot_data(ledge_token, ledge_url, puuid, proxy)
+        loot_data = get_loot_data(ledge_token, ledge_url, puuid, proxy, client)
 
         forgable_keys = int(get_key_fragment_count(loot_data) / 3)
         key_count = get_key_count(loot_data)
@@ -124,14 +130,16 @@ def craft_keys_and_generic_chests(
             return
         if forgable_keys > 0:
             craft_key_from_key_fragments(
-                ledge_token, ledge_url, puuid, forgable_keys, proxy
+                ledge_token, ledge_url, puuid, forgable_keys, proxy, client
             )
             time.sleep(0.5)
 
         if min(key_count, chest_count) > 0:
-            craft_generic_chests(ledge_token, ledge_url, puuid, 1, proxy)
+            craft_generic_chests(
+                ledge_token, ledge_url, puuid, 1, proxy, client
+            )
             craft_champion_mastery_chest(
-                ledge_token, ledge_url, puuid, 1, proxy
+                ledge_token, ledge_url, puuid, 1, proxy, client
             )
         time.sleep(0.5)
 
@@ -142,9 +150,10 @@ def craft_keys_and_masterwork_chests(
     puuid: str,
     retry_limit: int = 10,
     proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
 ):
     for _ in range(retry_limit):
-        loot_data = get_loot_data(ledge_token, ledge_url, puuid, proxy)
+        loot_data = get_loot_data(ledge_token, ledge_url, puuid, proxy, client)
 
         forgable_keys = int(get_key_fragment_count(loot_data) / 3)
         key_count = get_key_count(loot_data)
@@ -154,15 +163,17 @@ def craft_keys_and_masterwork_chests(
             return
         if forgable_keys > 0:
             craft_key_from_key_fragments(
-                ledge_token, ledge_url, puuid, forgable_keys, proxy
+                ledge_token, ledge_url, puuid, forgable_keys, proxy, client
             )
             time.sleep(0.5)
             continue
 
         if min(key_count, chest_count) > 0:
-            craft_generic_chests(ledge_token, ledge_url, puuid, 1, proxy)
+            craft_generic_chests(
+                ledge_token, ledge_url, puuid, 1, proxy, client
+            )
             craft_champion_mastery_chest(
-                ledge_token, ledge_url, puuid, 1, proxy
+                ledge_token, ledge_url, puuid, 1, proxy, client
             )
         time.sleep(0.5)
 
@@ -175,6 +186,7 @@ def craft_chest_by_loot_name(
     requires_key: bool = False,
     repeat: int = 1,
     proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
 ):
     """Craft or open an chest item by loot id"""
     loot_names = [loot_name]
@@ -188,6 +200,7 @@ def craft_chest_by_loot_name(
         loot_names,
         repeat,
         proxy,
+        client,
     )
 
 
@@ -199,6 +212,7 @@ def craft_chest_loots(
     requires_key: bool = True,
     delay: int = 1,
     proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
 ):
     key_count = 0
     if requires_key:
@@ -218,6 +232,7 @@ def craft_chest_loots(
             requires_key,
             count,
             proxy,
+            client,
         )
         if delay > 0:
             time.sleep(delay)
@@ -229,8 +244,9 @@ def craft_champion_capsules(
     puuid: str,
     delay: int = 1,
     proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
 ):
-    loot_data = get_loot_data(ledge_token, ledge_url, puuid, proxy)
+    loot_data = get_loot_data(ledge_token, ledge_url, puuid, proxy, client)
     champion_capsules = [
         item
         for item in loot_data["playerLoot"]
@@ -247,6 +263,7 @@ def craft_champion_capsules(
         False,
         delay,
         proxy,
+        client,
     )
 
 
@@ -255,8 +272,9 @@ def craft_mythic_essence_into_skin_shard(
     ledge_url: str,
     puuid: str,
     proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
 ):
-    loot_data = get_loot_data(ledge_token, ledge_url, puuid, proxy)
+    loot_data = get_loot_data(ledge_token, ledge_url, puuid, proxy, client)
     count: int = get_mythic_essence_count(loot_data)
     if count < 10:
         return
@@ -268,4 +286,5 @@ def craft_mythic_essence_into_skin_shard(
         [LootNameTypes.mythic_essence],
         count // 10,
         proxy,
+        client,
     )
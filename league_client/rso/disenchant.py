@@ -1,5 +1,6 @@
 from typing import Optional
 
+from league_client.rso.client import RSOClient
 from league_client.rso.craft import craft
 from league_client.rso.loot import get_loot_data
 from league_client.types import ProxyT
@@ -10,8 +11,9 @@ def disenchant_champion_shards(
     ledge_url: str,
     puuid: str,
     proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
 ):
-    loot_data = get_loot_data(ledge_token, ledge_url, puuid, proxy)
+    loot_data = get_loot_data(ledge_token, ledge_url, puuid, proxy, client)
     champion_shards = [
         item
         for item in loot_data["playerLoot"]  # ? ["lootItemList"]["lootItems"]
@@ -27,6 +29,7 @@ def disenchant_champion_shards(
             [shard["lootName"]],
             shard["count"],
             proxy,
+            client,
         )
 
 
@@ -35,8 +38,9 @@ def disenchant_eternals(
     ledge_url: str,
     puuid: str,
     proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
 ):
-    loot_data = get_loot_data(ledge_token, ledge_url, puuid, proxy)
+    loot_data = get_loot_data(ledge_token, ledge_url, puuid, proxy, client)
     eternals = [
         item
         for item in loot_data["playerLoot"]  # ? ["lootItemList"]["lootItems"]
@@ -51,6 +55,7 @@ def disenchant_eternals(
             [eternal["lootName"]],
             eternal["count"],
             proxy,
+            client,
         )
 
 
@@ -59,8 +64,9 @@ def disenchant_ward_skins(
     ledge_url: str,
     puuid: str,
     proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
 ):
-    loot_data = get_loot_data(ledge_token, ledge_url, puuid, proxy)
+    loot_data = get_loot_data(ledge_token, ledge_url, puuid, proxy, client)
     ward_skins = [
         item
         for item in loot_data["playerLoot"]  # ? ["lootItemList"]["lootItems"]
@@ -76,4 +82,5 @@ def disenchant_ward_skins(
             [skin["lootName"]],
             skin["count"],
             proxy,
+            client,
         )
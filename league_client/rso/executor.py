@@ -0,0 +1,165 @@
+import contextvars
+import queue
+import threading
+from collections import defaultdict
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+
+import httpx
+
+from league_client.rso.concurrency import REQUEST_SLOTS
+from league_client.rso.concurrency import RequestSlots
+from league_client.rso.constants import LEAGUE_EDGE_URL
+from league_client.rso.models import RSOSession
+
+
+def get_edge_host(region: str) -> str:
+    # league edge host of a region, most requests of a session go there
+    url = LEAGUE_EDGE_URL.get(region)
+    if url is None:
+        return region
+    return httpx.URL(url).host
+
+
+class SessionExecutor:
+    # runs a function for many sessions, at most max_workers at a time
+    # and at most max_per_host for sessions on the same edge host, the
+    # requests of all sessions are capped at max_per_host per host
+    # where they are sent, as every session fans out several of them
+    #
+    # sessions are read lazily from the input, at most max_workers +
+    # max_waiting sessions are read ahead, so memory does not grow with
+    # the length of the input
+    def __init__(
+        self,
+        max_workers: int = 32,
+        max_per_host: int = 8,
+        max_waiting: Optional[int] = None,
+        get_host: Callable[[str], str] = get_edge_host,
+    ):
+        self.max_workers = max_workers
+        self.max_per_host = max_per_host
+        self.max_waiting = max_waiting or max_workers * 4
+        self.get_host = get_host
+        self.started = 0
+        self.completed = 0
+        self.failed = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers, thread_name_prefix="session_executor"
+        )
+        self._slots = RequestSlots(max_per_host)
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args: object):
+        self.shutdown()
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def as_completed(
+        self,
+        func: Callable[..., Any],
+        sessions: Iterable[RSOSession],
+        *args: Any,
+        **kwargs: Any,
+    ) -> Iterator[tuple[RSOSession, Future[Any]]]:
+        """
+        Call func(session, *args, **kwargs) for each session and yield
+        (session, future) pairs as the calls complete.
+
+        sessions is read on a separate thread, so completed calls are
+        yielded while it blocks, e.g. on a queue that is fed over time.
+        At most max_workers + max_waiting sessions are read ahead.
+
+        Sessions that are still running when the generator is closed
+        finish in the background.
+        """
+        # ("session", session), ("done", future), ("end", None) or
+        # ("error", exception) of the input
+        events: queue.Queue[tuple[str, Any]] = queue.Queue()
+        read_ahead = threading.Semaphore(self.max_workers + self.max_waiting)
+        closed = threading.Event()
+
+        def feed():
+            try:
+                for session in sessions:
+                    read_ahead.acquire()
+                    if closed.is_set():
+                        return
+                    events.put(("session", session))
+            except BaseException as e:
+                events.put(("error", e))
+            else:
+                events.put(("end", None))
+
+        threading.Thread(
+            target=feed, name="session_executor_feeder", daemon=True
+        ).start()
+        exhausted = False
+        running: dict[Future[Any], tuple[RSOSession, str]] = {}
+        waiting: defaultdict[str, deque[RSOSession]] = defaultdict(deque)
+        in_flight: defaultdict[str, int] = defaultdict(int)
+
+        def submit(session: RSOSession, host: str):
+            context = contextvars.copy_context()
+            context.run(REQUEST_SLOTS.set, self._slots)
+            future = self._executor.submit(
+                context.run, func, session, *args, **kwargs
+            )
+            running[future] = session, host
+            in_flight[host] += 1
+            with self._lock:
+                self.started += 1
+            future.add_done_callback(lambda f: events.put(("done", f)))
+
+        try:
+            while True:
+                for host, hosts_waiting in waiting.items():
+                    while (
+                        hosts_waiting
+                        and len(running) < self.max_workers
+                        and in_flight[host] < self.max_per_host
+                    ):
+                        submit(hosts_waiting.popleft(), host)
+                if exhausted and not running:
+                    # hosts with waiting sessions always have a free
+                    # slot when nothing is running
+                    return
+                kind, item = events.get()
+                if kind == "error":
+                    raise item
+                if kind == "end":
+                    exhausted = True
+                elif kind == "session":
+                    host = self.get_host(item.region)
+                    waiting[host].append(item)
+                else:
+                    session, host = running.pop(item)
+                    in_flight[host] -= 1
+                    read_ahead.release()
+                    with self._lock:
+                        self.completed += 1
+                        self.failed += item.exception() is not None
+                    yield session, item
+        finally:
+            closed.set()
+            # unblocks the feeder
+            read_ahead.release()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "started": self.started,
+                "completed": self.completed,
+                "failed": self.failed,
+                "request_waits": self._slots.waits,
+            }
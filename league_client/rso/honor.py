@@ -1,9 +1,8 @@
 from typing import Any
 from typing import Optional
 
-import httpx
-
-from league_client.constants import HEADERS
+from league_client.rso.client import RSOClient
+from league_client.rso.client import request
 from league_client.types import ProxyT
 
 
@@ -11,13 +10,14 @@ def get_honor_data(
     ledge_token: str,
     ledge_url: str,
     proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
 ):
-    h = HEADERS.copy()
-    h["Authorization"] = f"Bearer {ledge_token}"
-    res = httpx.get(
+    res = request(
+        "GET",
         f"{ledge_url}/honor-edge/v2/retrieveProfileInfo/",
-        headers=h,
-        proxy=proxy,
+        ledge_token,
+        proxy,
+        client,
     )
     res.raise_for_status()
     return res.json()
@@ -1,11 +1,13 @@
+from functools import partial
 from typing import Any
+from typing import Iterable
 from typing import List
 from typing import Optional
 
-import httpx
-
-from league_client.constants import HEADERS
+from league_client.rso.client import RSOClient
+from league_client.rso.client import request
 from league_client.rso.constants import InventoryTypes
+from league_client.scheduler import run_all
 from league_client.types import ProxyT
 
 
@@ -17,12 +19,14 @@ def _inventory_data_from_url(
     service_location: str,
     inventory_types: List[InventoryTypes],
     proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
 ):
-    h = HEADERS.copy()
-    h["Authorization"] = f"Bearer {ledge_token}"
-    res = httpx.get(
+    res = request(
+        "GET",
         inventory_url,
-        headers=h,
+        ledge_token,
+        proxy,
+        client,
         params={
             "puuid": puuid,
             "accountId": account_id,
@@ -30,7 +34,6 @@ def _inventory_data_from_url(
             "inventoryTypes": [item.value for item in inventory_types],
             "signed": True,
         },
-        proxy=proxy,
     )
     res.raise_for_status()
     return res.json()["data"]
@@ -44,6 +47,7 @@ def get_inventory_data(
     ledge_url: str,
     inventory_types: List[InventoryTypes],
     proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
 ):
     return _inventory_data_from_url(
         f"{ledge_url}/lolinventoryservice-ledge/v1/inventories/simple",
@@ -53,6 +57,7 @@ def get_inventory_data(
         service_location,
         inventory_types,
         proxy,
+        client,
     )
 
 
@@ -68,6 +73,7 @@ def get_inventory_data_v2(
     ledge_url: str,
     inventory_types: List[InventoryTypes],
     proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
 ):
     return _inventory_data_from_url(
         f"{ledge_url}/lolinventoryservice-ledge/v2/inventoriesWithLoyalty",
@@ -77,8 +83,92 @@ def get_inventory_data_v2(
         service_location,
         inventory_types,
         proxy,
+        client,
     )
 
 
 def get_inventory_token_v2(inventory_data_v2: dict[str, Any]):
     return inventory_data_v2["itemsJwt"]
+
+
+def merge_inventory_types(
+    type_sets: Iterable[Iterable[InventoryTypes]],
+) -> list[list[InventoryTypes]]:
+    # merges overlapping sets, every set is then part of exactly one
+    # merged set, types keep the order of the largest set, so a set that
+    # contains the others is requested as is
+    merged: list[list[InventoryTypes]] = []
+    for types in type_sets:
+        types = list(dict.fromkeys(types))
+        parts = [m for m in merged if not set(m).isdisjoint(types)]
+        for m in parts:
+            merged.remove(m)
+        parts = sorted([*parts, types], key=len, reverse=True)
+        merged.append(list(dict.fromkeys(t for m in parts for t in m)))
+    return merged
+
+
+def get_inventory_slice(
+    inventory_data: dict[str, Any], inventory_types: List[InventoryTypes]
+):
+    # inventory data with the items of inventory_types only, itemsJwt
+    # still signs all types of inventory_data
+    return {
+        **inventory_data,
+        "items": {
+            t.value: inventory_data["items"].get(t.value, [])
+            for t in inventory_types
+        },
+    }
+
+
+def get_inventory_data_many(
+    ledge_token: str,
+    puuid: str,
+    account_id: int,
+    service_location: str,
+    ledge_url: str,
+    type_sets: List[List[InventoryTypes]],
+    proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
+):
+    """
+    Get inventory data for each set of inventory types, overlapping
+    sets are merged into one request. Returns the inventory data of
+    each set in order, sets that were merged get a slice of the merged
+    inventory data. The merged sets are requested concurrently on
+    league_client.scheduler.EXECUTOR.
+    """
+    merged = merge_inventory_types(type_sets)
+    inventory_datas = run_all(
+        [
+            partial(
+                get_inventory_data,
+                ledge_token,
+                puuid,
+                account_id,
+                service_location,
+                ledge_url,
+                types,
+                proxy,
+                client,
+            )
+            for types in merged
+        ]
+    )
+    return [
+        get_merged_slice(merged, inventory_datas, types) for types in type_sets
+    ]
+
+
+def get_merged_slice(
+    merged: List[List[InventoryTypes]],
+    inventory_datas: List[dict[str, Any]],
+    inventory_types: List[InventoryTypes],
+):
+    for types, inventory_data in zip(merged, inventory_datas):
+        if set(inventory_types).issubset(types):
+            if set(inventory_types) == set(types):
+                return inventory_data
+            return get_inventory_slice(inventory_data, inventory_types)
+    raise ValueError(f"{inventory_types} was not requested.")
@@ -1,28 +1,158 @@
+import hashlib
+import json
+import re
+import threading
+import weakref
 from typing import Any
 from typing import Optional
 
-import httpx
-
-from league_client.constants import HEADERS
+from league_client.rso.client import RSOClient
+from league_client.rso.client import request
 from league_client.rso.constants import LootNameTypes
 from league_client.types import ProxyT
 
+# key of the loot definitions response that belongs to the player,
+# the other keys are static loot and recipe definitions
+PLAYER_LOOT_KEY = "playerLoot"
+# the regex only runs where the quoted key is found, searching the whole
+# response with it is slower than decoding it
+PLAYER_LOOT_NAME = f'"{PLAYER_LOOT_KEY}"'
+PLAYER_LOOT_PATTERN = re.compile(rf"{PLAYER_LOOT_NAME}\s*:\s*")
+JSON_DECODER = json.JSONDecoder()
+
+
+class LootDefinitions:
+    # static part of a loot definitions response, the same for all
+    # players of a region on a patch
+    def __init__(self, ledge_url: str, digest: str, data: dict[str, Any]):
+        self.ledge_url = ledge_url
+        self.digest = digest
+        self.data = data
+
+
+class LootData(dict[str, Any]):
+    # loot data of a player, the values of definition keys are shared
+    # with all players that have the same definitions and must not be
+    # modified
+    definitions: Optional[LootDefinitions] = None
+
+
+class LootDefinitionsCache:
+    # loot definitions by ledge url and a hash of the response text
+    # without the player loot, definitions are dropped once no LootData
+    # references them
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._definitions: weakref.WeakValueDictionary[
+            tuple[str, str], LootDefinitions
+        ] = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def get(self, ledge_url: str, digest: str) -> Optional[LootDefinitions]:
+        with self._lock:
+            definitions = self._definitions.get((ledge_url, digest))
+            if definitions is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return definitions
+
+    def intern(
+        self, ledge_url: str, digest: str, data: dict[str, Any]
+    ) -> LootDefinitions:
+        with self._lock:
+            definitions = self._definitions.get((ledge_url, digest))
+            if definitions is None:
+                definitions = LootDefinitions(ledge_url, digest, data)
+                self._definitions[(ledge_url, digest)] = definitions
+            return definitions
+
+    def stats(self):
+        with self._lock:
+            return {
+                "definitions": len(self._definitions),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+LOOT_DEFINITIONS = LootDefinitionsCache()
+
+
+def get_player_loot_span(text: str) -> Optional[tuple[int, int]]:
+    # start and end of the playerLoot value in the response text,
+    # only the player loot is decoded
+    index = text.find(PLAYER_LOOT_NAME)
+    while index != -1:
+        match = PLAYER_LOOT_PATTERN.match(text, index)
+        # a name inside a string value has an escaped quote
+        if match is not None and text[index - 1 : index] != "\\":
+            try:
+                _, end = JSON_DECODER.raw_decode(text, match.end())
+            except json.JSONDecodeError:
+                return None
+            return match.end(), end
+        index = text.find(PLAYER_LOOT_NAME, index + 1)
+    return None
+
+
+def parse_loot_data(
+    text: str,
+    ledge_url: str,
+    cache: Optional[LootDefinitionsCache] = LOOT_DEFINITIONS,
+) -> dict[str, Any]:
+    # the definitions are looked up by a hash of the response text
+    # without the player loot, so that only the player loot is decoded
+    # when they are cached
+    span = None if cache is None else get_player_loot_span(text)
+    if cache is None or span is None:
+        return json.loads(text)
+    start, end = span
+    # the offset keeps responses that only differ in where the player
+    # loot is apart
+    digest = hashlib.sha256(str(start).encode())
+    digest.update(text[:start].encode())
+    digest.update(text[end:].encode())
+    key = digest.hexdigest()
+    definitions = cache.get(ledge_url, key)
+    if definitions is None:
+        loot_data = json.loads(text)
+        player_loot = loot_data.get(PLAYER_LOOT_KEY)
+        # the match must be the top level key, responses with the same
+        # hash have the same structure
+        if player_loot != json.loads(text[start:end]):
+            return loot_data
+        definitions = cache.intern(
+            ledge_url,
+            key,
+            {k: v for k, v in loot_data.items() if k != PLAYER_LOOT_KEY},
+        )
+    else:
+        player_loot = json.loads(text[start:end])
+    shared = LootData(definitions.data)
+    shared[PLAYER_LOOT_KEY] = player_loot
+    shared.definitions = definitions
+    return shared
+
 
 def get_loot_data(
     ledge_token: str,
     ledge_url: str,
     puuid: str,
     proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
+    cache: Optional[LootDefinitionsCache] = LOOT_DEFINITIONS,
 ):
-    h = HEADERS.copy()
-    h["Authorization"] = f"Bearer {ledge_token}"
-    res = httpx.get(
+    res = request(
+        "GET",
         f"{ledge_url}/loot/v2/player/{puuid}/loot/definitions",
-        headers=h,
-        proxy=proxy,
+        ledge_token,
+        proxy,
+        client,
     )
     res.raise_for_status()
-    return res.json()
+    return parse_loot_data(res.text, ledge_url, cache)
 
 
 def get_loot_count(loot_data: dict[str, Any], loot_name: str):
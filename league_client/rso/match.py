@@ -1,9 +1,8 @@
 from typing import Any
 from typing import Optional
 
-import httpx
-
-from league_client.constants import HEADERS
+from league_client.rso.client import RSOClient
+from league_client.rso.client import request
 from league_client.types import ProxyT
 
 
@@ -13,16 +12,17 @@ def get_match_data(
     player_platform_edge_url: str,
     proxy: Optional[ProxyT] = None,
     count: int = 30,
+    client: Optional[RSOClient] = None,
 ):
-    h = HEADERS.copy()
-    h["Authorization"] = f"Bearer {access_token}"
-    res = httpx.get(
+    res = request(
+        "GET",
         (
             f"{player_platform_edge_url}/match-history-query/v1/products"
             f"/lol/player/{puuid}/SUMMARY?startIndex=0&count={count}"
         ),
-        headers=h,
-        proxy=proxy,
+        access_token,
+        proxy,
+        client,
     )
     res.raise_for_status()
     return res.json()
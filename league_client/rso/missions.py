@@ -1,8 +1,7 @@
 from typing import Optional
 
-import httpx
-
-from league_client.constants import HEADERS
+from league_client.rso.client import RSOClient
+from league_client.rso.client import request
 from league_client.types import ProxyT
 
 
@@ -12,12 +11,14 @@ def get_missions(
     inventory_tokens: list[str],  # list of `EVENT_PASS, CHAMPION_SKIN` tokens
     userinfo_token: str,
     proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
 ):
-    h = HEADERS.copy()
-    h["Authorization"] = f"Bearer {ledge_token}"
-    res = httpx.put(
+    res = request(
+        "PUT",
         f"{ledge_url}/missions/v5/player",
-        headers=h,
+        ledge_token,
+        proxy,
+        client,
         json={
             "level": 30,
             "loyaltyEnabled": False,
@@ -30,7 +31,6 @@ def get_missions(
             },
             "userInfoToken": userinfo_token,
         },
-        proxy=proxy,
     )
     res.raise_for_status()
     return res.json()
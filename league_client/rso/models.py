@@ -3,7 +3,10 @@ from typing import Optional
 from urllib.parse import urljoin
 
 from pydantic import BaseModel
+from pydantic import PrivateAttr
 
+from league_client.rso.auth import process_access_token
+from league_client.rso.client import RSOClient
 from league_client.rso.constants import DISCOVEROUS_SERVICE_LOCATION
 from league_client.rso.constants import LEAGUE_EDGE_URL
 from league_client.rso.constants import PLAYER_PLATFORM_EDGE_URL
@@ -12,6 +15,7 @@ from league_client.rso.constants import PLAYER_PLATFORM_EDGE_URL
 class RSOSession(BaseModel):
 
     ssid: str = ""
+    clid: str = ""
     access_token: str = ""
     scope: str = ""
     iss: str = ""
@@ -34,6 +38,38 @@ class RSOSession(BaseModel):
 
     proxy: Optional[str] = None
 
+    _client: Optional[RSOClient] = PrivateAttr(None)
+
+    def get_client(self) -> RSOClient:
+        # client owned by this session, opt-in, requests without a
+        # client use the shared CLIENT_POOL, close with session.close()
+        if self._client is None or self._client.is_closed:
+            self._client = RSOClient(self.proxy)
+        return self._client
+
+    def close(self):
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    def update_login(self, login: tuple[str, ...]):
+        # login is returned by login_using_ssid or login_using_credentials
+        (
+            self.ssid,
+            self.clid,
+            self.access_token,
+            self.scope,
+            self.iss,
+            self.id_token,
+            self.token_type,
+            self.session_state,
+            self.expires_in,
+        ) = login
+        self.puuid, self.region, account_id = process_access_token(
+            self.access_token
+        )
+        self.account_id = int(account_id)
+
     def get_ledge_url(self, path: str = ""):
         return urljoin(LEAGUE_EDGE_URL[self.region], path)
 
@@ -0,0 +1,421 @@
+import socket
+import ssl
+import threading
+import time
+import typing
+import weakref
+from typing import Any
+from typing import Callable
+from typing import Optional
+
+import httpcore
+import httpx
+from httpcore._backends.sync import SyncStream
+
+from league_client.constants import SSL_CONTEXT
+from league_client.rso.concurrency import ConcurrencyLimitedTransport
+from league_client.rso.ratelimit import RateLimitedTransport
+from league_client.rso.retry import RetryTransport
+from league_client.types import ProxyT
+
+# (family, sockaddr) of getaddrinfo
+AddressT = tuple[socket.AddressFamily, tuple[Any, ...]]
+
+
+class DNSCache:
+    # caches getaddrinfo results for ttl seconds
+    def __init__(self, ttl: float = 300):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._cache: dict[tuple[str, int], tuple[float, list[AddressT]]] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, host: str, port: int) -> list[AddressT]:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get((host, port))
+            if cached is not None and cached[0] > now:
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+        addresses: list[AddressT] = [
+            (family, sockaddr)
+            for family, _, _, _, sockaddr in socket.getaddrinfo(
+                host, port, type=socket.SOCK_STREAM
+            )
+        ]
+        with self._lock:
+            self._cache[(host, port)] = (now + self.ttl, addresses)
+        return addresses
+
+    def invalidate(self, host: str, port: int):
+        with self._lock:
+            self._cache.pop((host, port), None)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+class TLSSessionCache:
+    # tls sessions can only be resumed with the ssl context that
+    # created them, so sessions are stored per context, proxy and
+    # hostname, a session of one proxy is never resumed through another
+    def __init__(self):
+        self.handshakes = 0
+        self.resumed = 0
+        self._sessions: weakref.WeakKeyDictionary[
+            ssl.SSLContext, dict[tuple[Any, str], ssl.SSLSession]
+        ] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def get(
+        self, ssl_context: ssl.SSLContext, proxy_key: Any, hostname: str
+    ) -> Optional[ssl.SSLSession]:
+        with self._lock:
+            sessions = self._sessions.get(ssl_context, {})
+            return sessions.get((proxy_key, hostname))
+
+    def set(
+        self,
+        ssl_context: ssl.SSLContext,
+        proxy_key: Any,
+        hostname: str,
+        session: Optional[ssl.SSLSession],
+    ):
+        if session is None:
+            return
+        with self._lock:
+            sessions = self._sessions.setdefault(ssl_context, {})
+            sessions[(proxy_key, hostname)] = session
+
+    def count(self, resumed: bool):
+        with self._lock:
+            self.handshakes += 1
+            self.resumed += resumed
+
+    def clear(self):
+        with self._lock:
+            self._sessions.clear()
+
+
+DNS_CACHE = DNSCache()
+TLS_SESSIONS = TLSSessionCache()
+
+
+def get_proxy_key(proxy: Optional[ProxyT]) -> Any:
+    # proxies with other credentials may exit through other addresses
+    if proxy is None:
+        return None
+    if not isinstance(proxy, httpx.Proxy):
+        proxy = httpx.Proxy(proxy)
+    return str(proxy.url), proxy.raw_auth
+
+
+class ResumingStream(SyncStream):
+    # reuses tls session tickets of previous connections to the same
+    # host through the same proxy, SyncStream is private to httpcore,
+    # which is pinned to the tested minor version for it
+    def __init__(
+        self,
+        sock: socket.socket,
+        proxy_key: Any = None,
+        ssl_context: Optional[ssl.SSLContext] = None,
+        hostname: Optional[str] = None,
+    ):
+        super().__init__(sock)
+        self.proxy_key = proxy_key
+        self.ssl_context = ssl_context
+        self.hostname = hostname
+
+    def start_tls(
+        self,
+        ssl_context: ssl.SSLContext,
+        server_hostname: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> httpcore.NetworkStream:
+        if server_hostname is None or isinstance(self._sock, ssl.SSLSocket):
+            return super().start_tls(ssl_context, server_hostname, timeout)
+        session = TLS_SESSIONS.get(
+            ssl_context, self.proxy_key, server_hostname
+        )
+        try:
+            self._sock.settimeout(timeout)
+            sock = ssl_context.wrap_socket(
+                self._sock, server_hostname=server_hostname, session=session
+            )
+        except socket.timeout as e:
+            self.close()
+            raise httpcore.ConnectTimeout(e) from e
+        except OSError as e:
+            self.close()
+            raise httpcore.ConnectError(e) from e
+        # None if the handshake is not done, it is done here
+        TLS_SESSIONS.count(sock.session_reused is True)
+        TLS_SESSIONS.set(
+            ssl_context, self.proxy_key, server_hostname, sock.session
+        )
+        return ResumingStream(
+            sock, self.proxy_key, ssl_context, server_hostname
+        )
+
+    def close(self):
+        # tls 1.3 session tickets are sent after the handshake
+        if (
+            self.ssl_context is not None
+            and self.hostname is not None
+            and isinstance(self._sock, ssl.SSLSocket)
+        ):
+            TLS_SESSIONS.set(
+                self.ssl_context,
+                self.proxy_key,
+                self.hostname,
+                self._sock.session,
+            )
+        super().close()
+
+
+class CachingBackend(httpcore.SyncBackend):
+    # network backend using DNS_CACHE and TLS_SESSIONS, one per proxy
+    def __init__(self, proxy_key: Any = None):
+        self.proxy_key = proxy_key
+
+    def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: Optional[float] = None,
+        local_address: Optional[str] = None,
+        socket_options: Optional[typing.Iterable[Any]] = None,
+    ) -> httpcore.NetworkStream:
+        try:
+            addresses = DNS_CACHE.resolve(host, port)
+        except OSError as e:
+            raise httpcore.ConnectError(e) from e
+        error: Optional[Exception] = None
+        for family, sockaddr in addresses:
+            sock = socket.socket(family, socket.SOCK_STREAM)
+            try:
+                sock.settimeout(timeout)
+                if local_address is not None:
+                    sock.bind((local_address, 0))
+                for option in socket_options or []:
+                    sock.setsockopt(*option)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                sock.connect(sockaddr)
+                return ResumingStream(sock, self.proxy_key)
+            except socket.timeout as e:
+                sock.close()
+                error = httpcore.ConnectTimeout(e)
+            except OSError as e:
+                sock.close()
+                error = httpcore.ConnectError(e)
+        # cached addresses might be stale
+        DNS_CACHE.invalidate(host, port)
+        if error is None:
+            error = httpcore.ConnectError(f"Could not resolve {host}")
+        raise error
+
+
+# httpcore exceptions and the httpx exceptions they are raised as,
+# subclasses first
+HTTPCORE_EXCEPTIONS: list[tuple[type[Exception], type[httpx.HTTPError]]] = [
+    (httpcore.ConnectTimeout, httpx.ConnectTimeout),
+    (httpcore.ReadTimeout, httpx.ReadTimeout),
+    (httpcore.WriteTimeout, httpx.WriteTimeout),
+    (httpcore.PoolTimeout, httpx.PoolTimeout),
+    (httpcore.TimeoutException, httpx.TimeoutException),
+    (httpcore.ConnectError, httpx.ConnectError),
+    (httpcore.ReadError, httpx.ReadError),
+    (httpcore.WriteError, httpx.WriteError),
+    (httpcore.NetworkError, httpx.NetworkError),
+    (httpcore.ProxyError, httpx.ProxyError),
+    (httpcore.UnsupportedProtocol, httpx.UnsupportedProtocol),
+    (httpcore.LocalProtocolError, httpx.LocalProtocolError),
+    (httpcore.RemoteProtocolError, httpx.RemoteProtocolError),
+    (httpcore.ProtocolError, httpx.ProtocolError),
+]
+
+
+def get_httpx_error(e: Exception) -> Exception:
+    for httpcore_type, httpx_type in HTTPCORE_EXCEPTIONS:
+        if isinstance(e, httpcore_type):
+            return httpx_type(str(e))
+    return e
+
+
+class PoolResponseStream(httpx.SyncByteStream):
+    def __init__(self, stream: typing.Iterable[bytes]):
+        self.stream = stream
+
+    def __iter__(self) -> typing.Iterator[bytes]:
+        try:
+            for chunk in self.stream:
+                yield chunk
+        except Exception as e:
+            error = get_httpx_error(e)
+            if error is e:
+                raise
+            raise error from e
+
+    def close(self):
+        close = getattr(self.stream, "close", None)
+        if close is not None:
+            close()
+
+
+class PoolTransport(httpx.BaseTransport):
+    # transport over a httpcore connection pool, like httpx.HTTPTransport
+    # but the pool is built here, so that it uses a CachingBackend
+    def __init__(
+        self,
+        proxy: Optional[ProxyT] = None,
+        http2: bool = False,
+        limits: httpx.Limits = httpx.Limits(),
+        ssl_context: ssl.SSLContext = SSL_CONTEXT,
+    ):
+        if proxy is not None and not isinstance(proxy, httpx.Proxy):
+            proxy = httpx.Proxy(proxy)
+        options: dict[str, Any] = {
+            "ssl_context": ssl_context,
+            "max_connections": limits.max_connections,
+            "max_keepalive_connections": limits.max_keepalive_connections,
+            "keepalive_expiry": limits.keepalive_expiry,
+            "http2": http2,
+            "network_backend": CachingBackend(get_proxy_key(proxy)),
+        }
+        self.pool: httpcore.ConnectionPool
+        if proxy is None:
+            self.pool = httpcore.ConnectionPool(**options)
+            return
+        proxy_url = httpcore.URL(
+            scheme=proxy.url.raw_scheme,
+            host=proxy.url.raw_host,
+            port=proxy.url.port,
+            target=proxy.url.raw_path,
+        )
+        if proxy.url.scheme in ("http", "https"):
+            self.pool = httpcore.HTTPProxy(
+                proxy_url=proxy_url,
+                proxy_auth=proxy.raw_auth,
+                proxy_headers=proxy.headers.raw,
+                proxy_ssl_context=proxy.ssl_context,
+                **options,
+            )
+        elif proxy.url.scheme in ("socks5", "socks5h"):
+            self.pool = httpcore.SOCKSProxy(
+                proxy_url=proxy_url, proxy_auth=proxy.raw_auth, **options
+            )
+        else:
+            raise ValueError(f"Unsupported proxy scheme {proxy.url.scheme}.")
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        assert isinstance(request.stream, httpx.SyncByteStream)
+        req = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(
+                scheme=request.url.raw_scheme,
+                host=request.url.raw_host,
+                port=request.url.port,
+                target=request.url.raw_path,
+            ),
+            headers=request.headers.raw,
+            content=request.stream,
+            extensions=request.extensions,
+        )
+        try:
+            res = self.pool.handle_request(req)
+        except Exception as e:
+            error = get_httpx_error(e)
+            if error is e:
+                raise
+            raise error from e
+        assert isinstance(res.stream, typing.Iterable)
+        # httpcore annotates extensions as a mapping or a bare dict
+        extensions = getattr(res, "extensions")
+        return httpx.Response(
+            status_code=res.status,
+            headers=res.headers,
+            stream=PoolResponseStream(res.stream),
+            extensions=extensions,
+        )
+
+    def close(self):
+        self.pool.close()
+
+
+def create_transport(
+    proxy: Optional[ProxyT] = None,
+    http2: bool = False,
+    limits: httpx.Limits = httpx.Limits(),
+    ssl_context: ssl.SSLContext = SSL_CONTEXT,
+) -> httpx.BaseTransport:
+    transport = PoolTransport(proxy, http2, limits, ssl_context)
+    # requests wait for a token of their host before a request slot,
+    # retries wait for both again
+    return RetryTransport(
+        RateLimitedTransport(ConcurrencyLimitedTransport(transport))
+    )
+
+
+class FirstByteLatency:
+    # time to first response byte per host, split by whether the
+    # request had to open a new connection (cold) or reused one (warm)
+    def __init__(self):
+        self._stats: dict[str, dict[str, list[float]]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, host: str, cold: bool, latency: float):
+        kind = "cold" if cold else "warm"
+        with self._lock:
+            stats = self._stats.setdefault(
+                host, {"cold": [0, 0.0], "warm": [0, 0.0]}
+            )
+            stats[kind][0] += 1
+            stats[kind][1] += latency
+
+    def stats(self):
+        # {host: {"cold": {"count": 1, "avg": 0.25}, "warm": {...}}}
+        with self._lock:
+            return {
+                host: {
+                    kind: {
+                        "count": int(count),
+                        "avg": total / count if count else None,
+                    }
+                    for kind, (count, total) in stats.items()
+                }
+                for host, stats in self._stats.items()
+            }
+
+    def clear(self):
+        with self._lock:
+            self._stats.clear()
+
+    def create_trace(
+        self, request: httpx.Request
+    ) -> Callable[[str, dict[str, Any]], None]:
+        start = time.perf_counter()
+        state = {"cold": False}
+
+        def trace(name: str, info: dict[str, Any]):
+            if name.endswith("connect_tcp.started"):
+                state["cold"] = True
+            elif name.endswith("receive_response_headers.complete"):
+                self.record(
+                    request.url.host,
+                    state["cold"],
+                    time.perf_counter() - start,
+                )
+
+        return trace
+
+
+FIRST_BYTE_LATENCY = FirstByteLatency()
+
+
+def trace_first_byte(request: httpx.Request):
+    # request event hook
+    if "trace" not in request.extensions:
+        request.extensions["trace"] = FIRST_BYTE_LATENCY.create_trace(request)
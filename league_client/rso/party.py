@@ -1,11 +1,30 @@
+import threading
+import time
 from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Mapping
 from typing import Optional
 
 import httpx
 
-from league_client.constants import HEADERS
+from league_client.rso.client import RSOClient
+from league_client.rso.client import request
+from league_client.rso.tokens import REJECTED_STATUS_CODES
+from league_client.rso.tokens import TOKEN_CACHE
+from league_client.rso.tokens import get_token_expiry
 from league_client.types import ProxyT
 
+# restriction responses of a party the player is no longer in
+STALE_PARTY_STATUS_CODES = {403, 404, 410}
+
+
+def invalidate_rejected_tokens(res: httpx.Response, tokens: Iterable[str]):
+    # any cached token of a rejected registration may be the stale one
+    if res.status_code in REJECTED_STATUS_CODES:
+        for token in tokens:
+            TOKEN_CACHE.invalidate_token(token)
+
 
 def get_party_data(
     ledge_token: str,
@@ -21,13 +40,14 @@ def get_party_data(
     inventory_token: str,  # champion, champion_skin, skin_border, skin_augment
     inventory_token_v2: str,  # queue_entry
     proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
 ):
-    h = HEADERS.copy()
-    h["Authorization"] = f"Bearer {ledge_token}"
-    res = httpx.put(
+    res = request(
+        "PUT",
         f"{ledge_url}/parties-ledge/v1/players/{puuid}",
-        headers=h,
-        proxy=proxy,
+        ledge_token,
+        proxy,
+        client,
         json={
             "accountId": account_id,
             "createdAt": 0,
@@ -61,6 +81,15 @@ def get_party_data(
             "version": 0,
         },
     )
+    invalidate_rejected_tokens(
+        res,
+        [
+            entitlement_token,
+            summoner_token,
+            inventory_token,
+            inventory_token_v2,
+        ],
+    )
     res.raise_for_status()
     return res.json()
 
@@ -76,13 +105,132 @@ def get_party_restrictions(
     ledge_url: str,
     party_id: str,
     proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
 ):
-    h = HEADERS.copy()
-    h["Authorization"] = f"Bearer {ledge_token}"
-    res = httpx.get(
+    res = request(
+        "GET",
         f"{ledge_url}/parties-ledge/v1/parties/{party_id}/restrictions",
-        headers=h,
-        proxy=proxy,
+        ledge_token,
+        proxy,
+        client,
     )
     res.raise_for_status()
     return res.json()
+
+
+class PartyCache:
+    # party data of the last registration per puuid, kept until the
+    # first registration token expires and at most max_age seconds
+    def __init__(self, margin: float = 60, max_age: float = 30 * 60):
+        self.margin = margin
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self.registrations = 0
+        self.stale = 0
+        self._parties: dict[str, tuple[dict[str, Any], float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, puuid: str) -> Optional[dict[str, Any]]:
+        with self._lock:
+            cached = self._parties.get(puuid)
+            if cached is None or cached[1] - self.margin <= time.time():
+                self.misses += 1
+                return None
+            self.hits += 1
+            return cached[0]
+
+    def set(
+        self, puuid: str, party_data: dict[str, Any], tokens: Iterable[str]
+    ):
+        expiries = [e for e in map(get_token_expiry, tokens) if e is not None]
+        expiry = min([time.time() + self.max_age, *expiries])
+        with self._lock:
+            self.registrations += 1
+            self._parties[puuid] = party_data, expiry
+
+    def invalidate(self, puuid: str, stale: bool = False):
+        with self._lock:
+            self.stale += stale
+            self._parties.pop(puuid, None)
+
+    def clear(self):
+        with self._lock:
+            self._parties.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "parties": len(self._parties),
+                "hits": self.hits,
+                "misses": self.misses,
+                "registrations": self.registrations,
+                "stale": self.stale,
+            }
+
+
+PARTY_CACHE = PartyCache()
+
+
+def is_stale_party(e: httpx.HTTPStatusError) -> bool:
+    return e.response.status_code in STALE_PARTY_STATUS_CODES
+
+
+def get_registered_party_restrictions(
+    ledge_token: str,
+    ledge_url: str,
+    puuid: str,
+    account_id: int,
+    region: str,
+    id_token: str,
+    entitlement_token: str,
+    userinfo_token: str,
+    get_tokens: Callable[[], Mapping[str, str]],
+    proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
+    cache: Optional[PartyCache] = PARTY_CACHE,
+):
+    """
+    Get party restrictions, the player is registered with get_party_data
+    only if there is no cached registration. A cached party that is
+    rejected with one of STALE_PARTY_STATUS_CODES is registered again.
+
+    get_tokens returns the summoner_token, ranked_overview_token,
+    inventory_token and inventory_token_v2 arguments of get_party_data,
+    it is only called to register, so a cached registration needs none
+    of their requests.
+    """
+
+    def register():
+        tokens = get_tokens()
+        party_data = get_party_data(
+            ledge_token,
+            ledge_url,
+            puuid,
+            account_id,
+            region,
+            id_token=id_token,
+            entitlement_token=entitlement_token,
+            userinfo_token=userinfo_token,
+            proxy=proxy,
+            client=client,
+            **tokens,
+        )
+        if cache is not None:
+            used = [id_token, entitlement_token, userinfo_token]
+            cache.set(puuid, party_data, [*used, *tokens.values()])
+        return party_data
+
+    cached = None if cache is None else cache.get(puuid)
+    if cache is not None and cached is not None:
+        try:
+            return get_party_restrictions(
+                ledge_token, ledge_url, get_party_id(cached), proxy, client
+            )
+        except httpx.HTTPStatusError as e:
+            if not is_stale_party(e):
+                raise
+        cache.invalidate(puuid, stale=True)
+    return get_party_restrictions(
+        ledge_token, ledge_url, get_party_id(register()), proxy, client
+    )
@@ -7,8 +7,8 @@ import httpx
 from league_client.constants import ACCOUNTODACTYL_PARAMS
 from league_client.constants import HEADERS
 from league_client.constants import PROD_XSS0_RIOTGAMES
-from league_client.constants import SSL_CONTEXT
 from league_client.rso.auth import authorize
+from league_client.rso.network import create_transport
 from league_client.types import ProxyT
 
 
@@ -27,7 +27,7 @@ def change_password_using_credentials(
     captcha_solver: Callable[[str, str], str],
     proxy: Optional[ProxyT] = None,
 ) -> bool:
-    with httpx.Client(verify=SSL_CONTEXT, proxy=proxy) as client:
+    with httpx.Client(transport=create_transport(proxy)) as client:
         authorize(
             client, username, password, captcha_solver, PROD_XSS0_RIOTGAMES
         )
@@ -0,0 +1,294 @@
+import email.utils
+import math
+import threading
+import time
+from typing import Optional
+
+import httpx
+
+from league_client.exceptions import RateLimitedError
+from league_client.scheduler import get_remaining
+
+AUTH_HOST = "auth.riotgames.com"
+
+# (requests per second, burst) by host, other hosts use the default
+# rate of the limiter
+DEFAULT_RATES = {AUTH_HOST: (5.0, 10.0)}
+
+# status codes whose Retry-After blocks the host
+RETRY_AFTER_STATUS_CODES = {429, 503}
+
+
+def parse_retry_after(value: str) -> Optional[float]:
+    # Retry-After is either seconds or an http date
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(date.timestamp() - time.time(), 0.0)
+
+
+def parse_rate_limits(value: str) -> list[tuple[int, float]]:
+    # riot style rate limits, e.g. "20:1,100:120" is 20 requests per
+    # second and 100 requests per 2 minutes
+    limits: list[tuple[int, float]] = []
+    for pair in value.split(","):
+        try:
+            limit, window = pair.split(":")
+            limits.append((int(limit), float(window)))
+        except ValueError:
+            continue
+    return [(limit, window) for limit, window in limits if window > 0]
+
+
+class TokenBucket:
+    # rate tokens per second up to burst, tokens go negative while
+    # requests are queued, so that waiters are served in order
+    #
+    # no tokens are added while the host is blocked by a Retry-After,
+    # the requests queued at the block are spaced out at rate after it
+    #
+    # rate limit headers lower rate and burst, they go back up to the
+    # configured ones when the headers do
+    def __init__(self, rate: float, burst: float):
+        self.configured_rate = self.rate = rate
+        self.configured_burst = self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        # reservations are numbered in order, the ones from
+        # respaced_from to respaced_to were queued at the last block
+        self.tickets = 0
+        self.respaced_from = 0
+        self.respaced_to = 0
+        self.requests = 0
+        self.waits = 0
+        self.wait_time = 0.0
+        self.limited = 0
+
+    def refill(self, now: float):
+        if now > self.updated:
+            self.tokens = min(
+                self.burst, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+
+    def reserve(self, now: float) -> tuple[int, float]:
+        # takes a token, returns its ticket and the seconds to wait for it
+        self.refill(now)
+        self.tokens -= 1
+        self.requests += 1
+        ticket = self.tickets
+        self.tickets += 1
+        blocked = max(self.blocked_until - now, 0.0)
+        return ticket, blocked + max(-self.tokens, 0.0) / self.rate
+
+    def cancel(self):
+        self.tokens += 1
+        self.requests -= 1
+        self.tickets -= 1
+
+    def get_wait(self, now: float, ticket: int) -> float:
+        # seconds a reservation still has to wait after its first wait,
+        # only reservations that were queued at a block wait again
+        if not self.respaced_from <= ticket < self.respaced_to:
+            return 0.0
+        at = self.blocked_until + (ticket - self.respaced_from) / self.rate
+        return max(at - now, 0.0)
+
+    def block(self, now: float, seconds: float):
+        self.limited += 1
+        until = now + seconds
+        if until <= self.blocked_until:
+            return
+        self.refill(now)
+        queued = math.ceil(max(-self.tokens, 0.0))
+        self.blocked_until = until
+        self.respaced_to = self.tickets
+        self.respaced_from = self.tickets - queued
+        # the first queued request goes at until, new requests after
+        # the queued ones
+        self.updated = max(self.updated, until)
+        self.tokens = 1.0 - queued if queued else min(self.tokens, 1.0)
+
+    def set_limits(self, limits: list[tuple[int, float]]):
+        # the tightest of the configured rate and the limits
+        rate = self.configured_rate
+        burst = self.configured_burst
+        for limit, window in limits:
+            if limit / window < rate:
+                rate = max(limit / window, 0.001)
+                burst = max(min(burst, limit), 1)
+        self.rate = rate
+        self.burst = burst
+
+    def stats(self, now: float):
+        self.refill(now)
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "tokens": max(self.tokens, 0.0),
+            "fill": max(self.tokens, 0.0) / self.burst,
+            "queued": int(max(-self.tokens, 0.0)),
+            "blocked_for": max(self.blocked_until - now, 0.0),
+            "requests": self.requests,
+            "waits": self.waits,
+            "wait_time": self.wait_time,
+            "avg_wait": self.wait_time / self.waits if self.waits else 0.0,
+            "limited": self.limited,
+        }
+
+
+class RateLimiter:
+    # token bucket per host, requests wait for a token instead of
+    # failing, Retry-After and rate limit headers of the responses
+    # feed back into the bucket of their host
+    #
+    # buckets are shared by all proxies, requests that would wait longer
+    # than max_wait or the time left for the running scheduler step
+    # raise RateLimitedError, off by default
+    def __init__(
+        self,
+        enabled: bool = False,
+        rate: float = 20,
+        burst: float = 40,
+        rates: Optional[dict[str, tuple[float, float]]] = None,
+        max_wait: float = 60,
+    ):
+        self.enabled = enabled
+        self.rate = rate
+        self.burst = burst
+        self.rates = dict(DEFAULT_RATES if rates is None else rates)
+        self.max_wait = max_wait
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def set_rate(self, host: str, rate: float, burst: float):
+        with self._lock:
+            self.rates[host] = (rate, burst)
+            self._buckets.pop(host, None)
+
+    def _get_bucket(self, host: str) -> TokenBucket:
+        # must be called with self._lock held
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            rate, burst = self.rates.get(host, (self.rate, self.burst))
+            bucket = self._buckets[host] = TokenBucket(rate, burst)
+        return bucket
+
+    def reserve(self, host: str) -> tuple[TokenBucket, int, float]:
+        remaining = get_remaining()
+        with self._lock:
+            bucket = self._get_bucket(host)
+            ticket, wait = bucket.reserve(time.monotonic())
+            if wait > self.max_wait or (
+                remaining is not None and wait > remaining
+            ):
+                bucket.cancel()
+                raise RateLimitedError(
+                    f"{host} is rate limited for {wait:.1f} seconds."
+                )
+        return bucket, ticket, wait
+
+    def get_wait(self, bucket: TokenBucket, ticket: int) -> float:
+        # seconds a reservation still has to wait, e.g. after a
+        # Retry-After that arrived while waiting
+        with self._lock:
+            return bucket.get_wait(time.monotonic(), ticket)
+
+    def record(self, bucket: TokenBucket, wait: float):
+        if wait <= 0:
+            return
+        with self._lock:
+            bucket.waits += 1
+            bucket.wait_time += wait
+
+    def acquire(self, host: str):
+        bucket, ticket, wait = self.reserve(host)
+        if wait <= 0:
+            return
+        start = time.monotonic()
+        while wait > 0:
+            time.sleep(wait)
+            wait = self.get_wait(bucket, ticket)
+        self.record(bucket, time.monotonic() - start)
+
+    def update(self, host: str, response: httpx.Response):
+        headers = response.headers
+        retry_after = None
+        if response.status_code in RETRY_AFTER_STATUS_CODES:
+            value = headers.get("Retry-After")
+            retry_after = None if value is None else parse_retry_after(value)
+            if retry_after is None and response.status_code == 429:
+                retry_after = 1.0
+        remaining = headers.get("RateLimit-Remaining") or headers.get(
+            "X-RateLimit-Remaining"
+        )
+        reset = headers.get("RateLimit-Reset") or headers.get(
+            "X-RateLimit-Reset"
+        )
+        if remaining == "0" and reset is not None and retry_after is None:
+            try:
+                retry_after = float(reset)
+            except ValueError:
+                pass
+            else:
+                # some hosts send an epoch timestamp
+                if retry_after > 1e9:
+                    retry_after -= time.time()
+        limits = [
+            limit
+            for name in ("X-App-Rate-Limit", "X-Method-Rate-Limit")
+            for limit in parse_rate_limits(headers.get(name, ""))
+        ]
+        if retry_after is None and not limits:
+            return
+        with self._lock:
+            bucket = self._get_bucket(host)
+            if limits:
+                bucket.set_limits(limits)
+            if retry_after is not None:
+                bucket.block(time.monotonic(), retry_after)
+
+    def stats(self):
+        # {host: {"rate": 20, "tokens": 12.5, "fill": 0.31, ...}}
+        with self._lock:
+            now = time.monotonic()
+            return {
+                host: bucket.stats(now)
+                for host, bucket in self._buckets.items()
+            }
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+# used by all rso transports, enable with RATE_LIMITER.enabled = True
+RATE_LIMITER = RateLimiter()
+
+
+class RateLimitedTransport(httpx.BaseTransport):
+    def __init__(
+        self,
+        transport: httpx.BaseTransport,
+        limiter: RateLimiter = RATE_LIMITER,
+    ):
+        self.transport = transport
+        self.limiter = limiter
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if not self.limiter.enabled:
+            return self.transport.handle_request(request)
+        host = request.url.host
+        self.limiter.acquire(host)
+        response = self.transport.handle_request(request)
+        self.limiter.update(host, response)
+        return response
+
+    def close(self):
+        self.transport.close()
@@ -0,0 +1,194 @@
+import heapq
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+from typing import Optional
+
+from league_client.constants import LEAGUE_CLIENT_AUTH_PARAMS
+from league_client.exceptions import InvalidSessionError
+from league_client.rso.auth import login_using_ssid
+from league_client.rso.models import RSOSession
+from league_client.rso.store import SessionStore
+from league_client.rso.store import get_session_expiry
+
+
+class SessionRefresher:
+    # renews sessions with login_using_ssid before their access token
+    # expires, so that callers always get a warm session
+    #
+    # sessions are refreshed refresh_before seconds before expiry minus
+    # a random jitter, so that sessions created together do not renew
+    # together, at most max_workers sessions are renewed at a time
+    def __init__(
+        self,
+        refresh_before: float = 300,
+        jitter: float = 120,
+        max_workers: int = 8,
+        retry_delay: float = 30,
+        store: Optional[SessionStore] = None,
+        auth_params: dict[str, str] = LEAGUE_CLIENT_AUTH_PARAMS,
+        on_invalid: Optional[Callable[[RSOSession], None]] = None,
+    ):
+        self.refresh_before = refresh_before
+        self.jitter = jitter
+        self.retry_delay = retry_delay
+        self.store = store
+        self.auth_params = auth_params
+        self.on_invalid = on_invalid
+        self.refreshes = 0
+        self.failures = 0
+        self.invalid = 0
+        self.sessions: dict[str, RSOSession] = {}
+        # (refresh at, puuid), entries that do not match
+        # self._refresh_at are outdated and skipped
+        self._heap: list[tuple[float, str]] = []
+        self._refresh_at: dict[str, float] = {}
+        self._refreshing: set[str] = set()
+        self._executor = ThreadPoolExecutor(
+            max_workers, thread_name_prefix="session_refresher"
+        )
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args: object):
+        self.stop()
+
+    def schedule(self, puuid: str, refresh_at: float):
+        # must be called with self._cond held, sessions without an
+        # expiry are kept but never refreshed
+        if not math.isfinite(refresh_at):
+            self._refresh_at.pop(puuid, None)
+            return
+        self._refresh_at[puuid] = refresh_at
+        heapq.heappush(self._heap, (refresh_at, puuid))
+        self._cond.notify_all()
+
+    def get_refresh_at(self, session: RSOSession) -> float:
+        expiry = get_session_expiry(session)
+        return expiry - self.refresh_before - random.uniform(0, self.jitter)
+
+    def add(self, session: RSOSession):
+        if not session.puuid or not session.ssid:
+            raise ValueError("Session has no puuid or ssid.")
+        refresh_at = self.get_refresh_at(session)
+        if not math.isfinite(refresh_at):
+            raise ValueError("Session has no access token expiry.")
+        with self._cond:
+            self.sessions[session.puuid] = session
+            self.schedule(session.puuid, refresh_at)
+
+    def add_many(self, sessions: list[RSOSession]):
+        for session in sessions:
+            self.add(session)
+
+    def remove(self, puuid: str):
+        with self._cond:
+            self.sessions.pop(puuid, None)
+            self._refresh_at.pop(puuid, None)
+
+    def get(self, puuid: str) -> Optional[RSOSession]:
+        # returns the session, renewed inline if the background refresh
+        # did not make it in time, None if it is unknown or invalid
+        with self._cond:
+            while puuid in self._refreshing:
+                self._cond.wait()
+            session = self.sessions.get(puuid)
+        if session is None or get_session_expiry(session) > time.time():
+            return session
+        self.refresh(session)
+        with self._cond:
+            return self.sessions.get(puuid)
+
+    def refresh(self, session: RSOSession):
+        puuid = session.puuid
+        with self._cond:
+            if puuid in self._refreshing:
+                return
+            self._refreshing.add(puuid)
+        try:
+            login = login_using_ssid(
+                session.ssid, session.clid, self.auth_params, session.proxy
+            )
+        except InvalidSessionError:
+            with self._cond:
+                self.invalid += 1
+                self.failures += 1
+                self._refreshing.discard(puuid)
+                self.sessions.pop(puuid, None)
+                self._refresh_at.pop(puuid, None)
+                self._cond.notify_all()
+            if self.on_invalid is not None:
+                self.on_invalid(session)
+            return
+        except Exception:
+            # network errors, rate limits, try again later
+            with self._cond:
+                self.failures += 1
+                self._refreshing.discard(puuid)
+                if puuid in self.sessions:
+                    self.schedule(
+                        puuid,
+                        time.time()
+                        + self.retry_delay * random.uniform(0.5, 1.5),
+                    )
+                self._cond.notify_all()
+            return
+        session.update_login(login)
+        if self.store is not None:
+            self.store.save(session)
+        with self._cond:
+            self.refreshes += 1
+            self._refreshing.discard(puuid)
+            if puuid in self.sessions:
+                self.schedule(puuid, self.get_refresh_at(session))
+            self._cond.notify_all()
+
+    def run(self):
+        with self._cond:
+            while not self._stopped:
+                now = time.time()
+                while self._heap and self._heap[0][0] <= now:
+                    refresh_at, puuid = heapq.heappop(self._heap)
+                    if self._refresh_at.get(puuid) != refresh_at:
+                        continue
+                    del self._refresh_at[puuid]
+                    self._executor.submit(self.refresh, self.sessions[puuid])
+                # capped, so that the wait never overflows and clock
+                # changes are noticed
+                timeout = (
+                    min(self._heap[0][0] - now, 60) if self._heap else None
+                )
+                self._cond.wait(timeout)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self.run, name="session_refresher", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, wait: bool = True):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "sessions": len(self.sessions),
+                "refreshing": len(self._refreshing),
+                "refreshes": self.refreshes,
+                "failures": self.failures,
+                "invalid": self.invalid,
+            }
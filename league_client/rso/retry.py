@@ -0,0 +1,180 @@
+import random
+import threading
+import time
+from typing import Optional
+
+import httpx
+
+from league_client.rso.ratelimit import parse_retry_after
+from league_client.rso.utils import get_deadline_timeout
+from league_client.scheduler import get_remaining
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+RETRY_STATUS_CODES = {502, 503, 504}
+# transient errors, the request did not reach the host, the host did
+# not answer in time or closed a keep-alive connection before answering
+RETRY_EXCEPTIONS = (
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.ReadTimeout,
+    httpx.RemoteProtocolError,
+)
+
+
+class RetryBudget:
+    # retries may add at most ratio of the requests as extra load, plus
+    # min_rate retries per second, so that a process sending few
+    # requests can still retry, unused budget is capped at max_balance
+    def __init__(
+        self, ratio: float = 0.1, min_rate: float = 1, max_balance: float = 10
+    ):
+        self.ratio = ratio
+        self.min_rate = min_rate
+        self.max_balance = max_balance
+        self.balance = max_balance
+        self.requests = 0
+        self.retries = 0
+        self.denied = 0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _add(self, amount: float):
+        # must be called with self._lock held
+        now = time.monotonic()
+        amount += (now - self._updated) * self.min_rate
+        self.balance = min(self.balance + amount, self.max_balance)
+        self._updated = now
+
+    def deposit(self):
+        with self._lock:
+            self.requests += 1
+            self._add(self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            self._add(0)
+            if self.balance < 1:
+                self.denied += 1
+                return False
+            self.balance -= 1
+            self.retries += 1
+            return True
+
+    def stats(self):
+        with self._lock:
+            self._add(0)
+            return {
+                "requests": self.requests,
+                "retries": self.retries,
+                "denied": self.denied,
+                "retry_ratio": (
+                    self.retries / self.requests if self.requests else 0.0
+                ),
+                "balance": self.balance,
+            }
+
+
+# shared by all rso transports, sync and async
+RETRY_BUDGET = RetryBudget()
+
+
+class RetryPolicy:
+    # retries idempotent requests on transient errors with exponential
+    # backoff and full jitter, while the budget allows it and the
+    # running scheduler step has time left, off by default
+    def __init__(
+        self,
+        enabled: bool = False,
+        attempts: int = 3,
+        initial: float = 0.1,
+        max_delay: float = 2,
+        methods: set[str] = IDEMPOTENT_METHODS,
+        status_codes: set[int] = RETRY_STATUS_CODES,
+        budget: RetryBudget = RETRY_BUDGET,
+    ):
+        self.enabled = enabled
+        self.attempts = attempts
+        self.initial = initial
+        self.max_delay = max_delay
+        self.methods = methods
+        self.status_codes = status_codes
+        self.budget = budget
+
+    def get_delay(self, attempt: int) -> float:
+        return random.uniform(
+            0, min(self.max_delay, self.initial * 2 ** (attempt - 1))
+        )
+
+    def get_retry_delay(
+        self,
+        request: httpx.Request,
+        attempt: int,
+        response: Optional[httpx.Response] = None,
+        error: Optional[Exception] = None,
+    ) -> Optional[float]:
+        # seconds to wait before the next attempt, None if the request
+        # must not be retried
+        if request.method not in self.methods or attempt >= self.attempts:
+            return None
+        delay = self.get_delay(attempt)
+        if response is not None:
+            if response.status_code not in self.status_codes:
+                return None
+            value = response.headers.get("Retry-After")
+            retry_after = None if value is None else parse_retry_after(value)
+            if retry_after is not None:
+                if retry_after > self.max_delay:
+                    return None
+                delay = max(delay, retry_after)
+        elif not isinstance(error, RETRY_EXCEPTIONS):
+            return None
+        remaining = get_remaining()
+        if remaining is not None and delay >= remaining:
+            return None
+        if not self.budget.withdraw():
+            return None
+        return delay
+
+
+# used by all rso transports, enable with RETRY_POLICY.enabled = True
+RETRY_POLICY = RetryPolicy()
+
+
+def cap_timeout(request: httpx.Request):
+    # a retry must not outlive the running scheduler step
+    timeout = httpx.Timeout(**request.extensions.get("timeout", {}))
+    request.extensions["timeout"] = get_deadline_timeout(timeout).as_dict()
+
+
+class RetryTransport(httpx.BaseTransport):
+    def __init__(
+        self,
+        transport: httpx.BaseTransport,
+        policy: RetryPolicy = RETRY_POLICY,
+    ):
+        self.transport = transport
+        self.policy = policy
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if not self.policy.enabled:
+            return self.transport.handle_request(request)
+        self.policy.budget.deposit()
+        attempt = 1
+        while True:
+            try:
+                response = self.transport.handle_request(request)
+            except Exception as e:
+                delay = self.policy.get_retry_delay(request, attempt, error=e)
+                if delay is None:
+                    raise
+            else:
+                delay = self.policy.get_retry_delay(request, attempt, response)
+                if delay is None:
+                    return response
+                response.close()
+            time.sleep(delay)
+            cap_timeout(request)
+            attempt += 1
+
+    def close(self):
+        self.transport.close()
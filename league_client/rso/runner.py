@@ -0,0 +1,474 @@
+import itertools
+import multiprocessing
+import os
+import pickle
+import queue
+import threading
+import zlib
+from collections import deque
+from multiprocessing.connection import Connection
+from multiprocessing.connection import wait
+from multiprocessing.context import SpawnContext
+from multiprocessing.context import SpawnProcess
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+
+from league_client.exceptions import LeagueClientError
+from league_client.exceptions import WorkerDiedError
+from league_client.rso.constants import LEAGUE_EDGE_URL
+from league_client.rso.executor import SessionExecutor
+from league_client.rso.executor import get_edge_host
+from league_client.rso.models import RSOSession
+
+# every known edge host, hosts are assigned to workers in this order
+EDGE_HOSTS = sorted({get_edge_host(r) for r in LEAGUE_EDGE_URL})
+
+ResultT = tuple[RSOSession, Any, Optional[BaseException]]
+
+
+def get_shards(host: str, processes: int) -> list[int]:
+    # workers of an edge host, a host gets several workers when there
+    # are more workers than hosts
+    if host not in EDGE_HOSTS:
+        return [zlib.crc32(host.encode()) % processes]
+    i = EDGE_HOSTS.index(host)
+    if processes <= len(EDGE_HOSTS):
+        return [i % processes]
+    return list(range(i, processes, len(EDGE_HOSTS)))
+
+
+def dump_result(
+    session: RSOSession, result: Any, error: Optional[BaseException]
+) -> bytes:
+    try:
+        return pickle.dumps((session, result, error))
+    except Exception:
+        # e.g. exceptions holding a client
+        if error is None:
+            error = LeagueClientError("Result can not be pickled.")
+        else:
+            error = LeagueClientError(repr(error))
+        return pickle.dumps((session, None, error))
+
+
+def read_inputs(conn: Connection, inputs: "queue.Queue[Any]"):
+    # reads the pipe in the background, so that the runner never blocks
+    # on a send while the worker is blocked sending results
+    while True:
+        try:
+            item = conn.recv()
+        except (EOFError, OSError):
+            item = None
+        if item is None:
+            # sessions that were not started are dropped
+            while not inputs.empty():
+                inputs.get_nowait()
+            inputs.put(None)
+            return
+        inputs.put(item)
+
+
+def run_worker(
+    func: Callable[..., Any],
+    kwargs: dict[str, Any],
+    conn: Connection,
+    max_workers: int,
+    max_per_host: int,
+):
+    inputs: queue.Queue[Optional[tuple[int, RSOSession]]] = queue.Queue()
+    threading.Thread(
+        target=read_inputs, args=(conn, inputs), daemon=True
+    ).start()
+    # job ids by id of the session object
+    jobs: dict[int, int] = {}
+    # sessions are read on the feeder thread of the executor, results
+    # are sent from this one
+    lock = threading.Lock()
+
+    def send(message: tuple[str, int, bytes]):
+        with lock:
+            conn.send(message)
+
+    def read():
+        # blocks until a session arrives, ends on stop
+        while True:
+            item = inputs.get()
+            if item is None:
+                return
+            job_id, session = item
+            jobs[id(session)] = job_id
+            send(("taken", job_id, b""))
+            yield session
+
+    with SessionExecutor(max_workers, max_per_host) as executor:
+        for session, future in executor.as_completed(func, read(), **kwargs):
+            error = future.exception()
+            result = None if error is not None else future.result()
+            send(
+                (
+                    "done",
+                    jobs.pop(id(session)),
+                    dump_result(session, result, error),
+                )
+            )
+
+
+class Worker:
+    def __init__(self, process: SpawnProcess, conn: Connection):
+        self.process = process
+        self.conn = conn
+        # job id: session, sent to the worker and not done yet
+        self.sent: dict[int, RSOSession] = {}
+        # sent jobs the worker has started
+        self.taken: set[int] = set()
+        # jobs held back until the worker has room
+        self.waiting: deque[tuple[int, RSOSession]] = deque()
+
+    def send_stop(self):
+        # the worker finishes the sessions it started and exits
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+
+
+class ShardedRunner:
+    # runs func(session, **kwargs) in worker processes, sessions are
+    # partitioned by league edge host, so that each worker only keeps
+    # connections to a few edges
+    #
+    # every worker runs a SessionExecutor and is sent at most queue_size
+    # sessions ahead, dead workers are replaced, the sessions they were
+    # running are reported with WorkerDiedError and the rest are sent
+    # to the new worker
+    #
+    # func, kwargs, results and errors have to be picklable
+    def __init__(
+        self,
+        func: Callable[..., Any],
+        processes: Optional[int] = None,
+        max_workers: int = 32,
+        max_per_host: int = 8,
+        queue_size: int = 64,
+        max_waiting: Optional[int] = None,
+        check_interval: float = 1,
+        context: Optional[SpawnContext] = None,
+        **kwargs: Any,
+    ):
+        self.func = func
+        self.kwargs = kwargs
+        self.processes = processes or os.cpu_count() or 1
+        self.max_workers = max_workers
+        self.max_per_host = max_per_host
+        self.queue_size = queue_size
+        self.max_waiting = max_waiting or queue_size * self.processes
+        self.check_interval = check_interval
+        # spawn, forking a process with running threads is not safe
+        self.context = context or multiprocessing.get_context("spawn")
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.respawns = 0
+        self.lost = 0
+        self.dropped = 0
+        self._workers: list[Optional[Worker]] = []
+        # edge host: cycle of its shards
+        self._shards: dict[str, Iterator[int]] = {}
+        self._draining = threading.Event()
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args: object):
+        self.stop()
+
+    def spawn(self) -> Worker:
+        conn, child_conn = self.context.Pipe()
+        process = self.context.Process(
+            target=run_worker,
+            args=(
+                self.func,
+                self.kwargs,
+                child_conn,
+                self.max_workers,
+                self.max_per_host,
+            ),
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        return Worker(process, conn)
+
+    def start(self):
+        if self._workers:
+            return
+        self._draining.clear()
+        self._workers = [self.spawn() for _ in range(self.processes)]
+
+    def drain(self):
+        # run stops reading sessions and returns once the sessions the
+        # workers started are yielded, safe to call from a signal
+        # handler or another thread
+        self._draining.set()
+
+    def stop(self, timeout: float = 30):
+        # workers finish the sessions they started, results that were
+        # not read are lost
+        workers = [w for w in self._workers if w is not None]
+        for worker in workers:
+            worker.send_stop()
+        for worker in workers:
+            worker.process.join(timeout)
+            if worker.process.is_alive():
+                worker.process.terminate()
+                worker.process.join()
+            worker.conn.close()
+        self._workers = []
+
+    def send(self, worker: Worker, job_id: int, session: RSOSession) -> bool:
+        try:
+            worker.conn.send((job_id, session))
+        except OSError:
+            # the worker died, sent again to the new worker
+            worker.waiting.appendleft((job_id, session))
+            return False
+        worker.sent[job_id] = session
+        return True
+
+    def replace(self, shard: int) -> Iterator[ResultT]:
+        worker = self._workers[shard]
+        assert worker is not None
+        worker.conn.close()
+        worker.process.join()
+        untaken = [
+            (job_id, session)
+            for job_id, session in worker.sent.items()
+            if job_id not in worker.taken
+        ]
+        untaken += worker.waiting
+        if self._draining.is_set():
+            self._workers[shard] = None
+            with self._lock:
+                self.dropped += len(untaken)
+        else:
+            new = self.spawn()
+            new.waiting.extend(untaken)
+            self._workers[shard] = new
+            with self._lock:
+                self.respawns += 1
+        for job_id in worker.taken:
+            with self._lock:
+                self.completed += 1
+                self.failed += 1
+                self.lost += 1
+            yield (
+                worker.sent[job_id],
+                None,
+                WorkerDiedError(
+                    f"Worker {shard} died with exit code"
+                    f" {worker.process.exitcode}."
+                ),
+            )
+
+    def receive(self, shard: int) -> Iterator[ResultT]:
+        worker = self._workers[shard]
+        assert worker is not None
+        while True:
+            try:
+                if not worker.conn.poll():
+                    break
+                kind, job_id, payload = worker.conn.recv()
+            except (EOFError, OSError):
+                yield from self.replace(shard)
+                return
+            if kind == "taken":
+                worker.taken.add(job_id)
+                continue
+            del worker.sent[job_id]
+            worker.taken.discard(job_id)
+            session, result, error = pickle.loads(payload)
+            with self._lock:
+                self.completed += 1
+                self.failed += error is not None
+            yield session, result, error
+        if not worker.process.is_alive():
+            yield from self.replace(shard)
+
+    def flush(self):
+        # sends held back sessions to workers with room
+        for worker in self._workers:
+            if worker is None:
+                continue
+            while worker.waiting and len(worker.sent) < self.queue_size:
+                if not self.send(worker, *worker.waiting.popleft()):
+                    break
+
+    def feed(
+        self,
+        it: Iterator[RSOSession],
+        inputs: "queue.Queue[tuple[str, Any]]",
+        wake: Connection,
+        stopped: threading.Event,
+    ):
+        # reads the sessions in the background, so that a slow input
+        # does not hold back the results of the workers, every item is
+        # followed by a byte on wake
+        def put(item: tuple[str, Any]) -> bool:
+            while not stopped.is_set():
+                try:
+                    inputs.put(item, timeout=0.1)
+                except queue.Full:
+                    continue
+                try:
+                    wake.send_bytes(b"")
+                except OSError:
+                    return False
+                return True
+            return False
+
+        try:
+            for session in it:
+                if not put(("session", session)):
+                    return
+        except BaseException as e:
+            put(("error", e))
+        else:
+            put(("end", None))
+        finally:
+            wake.close()
+
+    def fill(
+        self,
+        inputs: "queue.Queue[tuple[str, Any]]",
+        wake: Connection,
+        jobs: Iterator[int],
+    ) -> bool:
+        # sends read sessions to workers with room, returns False once
+        # the input is exhausted
+        self.flush()
+        try:
+            while wake.poll():
+                wake.recv_bytes()
+        except EOFError:
+            # the feeder is done, its last item is queued
+            pass
+        live = [w for w in self._workers if w is not None]
+        n_waiting = sum(len(w.waiting) for w in live)
+        while n_waiting < self.max_waiting:
+            try:
+                kind, item = inputs.get_nowait()
+            except queue.Empty:
+                return True
+            if kind == "error":
+                raise item
+            if kind == "end":
+                return False
+            with self._lock:
+                self.submitted += 1
+            worker = self._workers[self.get_shard(item)]
+            assert worker is not None
+            if len(worker.sent) < self.queue_size:
+                self.send(worker, next(jobs), item)
+            else:
+                worker.waiting.append((next(jobs), item))
+                n_waiting += 1
+        return True
+
+    def has_room(self) -> bool:
+        return (
+            sum(len(w.waiting) for w in self._workers if w is not None)
+            < self.max_waiting
+        )
+
+    def get_shard(self, session: RSOSession) -> int:
+        host = get_edge_host(session.region)
+        if host not in self._shards:
+            self._shards[host] = itertools.cycle(
+                get_shards(host, self.processes)
+            )
+        return next(self._shards[host])
+
+    def run(self, sessions: Iterable[RSOSession]) -> Iterator[ResultT]:
+        """
+        Run func for each session and yield (session, result, error)
+        as the sessions complete. session is the copy of the worker,
+        e.g. with the new ssid after a login.
+
+        Sessions are read lazily on a separate thread, so results are
+        yielded while the input blocks. At most queue_size sessions are
+        sent to each worker ahead and at most max_waiting are held back
+        for busy workers or read ahead.
+
+        After drain, sessions that were not started are dropped and the
+        workers exit once the sessions they started are yielded.
+        """
+        self.start()
+        # read sessions, the feeder is at most max_waiting ahead
+        inputs: queue.Queue[tuple[str, Any]] = queue.Queue(self.max_waiting)
+        wake, wake_writer = multiprocessing.Pipe(duplex=False)
+        stopped = threading.Event()
+        threading.Thread(
+            target=self.feed,
+            args=(iter(sessions), inputs, wake_writer, stopped),
+            name="sharded_runner_feeder",
+            daemon=True,
+        ).start()
+        jobs = itertools.count()
+        exhausted = False
+        draining = False
+        done = False
+        try:
+            while True:
+                if self._draining.is_set() and not draining:
+                    draining = True
+                    stopped.set()
+                    for worker in self._workers:
+                        if worker is not None:
+                            worker.send_stop()
+                if not draining and exhausted:
+                    self.flush()
+                elif not draining:
+                    exhausted = not self.fill(inputs, wake, jobs)
+                live = [w for w in self._workers if w is not None]
+                if not live or (
+                    exhausted
+                    and not draining
+                    and not any(w.sent or w.waiting for w in live)
+                ):
+                    done = True
+                    return
+                waitables: list[Any] = [w.conn for w in live]
+                waitables += [w.process.sentinel for w in live]
+                if not draining and not exhausted and self.has_room():
+                    waitables.append(wake)
+                ready = wait(waitables, self.check_interval)
+                for shard, worker in enumerate(self._workers):
+                    if worker is not None and (
+                        worker.conn in ready
+                        or worker.process.sentinel in ready
+                    ):
+                        yield from self.receive(shard)
+        finally:
+            stopped.set()
+            # the feeder closes its end
+            wake.close()
+            if not done or draining:
+                # results of a closed run would be mixed into the next
+                self.stop()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "processes": self.processes,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "respawns": self.respawns,
+                "lost": self.lost,
+                "dropped": self.dropped,
+            }
@@ -0,0 +1,172 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterable
+from typing import Optional
+
+from league_client.rso.models import RSOSession
+from league_client.rso.tokens import get_token_expiry
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    puuid TEXT PRIMARY KEY,
+    username_hash TEXT,
+    region TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_username_hash
+    ON sessions (username_hash);
+CREATE INDEX IF NOT EXISTS sessions_region ON sessions (region);
+CREATE INDEX IF NOT EXISTS sessions_expires_at ON sessions (expires_at);
+"""
+
+UPSERT = """
+INSERT INTO sessions
+    (puuid, username_hash, region, expires_at, updated_at, data)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (puuid) DO UPDATE SET
+    username_hash = COALESCE(excluded.username_hash, username_hash),
+    region = excluded.region,
+    expires_at = excluded.expires_at,
+    updated_at = excluded.updated_at,
+    data = excluded.data
+"""
+
+
+def hash_username(username: str) -> str:
+    # usernames are not stored in plain text
+    return hashlib.sha256(username.lower().encode()).hexdigest()
+
+
+def get_session_expiry(session: RSOSession) -> float:
+    # exp claim of the access token, expires_in counts from the login
+    # and is only used if the access token is not a jwt
+    expiry = get_token_expiry(session.access_token)
+    if expiry is not None:
+        return expiry
+    if session.expires_in:
+        return time.time() + float(session.expires_in)
+    return float("inf")
+
+
+class SessionStore:
+    # persistent RSOSession store backed by sqlite in wal mode,
+    # safe to share between threads and processes
+    def __init__(self, path: str | Path):
+        self.path = path
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args: object):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def get_row(
+        self, session: RSOSession, username: Optional[str] = None
+    ) -> tuple[str, Optional[str], str, float, float, str]:
+        return (
+            session.puuid,
+            None if username is None else hash_username(username),
+            session.region,
+            get_session_expiry(session),
+            time.time(),
+            session.model_dump_json(),
+        )
+
+    def save(self, session: RSOSession, username: Optional[str] = None):
+        # replaces the stored session atomically, e.g. after the ssid
+        # and tokens were rotated, the username hash is kept if None
+        if not session.puuid:
+            raise ValueError("Session has no puuid.")
+        row = self.get_row(session, username)
+        with self._lock:
+            self._conn.execute(UPSERT, row)
+
+    def save_many(
+        self,
+        sessions: Iterable[RSOSession | tuple[RSOSession, Optional[str]]],
+    ):
+        # saves sessions or (session, username) pairs in one transaction
+        rows = [
+            (self.get_row(*s) if isinstance(s, tuple) else self.get_row(s))
+            for s in sessions
+        ]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(UPSERT, rows)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def query(self, where: str = "", *args: object) -> list[RSOSession]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT data FROM sessions {where}", args
+            ).fetchall()
+        return [RSOSession.model_validate_json(r[0]) for r in rows]
+
+    def get(self, puuid: str) -> Optional[RSOSession]:
+        sessions = self.query("WHERE puuid = ?", puuid)
+        return sessions[0] if sessions else None
+
+    def get_by_username(self, username: str) -> Optional[RSOSession]:
+        sessions = self.query(
+            "WHERE username_hash = ? ORDER BY updated_at DESC LIMIT 1",
+            hash_username(username),
+        )
+        return sessions[0] if sessions else None
+
+    def get_by_region(self, region: str) -> list[RSOSession]:
+        return self.query("WHERE region = ?", region)
+
+    def load(self, include_expired: bool = False) -> list[RSOSession]:
+        # bulk load, e.g. at startup
+        if include_expired:
+            return self.query()
+        return self.query("WHERE expires_at > ?", time.time())
+
+    def get_expiries(self) -> list[tuple[str, float]]:
+        # (puuid, expires_at) of all sessions, ordered by expiry
+        with self._lock:
+            return self._conn.execute(
+                "SELECT puuid, expires_at FROM sessions ORDER BY expires_at"
+            ).fetchall()
+
+    def delete(self, puuid: str):
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM sessions WHERE puuid = ?", (puuid,)
+            )
+
+    def evict_expired(self, grace: float = 0) -> int:
+        # deletes sessions expired for more than grace seconds,
+        # returns the number of deleted sessions
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM sessions WHERE expires_at <= ?",
+                (time.time() - grace,),
+            )
+            return cursor.rowcount
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM sessions"
+            ).fetchone()[0]
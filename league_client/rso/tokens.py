@@ -0,0 +1,161 @@
+import threading
+import time
+from concurrent.futures import Executor
+from typing import Callable
+from typing import Optional
+
+from league_client.rso.utils import decode_token
+from league_client.scheduler import EXECUTOR
+
+# responses that reject the token of a request
+REJECTED_STATUS_CODES = {401, 403}
+
+
+def get_token_expiry(token: str) -> Optional[float]:
+    # exp claim of a jwt, None if the token is not a jwt
+    try:
+        return float(decode_token(token)["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class CachedToken:
+    def __init__(self, token: str, expiry: float):
+        self.token = token
+        self.expiry = expiry
+        self.stored_at = time.time()
+        self.refreshing = False
+
+
+class TokenCache:
+    # tokens of the rso token chain keyed by puuid and token kind
+    #
+    # tokens are not returned within margin seconds of their exp claim,
+    # after refresh_after of their lifetime they are still returned but
+    # fetched again in the background
+    def __init__(
+        self,
+        margin: float = 60,
+        refresh_after: float = 0.75,
+        executor: Executor = EXECUTOR,
+    ):
+        self.margin = margin
+        self.refresh_after = refresh_after
+        self.executor = executor
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.rejected = 0
+        self._tokens: dict[tuple[str, str], CachedToken] = {}
+        # (puuid, kind) of each cached token
+        self._keys: dict[str, tuple[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, puuid: str, kind: str) -> tuple[Optional[str], bool]:
+        # returns the token and whether the caller should refresh it,
+        # only one caller is asked to refresh at a time
+        now = time.time()
+        with self._lock:
+            cached = self._tokens.get((puuid, kind))
+            if cached is None or cached.expiry - self.margin <= now:
+                self.misses += 1
+                return None, False
+            self.hits += 1
+            lifetime = cached.expiry - cached.stored_at
+            refresh = (
+                not cached.refreshing
+                and now >= cached.stored_at + lifetime * self.refresh_after
+            )
+            if refresh:
+                cached.refreshing = True
+            return cached.token, refresh
+
+    def get(self, puuid: str, kind: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            cached = self._tokens.get((puuid, kind))
+            if cached is None or cached.expiry - self.margin <= now:
+                return None
+            return cached.token
+
+    def set(self, puuid: str, kind: str, token: str):
+        expiry = get_token_expiry(token)
+        if expiry is None:
+            return
+        with self._lock:
+            old = self._tokens.get((puuid, kind))
+            if old is not None:
+                self._keys.pop(old.token, None)
+            self._tokens[(puuid, kind)] = CachedToken(token, expiry)
+            self._keys[token] = (puuid, kind)
+
+    def _invalidate(self, puuid: str, kind: Optional[str]):
+        # must be called with self._lock held
+        for key in list(self._tokens):
+            if key[0] == puuid and kind in (None, key[1]):
+                self._keys.pop(self._tokens.pop(key).token, None)
+
+    def invalidate(self, puuid: str, kind: Optional[str] = None):
+        # all kinds of puuid if kind is None
+        with self._lock:
+            self._invalidate(puuid, kind)
+
+    def invalidate_token(self, token: str):
+        # invalidates token wherever it is cached, e.g. once a request
+        # with it was rejected, see REJECTED_STATUS_CODES
+        with self._lock:
+            key = self._keys.get(token)
+            if key is not None:
+                self._invalidate(*key)
+                self.rejected += 1
+
+    def clear(self):
+        with self._lock:
+            self._tokens.clear()
+            self._keys.clear()
+
+    def refresh_done(self, puuid: str, kind: str, token: Optional[str]):
+        with self._lock:
+            if token is None:
+                self.refresh_failures += 1
+                cached = self._tokens.get((puuid, kind))
+                if cached is not None:
+                    cached.refreshing = False
+                return
+            self.refreshes += 1
+        self.set(puuid, kind, token)
+
+    def refresh(self, puuid: str, kind: str, fetch: Callable[[], str]):
+        try:
+            token = fetch()
+        except Exception:
+            # the cached token stays valid until it expires
+            token = None
+        self.refresh_done(puuid, kind, token)
+
+    def get_or_fetch(
+        self, puuid: str, kind: str, fetch: Callable[[], str]
+    ) -> str:
+        token, refresh = self.lookup(puuid, kind)
+        if token is None:
+            token = fetch()
+            self.set(puuid, kind, token)
+            return token
+        if refresh:
+            self.executor.submit(self.refresh, puuid, kind, fetch)
+        return token
+
+    def stats(self):
+        with self._lock:
+            return {
+                "tokens": len(self._tokens),
+                "hits": self.hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes,
+                "refresh_failures": self.refresh_failures,
+                "rejected": self.rejected,
+            }
+
+
+TOKEN_CACHE = TokenCache()
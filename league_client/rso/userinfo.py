@@ -1,21 +1,22 @@
 from typing import Any
 from typing import Optional
 
-import httpx
-
-from league_client.constants import HEADERS
+from league_client.rso.client import RSOClient
+from league_client.rso.client import request
 from league_client.types import ProxyT
 
 
 def get_userinfo(
-    access_token: str, proxy: Optional[ProxyT] = None
+    access_token: str,
+    proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
 ) -> str | dict[str, Any]:
-    h = HEADERS.copy()
-    h["Authorization"] = f"Bearer {access_token}"
-    res = httpx.post(
+    res = request(
+        "POST",
         "https://auth.riotgames.com/userinfo",
-        headers=h,
-        proxy=proxy,
+        access_token,
+        proxy,
+        client,
     )
     res.raise_for_status()
     # userinfo can be either jwt or json based on access token type
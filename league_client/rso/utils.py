@@ -2,8 +2,27 @@ import json
 from base64 import urlsafe_b64decode
 from typing import Any
 
+import httpx
+
+from league_client.scheduler import get_remaining
+
 
 def decode_token(token: str) -> dict[str, Any]:
     payload = token.split(".")[1]
     info = urlsafe_b64decode(f"{payload}===")
     return json.loads(info)
+
+
+def get_deadline_timeout(timeout: httpx.Timeout) -> httpx.Timeout:
+    # caps timeout to the time left for the running scheduler step
+    remaining = get_remaining()
+    if remaining is None:
+        return timeout
+    # a zero timeout would make the socket non-blocking
+    remaining = max(remaining, 0.001)
+    return httpx.Timeout(
+        connect=min(timeout.connect or remaining, remaining),
+        read=min(timeout.read or remaining, remaining),
+        write=min(timeout.write or remaining, remaining),
+        pool=min(timeout.pool or remaining, remaining),
+    )
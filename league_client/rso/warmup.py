@@ -0,0 +1,57 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import httpx
+
+from league_client.rso.client import CLIENT_POOL
+from league_client.rso.client import ClientPool
+from league_client.rso.constants import LEAGUE_EDGE_URL
+from league_client.rso.constants import PLAYER_PLATFORM_EDGE_URL
+from league_client.rso.network import DNS_CACHE
+from league_client.types import ProxyT
+
+AUTH_URLS = [
+    "https://auth.riotgames.com",
+    "https://entitlements.auth.riotgames.com",
+]
+
+
+def get_warm_up_urls(region: str) -> list[str]:
+    return [
+        *AUTH_URLS,
+        PLAYER_PLATFORM_EDGE_URL[region],
+        LEAGUE_EDGE_URL[region],
+    ]
+
+
+def warm_up_url(
+    url: str,
+    proxy: Optional[ProxyT] = None,
+    pool: ClientPool = CLIENT_POOL,
+) -> bool:
+    u = httpx.URL(url)
+    try:
+        if proxy is None:
+            DNS_CACHE.resolve(u.host, u.port or 443)
+        # any response means the connection is open and kept alive
+        pool.request("HEAD", url, proxy)
+        return True
+    except (OSError, httpx.HTTPError):
+        return False
+
+
+def warm_up(
+    region: str,
+    proxy: Optional[ProxyT] = None,
+    pool: ClientPool = CLIENT_POOL,
+) -> dict[str, bool]:
+    # pre-resolves and pre-connects auth and edge hosts of a region
+    # so that the first request does not pay for dns, tcp and tls
+    urls = get_warm_up_urls(region)
+
+    def warm_up_region_url(url: str) -> bool:
+        return warm_up_url(url, proxy, pool)
+
+    with ThreadPoolExecutor(len(urls)) as executor:
+        results = executor.map(warm_up_region_url, urls)
+        return dict(zip(urls, results))
@@ -0,0 +1,352 @@
+import contextvars
+import inspect
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Executor
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from contextvars import ContextVar
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Optional
+from typing import Sequence
+from typing import TypeVar
+
+from league_client.exceptions import DeadlineExceededError
+
+# shared by all graph runs unless another executor is passed, steps
+# only fan out to it with run_all, which can not deadlock
+EXECUTOR = ThreadPoolExecutor(64, thread_name_prefix="league_client")
+
+# deadline of the running step in time.monotonic seconds
+DEADLINE: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+def get_remaining() -> Optional[float]:
+    # time left for the running step, None without a deadline
+    deadline = DEADLINE.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+T = TypeVar("T")
+
+
+def run_all(
+    funcs: Sequence[Callable[[], T]], executor: Executor = EXECUTOR
+) -> list[T]:
+    # calls funcs concurrently on executor and returns their results in
+    # order, funcs that have not started once the caller is free are
+    # called by the caller, so a step may fan out to the executor it
+    # runs on even if all of its workers are busy
+    futures = [
+        executor.submit(contextvars.copy_context().run, func)
+        for func in funcs[1:]
+    ]
+    try:
+        results = [funcs[0]()] if funcs else []
+        for func, future in zip(funcs[1:], futures):
+            results.append(func() if future.cancel() else future.result())
+        return results
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+class Step:
+    # a named unit of work, called with the values of its inputs as
+    # positional arguments, inputs default to the parameter names of func
+    # inline steps are cheap and run on the scheduling thread
+    # gate steps are checks that fail the whole run, see StepGraph.run,
+    # they run whenever their inputs are computed, even if not a target
+    def __init__(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        inputs: Optional[Iterable[str]] = None,
+        inline: bool = False,
+        gate: bool = False,
+    ):
+        self.name = name
+        self.func = func
+        if inputs is None:
+            inputs = inspect.signature(func).parameters
+        self.inputs = tuple(inputs)
+        self.inline = inline
+        self.gate = gate
+
+    def __repr__(self):
+        return f"Step({self.name!r}, inputs={self.inputs!r})"
+
+
+class GraphRun:
+    def __init__(self, graph: "StepGraph", values: dict[str, Any]):
+        self.graph = graph
+        self.values = values
+        # step name: (start, end) in time.perf_counter seconds
+        self.timings: dict[str, tuple[float, float]] = {}
+        self.error: Optional[BaseException] = None
+        self.timed_out = False
+        # steps that raised in a partial run
+        self.failed: dict[str, BaseException] = {}
+        # steps that were not started because the run failed
+        self.avoided: list[str] = []
+        # steps that were still running when the run failed
+        self.abandoned: list[str] = []
+        # non-inline steps that were not needed for the targets
+        self.skipped: list[str] = []
+        self.start = time.perf_counter()
+        self.end = self.start
+
+    @property
+    def elapsed(self) -> float:
+        return self.end - self.start
+
+    def record(self, name: str, start: float):
+        self.timings[name] = (start, time.perf_counter())
+
+    def critical_path(self) -> list[tuple[str, float]]:
+        # chain of steps that finished last, each one waiting on the
+        # input that finished last, with the duration of every step
+        if not self.timings:
+            return []
+        name = max(self.timings, key=lambda n: self.timings[n][1])
+        path: list[tuple[str, float]] = []
+        while name is not None:
+            start, end = self.timings[name]
+            path.append((name, end - start))
+            inputs = [
+                i for i in self.graph.steps[name].inputs if i in self.timings
+            ]
+            name = max(inputs, key=lambda n: self.timings[n][1], default=None)
+        return path[::-1]
+
+
+class StepGraph:
+    def __init__(self, steps: Iterable[Step]):
+        self.steps: dict[str, Step] = {}
+        for step in steps:
+            if step.name in self.steps:
+                raise ValueError(f"Duplicate step {step.name!r}.")
+            self.steps[step.name] = step
+        self.order = self.sort()
+        self.runs = 0
+        self.failures = 0
+        # non-inline steps, i.e. requests, counted over all runs
+        self.avoided = 0
+        self.abandoned = 0
+        self._lock = threading.Lock()
+
+    def sort(self) -> list[str]:
+        order: list[str] = []
+        state: dict[str, bool] = {}
+
+        def visit(name: str):
+            if state.get(name) is False:
+                raise ValueError(f"Step {name!r} depends on itself.")
+            if name in state:
+                return
+            state[name] = False
+            for i in self.steps[name].inputs:
+                if i in self.steps:
+                    visit(i)
+            state[name] = True
+            order.append(name)
+
+        for name in self.steps:
+            visit(name)
+        return order
+
+    def get_required(
+        self, targets: Iterable[str], values: dict[str, Any]
+    ) -> set[str]:
+        # steps that have to run to compute targets from values
+        required: set[str] = set()
+        stack = [t for t in targets if t not in values]
+        while stack:
+            name = stack.pop()
+            if name in required:
+                continue
+            if name not in self.steps:
+                raise ValueError(f"Missing input {name!r}.")
+            required.add(name)
+            stack.extend(i for i in self.steps[name].inputs if i not in values)
+        return required
+
+    def stats(self):
+        with self._lock:
+            return {
+                "runs": self.runs,
+                "failures": self.failures,
+                "avoided": self.avoided,
+                "abandoned": self.abandoned,
+            }
+
+    def get_depths(self, required: set[str]) -> dict[str, int]:
+        # longest chain of non-inline steps starting at each step
+        depths: dict[str, int] = {}
+        for name in reversed(self.order):
+            if name not in required:
+                continue
+            depths[name] = int(not self.steps[name].inline) + max(
+                (
+                    depths[n]
+                    for n in required
+                    if n in depths and name in self.steps[n].inputs
+                ),
+                default=0,
+            )
+        return depths
+
+    def run(
+        self,
+        values: dict[str, Any],
+        targets: Optional[Iterable[str]] = None,
+        executor: Optional[Executor] = None,
+        fail_fast: bool = False,
+        gate_first: bool = False,
+        on_run: Optional[Callable[[GraphRun], None]] = None,
+        deadline: Optional[float] = None,
+        partial: bool = False,
+    ) -> GraphRun:
+        """
+        Run the steps needed for targets, all steps by default.
+        Each step is started as soon as its inputs are available.
+
+        The first exception raised by a step is re-raised after the
+        running steps have finished. With fail_fast, queued steps are
+        cancelled and running steps are abandoned instead.
+        With gate_first, only gate steps and their inputs are started
+        until every gate has passed.
+
+        deadline is a time.monotonic timestamp. Each step gets a share
+        of the remaining time, split evenly over the longest chain of
+        steps still ahead of it, and can read it with get_remaining().
+        Outstanding steps are cancelled or abandoned at the deadline.
+        DeadlineExceededError is raised then, unless partial is set.
+        With partial, errors of steps that are not gates are kept in
+        run.failed and the run goes on without their dependents.
+
+        on_run is called with the GraphRun, also when the run fails.
+        """
+        executor = executor or EXECUTOR
+        run = GraphRun(self, dict(values))
+        required = self.get_required(
+            self.steps if targets is None else targets, run.values
+        )
+        required.update(
+            name
+            for name, step in self.steps.items()
+            if step.gate
+            and name not in run.values
+            and all(i in required or i in run.values for i in step.inputs)
+        )
+        pending = [n for n in self.order if n in required]
+        run.skipped = [
+            n
+            for n in self.order
+            if not self.steps[n].inline and n not in required
+        ]
+        gates = [n for n in pending if self.steps[n].gate]
+        gated = self.get_required(gates, run.values) if gate_first else None
+        depths = self.get_depths(required)
+        running: dict[Future[Any], Step] = {}
+
+        def call(step: Step, step_deadline: Optional[float]):
+            start = time.perf_counter()
+            token = DEADLINE.set(step_deadline)
+            try:
+                return step.func(*[run.values[i] for i in step.inputs])
+            finally:
+                DEADLINE.reset(token)
+                run.record(step.name, start)
+
+        def get_step_deadline(step: Step):
+            if deadline is None:
+                return None
+            now = time.monotonic()
+            return now + (deadline - now) / max(depths[step.name], 1)
+
+        def is_ready(step: Step):
+            if not all(i in run.values for i in step.inputs):
+                return False
+            if gated is None or step.inline or step.name in gated:
+                return True
+            return all(g in run.values for g in gates)
+
+        def set_error(step: Step, e: Exception):
+            if partial and not step.gate:
+                run.failed[step.name] = e
+            else:
+                run.error = run.error or e
+
+        while run.error is None and (pending or running):
+            # pending is in topological order, so an inline step
+            # makes the steps after it ready in the same pass
+            for name in list(pending):
+                step = self.steps[name]
+                if not is_ready(step):
+                    continue
+                pending.remove(name)
+                if not step.inline:
+                    # steps see the context variables of the run, e.g.
+                    # the request slots of a SessionExecutor
+                    future = executor.submit(
+                        contextvars.copy_context().run,
+                        call,
+                        step,
+                        get_step_deadline(step),
+                    )
+                    running[future] = step
+                    continue
+                try:
+                    run.values[name] = call(step, None)
+                except Exception as e:
+                    set_error(step, e)
+                    if run.error is not None:
+                        break
+            if run.error is not None or not running:
+                break
+            timeout = None
+            if deadline is not None:
+                timeout = max(deadline - time.monotonic(), 0)
+            done, _ = wait(running, timeout, FIRST_COMPLETED)
+            if not done:
+                run.timed_out = True
+                if not partial:
+                    run.error = DeadlineExceededError(
+                        f"Deadline exceeded, waiting for {len(running)}"
+                        " steps."
+                    )
+                break
+            for future in done:
+                step = running.pop(future)
+                try:
+                    run.values[step.name] = future.result()
+                except Exception as e:
+                    set_error(step, e)
+        if run.timed_out or (run.error is not None and fail_fast):
+            for future, step in running.items():
+                if future.cancel():
+                    run.avoided.append(step.name)
+                else:
+                    run.abandoned.append(step.name)
+        else:
+            wait(running)
+        if run.error is not None or run.timed_out or run.failed:
+            run.avoided += [n for n in pending if not self.steps[n].inline]
+        run.end = time.perf_counter()
+        with self._lock:
+            self.runs += 1
+            self.failures += run.error is not None
+            self.avoided += len(run.avoided)
+            self.abandoned += len(run.abandoned)
+        if on_run is not None:
+            on_run(run)
+        if run.error is not None:
+            raise run.error
+        return run
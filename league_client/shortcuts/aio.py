@@ -0,0 +1,359 @@
+import asyncio
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Optional
+
+from league_client.constants import LEAGUE_CLIENT_AUTH_PARAMS
+from league_client.rso.aio.auth import get_entitlements_token
+from league_client.rso.aio.auth import get_ledge_token
+from league_client.rso.aio.auth import get_login_queue_token
+from league_client.rso.aio.auth import get_summoner_token
+from league_client.rso.aio.auth import login_using_credentials
+from league_client.rso.aio.client import AsyncRSOClient
+from league_client.rso.aio.honor import get_honor_data
+from league_client.rso.aio.inventory import get_inventory_data
+from league_client.rso.aio.inventory import get_inventory_data_v2
+from league_client.rso.aio.loot import get_loot_data
+from league_client.rso.aio.match import get_match_data
+from league_client.rso.aio.party import get_registered_party_restrictions
+from league_client.rso.aio.rank import get_rank_data
+from league_client.rso.aio.tokens import get_or_fetch
+from league_client.rso.aio.userinfo import get_userinfo
+from league_client.rso.auth import process_access_token
+from league_client.rso.constants import DISCOVEROUS_SERVICE_LOCATION
+from league_client.rso.constants import LEAGUE_EDGE_URL
+from league_client.rso.constants import PLAYER_PLATFORM_EDGE_URL
+from league_client.rso.constants import InventoryTypes
+from league_client.rso.honor import get_honor_level
+from league_client.rso.inventory import get_inventory_token
+from league_client.rso.inventory import get_inventory_token_v2
+from league_client.rso.loot import get_blue_essence_count
+from league_client.rso.loot import get_mythic_essence_count
+from league_client.rso.loot import get_orange_essence_count
+from league_client.rso.match import get_flash_key
+from league_client.rso.rank import get_ranked_overview_token
+from league_client.rso.rank import get_tier_division_wins_losses
+from league_client.rso.skin import get_skins
+from league_client.rso.tokens import TOKEN_CACHE
+from league_client.rso.tokens import TokenCache
+from league_client.shortcuts.rso import PARTY_INVENTORY_TYPES
+from league_client.shortcuts.rso import check_federated_identity
+from league_client.shortcuts.rso import get_checked_userinfo
+from league_client.shortcuts.rso import get_quickplay_wins_losses
+from league_client.shortcuts.rso import get_region
+from league_client.types import ProxyT
+
+
+async def gather(*aws: Awaitable[Any]) -> list[Any]:
+    # like asyncio.gather, but the first error cancels the other
+    # awaitables, as in a TaskGroup, and is raised as is
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in tasks:
+            if task.done() and not task.cancelled():
+                error = task.exception()
+                if error is not None:
+                    raise error
+        return [task.result() for task in tasks]
+    finally:
+        for task in tasks:
+            task.cancel()
+        # retrieves the errors of the cancelled tasks
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def get_party_inventory_token(
+    ledge_token: str,
+    puuid: str,
+    account_id: int,
+    ds_location: str,
+    ledge_url: str,
+    proxy: Optional[ProxyT] = None,
+    client: Optional[AsyncRSOClient] = None,
+    cache: Optional[TokenCache] = TOKEN_CACHE,
+) -> str:
+    async def fetch() -> str:
+        inventory_data = await get_inventory_data(
+            ledge_token,
+            puuid,
+            account_id,
+            ds_location,
+            ledge_url,
+            PARTY_INVENTORY_TYPES,
+            proxy,
+            client,
+        )
+        return get_inventory_token(inventory_data)
+
+    if cache is None:
+        return await fetch()
+    return await get_or_fetch(cache, puuid, "party_inventory", fetch)
+
+
+async def get_party_inventory_token_v2(
+    ledge_token: str,
+    puuid: str,
+    account_id: int,
+    ds_location: str,
+    ledge_url: str,
+    proxy: Optional[ProxyT] = None,
+    client: Optional[AsyncRSOClient] = None,
+    cache: Optional[TokenCache] = TOKEN_CACHE,
+) -> str:
+    async def fetch() -> str:
+        inventory_data = await get_inventory_data_v2(
+            ledge_token,
+            puuid,
+            account_id,
+            ds_location,
+            ledge_url,
+            [InventoryTypes.queue_entry],
+            proxy,
+            client,
+        )
+        return get_inventory_token_v2(inventory_data)
+
+    if cache is None:
+        return await fetch()
+    return await get_or_fetch(cache, puuid, "party_inventory_v2", fetch)
+
+
+async def get_account_rank_data(
+    ledge_token: str,
+    ledge_url: str,
+    puuid: str,
+    proxy: Optional[ProxyT] = None,
+    client: Optional[AsyncRSOClient] = None,
+    cache: Optional[TokenCache] = TOKEN_CACHE,
+) -> dict[str, Any]:
+    # the ranked overview token of the response is cached as well
+    rank_data = await get_rank_data(ledge_token, ledge_url, proxy, client)
+    if cache is not None:
+        token = get_ranked_overview_token(rank_data)
+        cache.set(puuid, "ranked_overview", token)
+    return rank_data
+
+
+async def get_account_ranked_overview_token(
+    ledge_token: str,
+    ledge_url: str,
+    puuid: str,
+    proxy: Optional[ProxyT] = None,
+    client: Optional[AsyncRSOClient] = None,
+    cache: Optional[TokenCache] = TOKEN_CACHE,
+) -> str:
+    async def fetch() -> str:
+        rank_data = await get_rank_data(ledge_token, ledge_url, proxy, client)
+        return get_ranked_overview_token(rank_data)
+
+    if cache is None:
+        return await fetch()
+    return await get_or_fetch(cache, puuid, "ranked_overview", fetch)
+
+
+async def get_account_data(
+    username: str,
+    password: str,
+    captcha_solver: Callable[[str, str], str | Awaitable[str]],
+    proxy: Optional[ProxyT] = None,
+    client: Optional[AsyncRSOClient] = None,
+):
+    """
+    Get account data using RSO on the running event loop.
+    Returns the same data as league_client.shortcuts.rso.get_account_data.
+
+    Every request starts as soon as its inputs are known and uses the
+    same token and party caches. The first error, e.g. an
+    AccountCheckError, cancels the requests that are still running.
+    """
+    (
+        _,
+        _,
+        access_token,
+        _,
+        _,
+        id_token,
+        _,
+        _,
+        _,
+    ) = await login_using_credentials(
+        username,
+        password,
+        captcha_solver,
+        LEAGUE_CLIENT_AUTH_PARAMS,
+        proxy=proxy,
+    )
+    puuid, region, account_id = process_access_token(access_token)
+    account_id = int(account_id)
+    ppedge_url = PLAYER_PLATFORM_EDGE_URL[region]
+    ledge_url = LEAGUE_EDGE_URL[region]
+    ds_location = DISCOVEROUS_SERVICE_LOCATION[region]
+
+    async def get_userinfo_token() -> tuple[str, dict[str, Any]]:
+        userinfo_token = str(await get_userinfo(access_token, proxy, client))
+        return userinfo_token, get_checked_userinfo(userinfo_token)
+
+    async def get_ledge() -> str:
+        # the account checks run before any ledge request
+        (userinfo_token, _), entitlements_token = await gather(
+            userinfo_task, entitlements_task
+        )
+        login_queue_token = await get_login_queue_token(
+            access_token,
+            userinfo_token,
+            entitlements_token,
+            region,
+            ppedge_url,
+            proxy,
+            client,
+        )
+        check_federated_identity(login_queue_token)
+        return await get_ledge_token(
+            login_queue_token, puuid, region, ppedge_url, proxy, client
+        )
+
+    async def get_party_tokens(ledge_token: str) -> dict[str, str]:
+        summoner_token, ranked_overview_token, token, token_v2 = await gather(
+            get_summoner_token(
+                ledge_token, puuid, region, ledge_url, proxy, client
+            ),
+            get_account_ranked_overview_token(
+                ledge_token, ledge_url, puuid, proxy, client
+            ),
+            get_party_inventory_token(
+                ledge_token,
+                puuid,
+                account_id,
+                ds_location,
+                ledge_url,
+                proxy,
+                client,
+            ),
+            get_party_inventory_token_v2(
+                ledge_token,
+                puuid,
+                account_id,
+                ds_location,
+                ledge_url,
+                proxy,
+                client,
+            ),
+        )
+        return {
+            "summoner_token": summoner_token,
+            "ranked_overview_token": ranked_overview_token,
+            "inventory_token": token,
+            "inventory_token_v2": token_v2,
+        }
+
+    async def get_party_restrictions() -> dict[str, Any]:
+        ledge_token = await ledge_task
+        (userinfo_token, _), entitlements_token = await gather(
+            userinfo_task, entitlements_task
+        )
+        return await get_registered_party_restrictions(
+            ledge_token,
+            ledge_url,
+            puuid,
+            account_id,
+            region,
+            id_token,
+            entitlements_token,
+            userinfo_token,
+            lambda: get_party_tokens(ledge_token),
+            proxy,
+            client,
+        )
+
+    async def get_champion_skin_inventory_data() -> dict[str, Any]:
+        return await get_inventory_data(
+            await ledge_task,
+            puuid,
+            account_id,
+            ds_location,
+            ledge_url,
+            [InventoryTypes.champion_skin],
+            proxy,
+            client,
+        )
+
+    async def get_ledge_data(
+        fetch: Callable[[str], Awaitable[dict[str, Any]]],
+    ) -> dict[str, Any]:
+        return await fetch(await ledge_task)
+
+    userinfo_task = asyncio.ensure_future(get_userinfo_token())
+    entitlements_task = asyncio.ensure_future(
+        get_entitlements_token(access_token, proxy, client)
+    )
+    ledge_task = asyncio.ensure_future(get_ledge())
+    (
+        (_, userinfo),
+        match_data,
+        loot_data,
+        rank_data,
+        honor_data,
+        champion_skin_inventory_data,
+        party_restrictions,
+        *_,
+    ) = await gather(
+        userinfo_task,
+        get_match_data(access_token, puuid, ppedge_url, proxy, 100, client),
+        get_ledge_data(
+            lambda t: get_loot_data(t, ledge_url, puuid, proxy, client)
+        ),
+        get_ledge_data(
+            lambda t: get_account_rank_data(t, ledge_url, puuid, proxy, client)
+        ),
+        get_ledge_data(lambda t: get_honor_data(t, ledge_url, proxy, client)),
+        get_champion_skin_inventory_data(),
+        get_party_restrictions(),
+        # cancelled as well when another request fails first
+        entitlements_task,
+        ledge_task,
+    )
+
+    account_data: dict[str, Any] = {}
+    account_data["puuid"] = puuid
+    account_data["country"] = userinfo["country"]
+    account_data["region"] = get_region(userinfo)
+    account_data["summoner_id"] = userinfo["lol_account"]["summoner_id"]
+    account_data["summoner_name"] = userinfo["lol_account"]["summoner_name"]
+    account_data["level"] = userinfo["lol_account"]["summoner_level"]
+    account_data["email_verified"] = userinfo["email_verified"]
+    account_data["phone_verified"] = userinfo["phone_number_verified"]
+
+    quickplay_wins, quickplay_losses = get_quickplay_wins_losses(
+        match_data, puuid
+    )
+    account_data["flash_key"] = get_flash_key(
+        match_data, account_data["summoner_id"]
+    )
+    account_data["quickplay_wins"] = quickplay_wins
+    account_data["quickplay_losses"] = quickplay_losses
+
+    account_data["blue_essence"] = get_blue_essence_count(loot_data)
+    account_data["orange_essence"] = get_orange_essence_count(loot_data)
+    account_data["mythic_essence"] = get_mythic_essence_count(loot_data)
+    tier, division, wins, losses = get_tier_division_wins_losses(rank_data)
+    account_data["tier"] = tier
+    account_data["division"] = division
+    account_data["wins"] = wins
+    account_data["losses"] = losses
+    account_data["honor_level"] = get_honor_level(honor_data)
+
+    owned_skins, normal_skins, permanent_skins = get_skins(
+        champion_skin_inventory_data, loot_data
+    )
+    account_data["owned_skins"] = owned_skins
+    account_data["normal_skins"] = normal_skins
+    account_data["permanent_skins"] = permanent_skins
+
+    # see league_client.shortcuts.rso.get_account_data
+    account_data["party_restrictions"] = party_restrictions[
+        "partyRestrictions"
+    ]
+    account_data["available_queues"] = party_restrictions["availableQueueIds"]
+    return account_data
@@ -1,19 +1,25 @@
-from concurrent.futures import ThreadPoolExecutor
-from concurrent.futures import as_completed
+import time
+from concurrent.futures import Executor
+from operator import itemgetter
 from typing import Any
 from typing import Callable
+from typing import Iterable
+from typing import Mapping
 from typing import Optional
 
 from league_client.constants import LEAGUE_CLIENT_AUTH_PARAMS
 from league_client.constants import RIOT_CLIENT_AUTH_PARAMS
 from league_client.exceptions import AccountCheckError
 from league_client.exceptions import AuthFailureError
+from league_client.exceptions import InvalidSessionError
 from league_client.rso.auth import get_entitlements_token
 from league_client.rso.auth import get_ledge_token
 from league_client.rso.auth import get_login_queue_token
 from league_client.rso.auth import get_summoner_token
 from league_client.rso.auth import login_using_credentials
+from league_client.rso.auth import login_using_ssid
 from league_client.rso.auth import process_access_token
+from league_client.rso.client import RSOClient
 from league_client.rso.constants import DISCOVEROUS_SERVICE_LOCATION
 from league_client.rso.constants import LEAGUE_EDGE_URL
 from league_client.rso.constants import PLAYER_PLATFORM_EDGE_URL
@@ -30,16 +36,21 @@ from league_client.rso.loot import get_mythic_essence_count
 from league_client.rso.loot import get_orange_essence_count
 from league_client.rso.match import get_flash_key
 from league_client.rso.match import get_match_data
-from league_client.rso.party import get_party_data
-from league_client.rso.party import get_party_id
-from league_client.rso.party import get_party_restrictions
+from league_client.rso.models import RSOSession
+from league_client.rso.party import get_registered_party_restrictions
 from league_client.rso.password import change_password_using_credentials
 from league_client.rso.rank import get_rank_data
 from league_client.rso.rank import get_ranked_overview_token
 from league_client.rso.rank import get_tier_division_wins_losses
 from league_client.rso.skin import get_skins
+from league_client.rso.tokens import TOKEN_CACHE
+from league_client.rso.tokens import TokenCache
 from league_client.rso.userinfo import get_userinfo
 from league_client.rso.utils import decode_token
+from league_client.scheduler import GraphRun
+from league_client.scheduler import Step
+from league_client.scheduler import StepGraph
+from league_client.scheduler import run_all
 from league_client.types import ProxyT
 
 
@@ -53,16 +64,643 @@ def get_internal_region_by_tag(region: str) -> str:
     return mapping.get(reg_u, reg_u)
 
 
+def check_account_restrictions(userinfo: dict[str, Any]):
+    restrictions = [r["type"] for r in userinfo["ban"]["restrictions"]]
+    if restrictions:
+        if "PERMANENT_BAN" in restrictions:
+            raise AccountCheckError("Account is permanently banned.")
+        if "TEXT_CHAT_RESTRICTION" in restrictions:
+            raise AccountCheckError("Account has chat restriction.")
+        if "TIME_BAN" in restrictions:
+            raise AccountCheckError("Account has time ban restriction.")
+        raise AccountCheckError("Account has game restrictions.")
+
+
+def check_federated_identity(login_queue_token: str):
+    login_queue_data = decode_token(login_queue_token)
+    if login_queue_data.get("federated_identity_providers"):
+        raise AccountCheckError("Account has third-party login providers")
+
+
+def get_quickplay_wins_losses(match_data: dict[str, Any], puuid: str):
+    quickplay_wins = 0
+    quickplay_losses = 0
+    for game in match_data["games"]:
+        if game["json"]["queueId"] == 490:
+            for participant in game["json"]["participants"]:
+                if participant["puuid"] == puuid:
+                    if participant["win"]:
+                        quickplay_wins += 1
+                    else:
+                        quickplay_losses += 1
+    return quickplay_wins, quickplay_losses
+
+
+def get_checked_userinfo(userinfo_token: str) -> dict[str, Any]:
+    userinfo = decode_token(userinfo_token)
+    check_account_restrictions(userinfo)
+    return userinfo
+
+
+def get_checked_login_queue_token(
+    access_token: str,
+    userinfo_token: str,
+    entitlements_token: str,
+    rso_region: str,
+    ppedge_url: str,
+    proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
+) -> str:
+    login_queue_token = get_login_queue_token(
+        access_token,
+        userinfo_token,
+        entitlements_token,
+        rso_region,
+        ppedge_url,
+        proxy,
+        client,
+    )
+    check_federated_identity(login_queue_token)
+    return login_queue_token
+
+
+def get_champion_skin_inventory_data(
+    ledge_token: str,
+    puuid: str,
+    account_id: int,
+    ds_location: str,
+    ledge_url: str,
+    proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
+):
+    return get_inventory_data(
+        ledge_token,
+        puuid,
+        account_id,
+        ds_location,
+        ledge_url,
+        [InventoryTypes.champion_skin],
+        proxy,
+        client,
+    )
+
+
+# inventory types of the party inventory token, champion skins included
+PARTY_INVENTORY_TYPES = [
+    InventoryTypes.champion,
+    InventoryTypes.champion_skin,
+    InventoryTypes.skin_border,
+    InventoryTypes.skin_augment,
+]
+
+
+def get_party_inventory_token(
+    ledge_token: str,
+    puuid: str,
+    account_id: int,
+    ds_location: str,
+    ledge_url: str,
+    proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
+    cache: Optional[TokenCache] = TOKEN_CACHE,
+) -> str:
+    def fetch() -> str:
+        inventory_data = get_inventory_data(
+            ledge_token,
+            puuid,
+            account_id,
+            ds_location,
+            ledge_url,
+            PARTY_INVENTORY_TYPES,
+            proxy,
+            client,
+        )
+        return get_inventory_token(inventory_data)
+
+    if cache is None:
+        return fetch()
+    return cache.get_or_fetch(puuid, "party_inventory", fetch)
+
+
+def get_party_inventory_token_v2(
+    ledge_token: str,
+    puuid: str,
+    account_id: int,
+    ds_location: str,
+    ledge_url: str,
+    proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
+    cache: Optional[TokenCache] = TOKEN_CACHE,
+) -> str:
+    def fetch() -> str:
+        inventory_data = get_inventory_data_v2(
+            ledge_token,
+            puuid,
+            account_id,
+            ds_location,
+            ledge_url,
+            [InventoryTypes.queue_entry],
+            proxy,
+            client,
+        )
+        return get_inventory_token_v2(inventory_data)
+
+    if cache is None:
+        return fetch()
+    return cache.get_or_fetch(puuid, "party_inventory_v2", fetch)
+
+
+def get_account_rank_data(
+    ledge_token: str,
+    ledge_url: str,
+    puuid: str,
+    proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
+    cache: Optional[TokenCache] = TOKEN_CACHE,
+) -> dict[str, Any]:
+    # the ranked overview token of the response is cached as well
+    rank_data = get_rank_data(ledge_token, ledge_url, proxy, client)
+    if cache is not None:
+        token = get_ranked_overview_token(rank_data)
+        cache.set(puuid, "ranked_overview", token)
+    return rank_data
+
+
+def get_account_ranked_overview_token(
+    ledge_token: str,
+    ledge_url: str,
+    puuid: str,
+    proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
+    cache: Optional[TokenCache] = TOKEN_CACHE,
+) -> str:
+    def fetch() -> str:
+        rank_data = get_rank_data(ledge_token, ledge_url, proxy, client)
+        return get_ranked_overview_token(rank_data)
+
+    if cache is None:
+        return fetch()
+    return cache.get_or_fetch(puuid, "ranked_overview", fetch)
+
+
+def get_account_party_restrictions(
+    ledge_token: str,
+    ledge_url: str,
+    puuid: str,
+    account_id: int,
+    rso_region: str,
+    ds_location: str,
+    id_token: str,
+    entitlements_token: str,
+    userinfo_token: str,
+    proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
+) -> dict[str, Any]:
+    # every input is known once ledge_token is, the tokens that only a
+    # new party registration needs are fetched concurrently when it is
+    # needed, a cached party only waits for the restrictions request
+    def get_tokens():
+        summoner_token, ranked_overview_token, token, token_v2 = run_all(
+            [
+                lambda: get_summoner_token(
+                    ledge_token, puuid, rso_region, ledge_url, proxy, client
+                ),
+                lambda: get_account_ranked_overview_token(
+                    ledge_token, ledge_url, puuid, proxy, client
+                ),
+                lambda: get_party_inventory_token(
+                    ledge_token,
+                    puuid,
+                    account_id,
+                    ds_location,
+                    ledge_url,
+                    proxy,
+                    client,
+                ),
+                lambda: get_party_inventory_token_v2(
+                    ledge_token,
+                    puuid,
+                    account_id,
+                    ds_location,
+                    ledge_url,
+                    proxy,
+                    client,
+                ),
+            ]
+        )
+        return {
+            "summoner_token": summoner_token,
+            "ranked_overview_token": ranked_overview_token,
+            "inventory_token": token,
+            "inventory_token_v2": token_v2,
+        }
+
+    return get_registered_party_restrictions(
+        ledge_token,
+        ledge_url,
+        puuid,
+        account_id,
+        rso_region,
+        id_token,
+        entitlements_token,
+        userinfo_token,
+        get_tokens,
+        proxy,
+        client,
+    )
+
+
+def login_using_ssid_or_credentials(
+    username: str,
+    password: str,
+    captcha_solver: Optional[Callable[[str, str], str]],
+    ssid: str,
+    clid: str,
+    proxy: Optional[ProxyT] = None,
+):
+    # a valid ssid needs a single request, credentials need a captcha
+    # and the full authorization flow
+    if ssid:
+        try:
+            return login_using_ssid(
+                ssid, clid, LEAGUE_CLIENT_AUTH_PARAMS, proxy
+            )
+        except InvalidSessionError:
+            if not username or captcha_solver is None:
+                raise
+    if captcha_solver is None:
+        raise AuthFailureError("Credentials are required.")
+    return login_using_credentials(
+        username,
+        password,
+        captcha_solver,
+        LEAGUE_CLIENT_AUTH_PARAMS,
+        proxy=proxy,
+    )
+
+
+def get_account_id(access_token_data: tuple[str, str, int]) -> int:
+    return int(access_token_data[2])
+
+
+def get_userinfo_token(
+    access_token: str,
+    proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
+) -> str:
+    return str(get_userinfo(access_token, proxy, client))
+
+
+def get_recent_match_data(
+    access_token: str,
+    puuid: str,
+    ppedge_url: str,
+    proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
+) -> dict[str, Any]:
+    return get_match_data(access_token, puuid, ppedge_url, proxy, 100, client)
+
+
+def get_region(userinfo: dict[str, Any]) -> str:
+    return get_internal_region_by_tag(userinfo["region"]["tag"])
+
+
+def get_summoner_id(userinfo: dict[str, Any]) -> int:
+    return userinfo["lol_account"]["summoner_id"]
+
+
+def get_summoner_name(userinfo: dict[str, Any]) -> str:
+    return userinfo["lol_account"]["summoner_name"]
+
+
+def get_summoner_level(userinfo: dict[str, Any]) -> int:
+    return userinfo["lol_account"]["summoner_level"]
+
+
+# every value get_account_data computes is a step named after it,
+# inline steps only parse data that is already available,
+# gate steps raise AccountCheckError
+ACCOUNT_DATA_GRAPH = StepGraph(
+    [
+        Step("login", login_using_ssid_or_credentials),
+        Step("access_token", itemgetter(2), ["login"], inline=True),
+        Step("id_token", itemgetter(5), ["login"], inline=True),
+        Step(
+            "access_token_data",
+            process_access_token,
+            ["access_token"],
+            inline=True,
+        ),
+        Step("puuid", itemgetter(0), ["access_token_data"], inline=True),
+        Step("rso_region", itemgetter(1), ["access_token_data"], inline=True),
+        Step("account_id", get_account_id, inline=True),
+        Step(
+            "ppedge_url",
+            PLAYER_PLATFORM_EDGE_URL.__getitem__,
+            ["rso_region"],
+            inline=True,
+        ),
+        Step(
+            "ledge_url",
+            LEAGUE_EDGE_URL.__getitem__,
+            ["rso_region"],
+            inline=True,
+        ),
+        Step(
+            "ds_location",
+            DISCOVEROUS_SERVICE_LOCATION.__getitem__,
+            ["rso_region"],
+            inline=True,
+        ),
+        Step("userinfo_token", get_userinfo_token),
+        Step("userinfo", get_checked_userinfo, inline=True, gate=True),
+        Step(
+            "entitlements_token",
+            get_entitlements_token,
+            ["access_token", "proxy", "client"],
+        ),
+        Step("login_queue_token", get_checked_login_queue_token, gate=True),
+        Step(
+            "ledge_token",
+            get_ledge_token,
+            [
+                "login_queue_token",
+                "puuid",
+                "rso_region",
+                "ppedge_url",
+                "proxy",
+                "client",
+            ],
+        ),
+        Step("match_data", get_recent_match_data),
+        Step(
+            "loot_data",
+            get_loot_data,
+            ["ledge_token", "ledge_url", "puuid", "proxy", "client"],
+        ),
+        Step(
+            "rank_data",
+            get_account_rank_data,
+            ["ledge_token", "ledge_url", "puuid", "proxy", "client"],
+        ),
+        Step(
+            "honor_data",
+            get_honor_data,
+            ["ledge_token", "ledge_url", "proxy", "client"],
+        ),
+        Step("champion_skin_inventory_data", get_champion_skin_inventory_data),
+        Step("party_restrictions_data", get_account_party_restrictions),
+        # account data
+        Step("country", itemgetter("country"), ["userinfo"], inline=True),
+        Step("region", get_region, inline=True),
+        Step("summoner_id", get_summoner_id, inline=True),
+        Step("summoner_name", get_summoner_name, inline=True),
+        Step("level", get_summoner_level, inline=True),
+        Step(
+            "email_verified",
+            itemgetter("email_verified"),
+            ["userinfo"],
+            inline=True,
+        ),
+        Step(
+            "phone_verified",
+            itemgetter("phone_number_verified"),
+            ["userinfo"],
+            inline=True,
+        ),
+        Step(
+            "flash_key",
+            get_flash_key,
+            ["match_data", "summoner_id"],
+            inline=True,
+        ),
+        Step(
+            "quickplay_wins_losses",
+            get_quickplay_wins_losses,
+            ["match_data", "puuid"],
+            inline=True,
+        ),
+        Step(
+            "quickplay_wins",
+            itemgetter(0),
+            ["quickplay_wins_losses"],
+            inline=True,
+        ),
+        Step(
+            "quickplay_losses",
+            itemgetter(1),
+            ["quickplay_wins_losses"],
+            inline=True,
+        ),
+        Step(
+            "tier_division_wins_losses",
+            get_tier_division_wins_losses,
+            ["rank_data"],
+            inline=True,
+        ),
+        Step(
+            "tier", itemgetter(0), ["tier_division_wins_losses"], inline=True
+        ),
+        Step(
+            "division",
+            itemgetter(1),
+            ["tier_division_wins_losses"],
+            inline=True,
+        ),
+        Step(
+            "wins", itemgetter(2), ["tier_division_wins_losses"], inline=True
+        ),
+        Step(
+            "losses",
+            itemgetter(3),
+            ["tier_division_wins_losses"],
+            inline=True,
+        ),
+        Step("honor_level", get_honor_level, ["honor_data"], inline=True),
+        Step(
+            "blue_essence",
+            get_blue_essence_count,
+            ["loot_data"],
+            inline=True,
+        ),
+        Step(
+            "orange_essence",
+            get_orange_essence_count,
+            ["loot_data"],
+            inline=True,
+        ),
+        Step(
+            "mythic_essence",
+            get_mythic_essence_count,
+            ["loot_data"],
+            inline=True,
+        ),
+        Step(
+            "skins",
+            get_skins,
+            ["champion_skin_inventory_data", "loot_data"],
+            inline=True,
+        ),
+        Step("owned_skins", itemgetter(0), ["skins"], inline=True),
+        Step("normal_skins", itemgetter(1), ["skins"], inline=True),
+        Step("permanent_skins", itemgetter(2), ["skins"], inline=True),
+        # playable queue could be missing from available_queues
+        # due to 'GAME_VERSION_NOT_SUPPORTED' restriction
+        # so use party_restrictions instead of available_queues
+        # check for restrictions: 'GAME_BASED_RANK_RESTRICTED' ...
+        Step(
+            "party_restrictions",
+            itemgetter("partyRestrictions"),
+            ["party_restrictions_data"],
+            inline=True,
+        ),
+        Step(
+            "available_queues",
+            itemgetter("availableQueueIds"),
+            ["party_restrictions_data"],
+            inline=True,
+        ),
+    ]
+)
+
+ACCOUNT_DATA_FIELDS = [
+    "puuid",
+    "country",
+    "region",
+    "summoner_id",
+    "summoner_name",
+    "level",
+    "email_verified",
+    "phone_verified",
+    "flash_key",
+    "tier",
+    "division",
+    "wins",
+    "losses",
+    "quickplay_wins",
+    "quickplay_losses",
+    "honor_level",
+    "blue_essence",
+    "orange_essence",
+    "mythic_essence",
+    "owned_skins",
+    "normal_skins",
+    "permanent_skins",
+    "party_restrictions",
+    "available_queues",
+]
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+# seconds a field of a snapshot stays fresh, see refresh_account_data
+ACCOUNT_DATA_TTLS = {
+    "puuid": 30 * DAY,
+    "country": DAY,
+    "region": 30 * DAY,
+    "summoner_id": 30 * DAY,
+    "summoner_name": HOUR,
+    "level": HOUR,
+    "email_verified": DAY,
+    "phone_verified": DAY,
+    "flash_key": HOUR,
+    "tier": HOUR,
+    "division": HOUR,
+    "wins": HOUR,
+    "losses": HOUR,
+    "quickplay_wins": HOUR,
+    "quickplay_losses": HOUR,
+    "honor_level": DAY,
+    "blue_essence": 10 * 60,
+    "orange_essence": 10 * 60,
+    "mythic_essence": 10 * 60,
+    "owned_skins": DAY,
+    "normal_skins": DAY,
+    "permanent_skins": DAY,
+    "party_restrictions": DAY,
+    "available_queues": DAY,
+}
+
+
+def run_account_data_graph(
+    values: dict[str, Any],
+    executor: Optional[Executor] = None,
+    on_run: Optional[Callable[[GraphRun], None]] = None,
+    fail_fast: bool = True,
+    gate_first: bool = False,
+    budget: Optional[float] = None,
+    partial: bool = False,
+    fields: Optional[Iterable[str]] = None,
+) -> dict[str, Any]:
+    # values are the inputs of the login step, proxy and client,
+    # see get_account_data for the other arguments
+    if fields is None:
+        fields = ACCOUNT_DATA_FIELDS
+    else:
+        selected = set(fields)
+        unknown = selected.difference(ACCOUNT_DATA_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields {sorted(unknown)}.")
+        fields = [f for f in ACCOUNT_DATA_FIELDS if f in selected]
+    run = ACCOUNT_DATA_GRAPH.run(
+        values,
+        fields,
+        executor,
+        fail_fast,
+        gate_first,
+        on_run,
+        None if budget is None else time.monotonic() + budget,
+        partial,
+    )
+    account_data = {f: run.values[f] for f in fields if f in run.values}
+    if partial:
+        account_data["missing_fields"] = [
+            f for f in fields if f not in run.values
+        ]
+    return account_data
+
+
 def get_account_data(
     username: str,
     password: str,
     captcha_solver: Callable[[str, str], str],
     proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
+    executor: Optional[Executor] = None,
+    on_run: Optional[Callable[[GraphRun], None]] = None,
+    fail_fast: bool = True,
+    gate_first: bool = False,
+    budget: Optional[float] = None,
+    partial: bool = False,
+    fields: Optional[Iterable[str]] = None,
 ):
     """
     Get account data using RSO.
     Takes ~20 seconds to complete.
 
+    Requests are scheduled by ACCOUNT_DATA_GRAPH on executor,
+    league_client.scheduler.EXECUTOR by default. on_run is called
+    with the GraphRun, e.g. to log run.critical_path().
+
+    If a step fails, e.g. with AccountCheckError, queued requests are
+    cancelled and running ones are not waited for, unless fail_fast is
+    False. gate_first delays all requests that the account checks do
+    not depend on until the checks have passed, which saves requests
+    for banned accounts at the cost of latency for good ones.
+    ACCOUNT_DATA_GRAPH.stats() counts the avoided requests.
+
+    budget is the time in seconds the whole call may take, each
+    request times out after its share of the remaining time.
+    DeadlineExceededError is raised when it runs out. With partial,
+    the fields available at that point are returned instead and
+    "missing_fields" lists the others, failed requests other than the
+    account checks also just leave their fields missing.
+
+    fields limits the result to the given keys of ACCOUNT_DATA_FIELDS,
+    only the requests these keys depend on are made, e.g. blue_essence
+    needs the token chain and get_loot_data but no match history,
+    inventory or party requests.
+
     Returns:
     {
         "puuid":"085e5d68-84a0-5488-bde3-1234567890as",
@@ -107,296 +745,148 @@ def get_account_data(
         ]
     }
     """
-    # account_data: for storing final data to be returned
-    account_data: dict[str, Any] = {}
-    # dat: for storing intermediate data
-    dat: dict[str, Any] = {}
-    params = LEAGUE_CLIENT_AUTH_PARAMS
-    (
-        _,
-        _,
-        access_token,
-        _,
-        _,
-        id_token,
-        _,
-        _,
-        _,
-    ) = login_using_credentials(
+    return run_account_data_graph(
+        {
+            "username": username,
+            "password": password,
+            "captcha_solver": captcha_solver,
+            "ssid": "",
+            "clid": "",
+            "proxy": proxy,
+            "client": client,
+        },
+        executor,
+        on_run,
+        fail_fast,
+        gate_first,
+        budget,
+        partial,
+        fields,
+    )
+
+
+def refresh_account_data(
+    username: str,
+    password: str,
+    captcha_solver: Callable[[str, str], str],
+    account_data: dict[str, Any],
+    ttls: Optional[Mapping[str, float]] = None,
+    proxy: Optional[ProxyT] = None,
+    client: Optional[RSOClient] = None,
+    executor: Optional[Executor] = None,
+    on_run: Optional[Callable[[GraphRun], None]] = None,
+    fail_fast: bool = True,
+    gate_first: bool = False,
+    budget: Optional[float] = None,
+    partial: bool = False,
+):
+    """
+    Get account data like get_account_data, reusing the fields of
+    account_data that are still fresh.
+
+    account_data is a snapshot, the dict this function returned last
+    time, or {} for the first call. It has the keys of
+    get_account_data and "fetched_at", the time.time() each field was
+    fetched at. A field older than its ttl in seconds, or missing, is
+    fetched again, ttls defaults to ACCOUNT_DATA_TTLS and fields
+    without ttl are always fetched. Data of get_account_data has no
+    fetch times, so it is fetched again completely.
+
+    If no field is stale no request is made. run.skipped, see on_run,
+    lists the requests that were skipped.
+    """
+    if ttls is None:
+        ttls = ACCOUNT_DATA_TTLS
+    now = time.time()
+    fetched_at: dict[str, float] = account_data.get("fetched_at", {})
+    stale = [
+        f
+        for f in ACCOUNT_DATA_FIELDS
+        if f not in account_data
+        or f not in fetched_at
+        or now - fetched_at[f] >= ttls.get(f, 0)
+    ]
+    fresh = get_account_data(
         username,
         password,
         captcha_solver,
-        params,
-        proxy=proxy,
+        proxy,
+        client,
+        executor,
+        on_run,
+        fail_fast,
+        gate_first,
+        budget,
+        partial,
+        stale,
     )
+    fresh.pop("missing_fields", None)
+    refreshed = {
+        f: fresh[f] if f in fresh else account_data[f]
+        for f in ACCOUNT_DATA_FIELDS
+        if f in fresh or f in account_data
+    }
+    refreshed["fetched_at"] = {
+        f: now if f in fresh else fetched_at[f]
+        for f in refreshed
+        if f in fresh or f in fetched_at
+    }
+    if partial:
+        refreshed["missing_fields"] = [
+            f for f in ACCOUNT_DATA_FIELDS if f not in refreshed
+        ]
+    return refreshed
 
-    with ThreadPoolExecutor(3) as executor:
-        future_proessat = executor.submit(process_access_token, access_token)
-        future_userinfo = executor.submit(get_userinfo, access_token, proxy)
-        future_entitlements = executor.submit(
-            get_entitlements_token, access_token, proxy
-        )
 
-        for future in as_completed(
-            [future_proessat, future_userinfo, future_entitlements]
-        ):
-            if future is future_proessat:
-                puuid, region, account_id = future.result()
-                account_data["puuid"] = puuid
-                dat["region"] = region
-                dat["account_id"] = int(account_id)
-                dat["ppedge_url"] = PLAYER_PLATFORM_EDGE_URL[region]
-                dat["ledge_url"] = LEAGUE_EDGE_URL[region]
-                dat["ds_location"] = DISCOVEROUS_SERVICE_LOCATION[region]
-
-            elif future is future_userinfo:
-                dat["userinfo_token"] = str(future.result())
-                userinfo = decode_token(dat["userinfo_token"])
-                restrictions = [
-                    r["type"] for r in userinfo["ban"]["restrictions"]
-                ]
-                if restrictions:
-                    if "PERMANENT_BAN" in restrictions:
-                        raise AccountCheckError(
-                            "Account is permanently banned."
-                        )
-                    if "TEXT_CHAT_RESTRICTION" in restrictions:
-                        raise AccountCheckError(
-                            "Account has chat restriction."
-                        )
-                    if "TIME_BAN" in restrictions:
-                        raise AccountCheckError(
-                            "Account has time ban restriction."
-                        )
-                    raise AccountCheckError("Account has game restrictions.")
-                account_data["country"] = userinfo["country"]
-                region_tag = userinfo["region"]["tag"]
-                account_data["region"] = get_internal_region_by_tag(region_tag)
-                account_data["summoner_id"] = userinfo["lol_account"][
-                    "summoner_id"
-                ]
-                account_data["summoner_name"] = userinfo["lol_account"][
-                    "summoner_name"
-                ]
-                account_data["level"] = userinfo["lol_account"][
-                    "summoner_level"
-                ]
-                account_data["email_verified"] = userinfo["email_verified"]
-                account_data["phone_verified"] = userinfo[
-                    "phone_number_verified"
-                ]
-
-            elif future is future_entitlements:
-                dat["entitlements_token"] = str(future.result())
-
-    with ThreadPoolExecutor(2) as executor:
-        future_loginq = executor.submit(
-            get_login_queue_token,
-            access_token,
-            dat["userinfo_token"],
-            dat["entitlements_token"],
-            dat["region"],
-            dat["ppedge_url"],
-            proxy,
-        )
-        future_match = executor.submit(
-            get_match_data,
-            access_token,
-            account_data["puuid"],
-            dat["ppedge_url"],
-            proxy,
-            100,
-        )
+def get_account_data_from_session(
+    session: RSOSession,
+    username: str = "",
+    password: str = "",
+    captcha_solver: Optional[Callable[[str, str], str]] = None,
+    client: Optional[RSOClient] = None,
+    executor: Optional[Executor] = None,
+    on_run: Optional[Callable[[GraphRun], None]] = None,
+    fail_fast: bool = True,
+    gate_first: bool = False,
+    budget: Optional[float] = None,
+    partial: bool = False,
+    fields: Optional[Iterable[str]] = None,
+):
+    """
+    Get account data like get_account_data, but log in with the ssid
+    and clid of session, which takes one request instead of the full
+    authorization flow. Credentials are only used when the session is
+    no longer valid, without them InvalidSessionError is raised.
 
-        for future in as_completed([future_loginq, future_match]):
-            if future is future_loginq:
-                login_queue_token = future.result()
-                login_queue_data = decode_token(login_queue_token)
-                if login_queue_data.get("federated_identity_providers"):
-                    raise AccountCheckError(
-                        "Account has third-party login providers"
-                    )
-                dat["ledge_token"] = get_ledge_token(
-                    login_queue_token,
-                    account_data["puuid"],
-                    dat["region"],
-                    dat["ppedge_url"],
-                    proxy,
-                )
-                dat["summoner_token"] = get_summoner_token(
-                    dat["ledge_token"],
-                    account_data["puuid"],
-                    dat["region"],
-                    dat["ledge_url"],
-                    proxy,
-                )
-
-            elif future is future_match:
-                match_data = future.result()
-                quickplay_wins = 0
-                quickplay_losses = 0
-                puuid = account_data["puuid"]
-
-                for game in match_data["games"]:
-                    if game["json"]["queueId"] == 490:
-                        for participant in game["json"]["participants"]:
-                            if participant["puuid"] == puuid:
-                                if participant["win"]:
-                                    quickplay_wins += 1
-                                else:
-                                    quickplay_losses += 1
-
-                flash_key = get_flash_key(
-                    match_data, account_data["summoner_id"]
-                )
-                account_data["flash_key"] = flash_key
-                account_data["quickplay_wins"] = quickplay_wins
-                account_data["quickplay_losses"] = quickplay_losses
-
-    with ThreadPoolExecutor(6) as executor:
-        future_loot = executor.submit(
-            get_loot_data,
-            dat["ledge_token"],
-            dat["ledge_url"],
-            account_data["puuid"],
-            proxy,
-        )
-        future_rank = executor.submit(
-            get_rank_data, dat["ledge_token"], dat["ledge_url"], proxy
-        )
-        future_honor = executor.submit(
-            get_honor_data, dat["ledge_token"], dat["ledge_url"], proxy
-        )
-        future_skin_inventory = executor.submit(
-            get_inventory_data,
-            dat["ledge_token"],
-            account_data["puuid"],
-            dat["account_id"],
-            dat["ds_location"],
-            dat["ledge_url"],
-            [InventoryTypes.champion_skin],
-            proxy,
-        )
-        future_party_inventory1 = executor.submit(
-            get_inventory_data,
-            dat["ledge_token"],
-            account_data["puuid"],
-            dat["account_id"],
-            dat["ds_location"],
-            dat["ledge_url"],
-            [
-                InventoryTypes.champion,
-                InventoryTypes.champion_skin,
-                InventoryTypes.skin_border,
-                InventoryTypes.skin_augment,
-            ],
-            proxy,
-        )
-        future_party_inventory2 = executor.submit(
-            get_inventory_data_v2,
-            dat["ledge_token"],
-            account_data["puuid"],
-            dat["account_id"],
-            dat["ds_location"],
-            dat["ledge_url"],
-            [InventoryTypes.queue_entry],
-            proxy,
-        )
+    session is updated with the new ssid and tokens, also if a later
+    request fails. Requests use the shared CLIENT_POOL unless client
+    is given, e.g. session.get_client().
+    """
 
-        for future in as_completed(
-            [
-                future_loot,
-                future_rank,
-                future_honor,
-                future_skin_inventory,
-                future_party_inventory1,
-                future_party_inventory2,
-            ]
-        ):
-            if future is future_loot:
-                dat["loot_data"] = future.result()
-                be = get_blue_essence_count(dat["loot_data"])
-                oe = get_orange_essence_count(dat["loot_data"])
-                me = get_mythic_essence_count(dat["loot_data"])
-                account_data["blue_essence"] = be
-                account_data["orange_essence"] = oe
-                account_data["mythic_essence"] = me
-
-            elif future is future_rank:
-                rank_data = future.result()
-                tier, division, wins, losses = get_tier_division_wins_losses(
-                    rank_data
-                )
-                account_data["tier"] = tier
-                account_data["division"] = division
-                account_data["wins"] = wins
-                account_data["losses"] = losses
-
-                dat["ranked_overview_token"] = get_ranked_overview_token(
-                    rank_data,
-                )
-
-            elif future is future_honor:
-                honor_data = future.result()
-                honor_level = get_honor_level(honor_data)
-                account_data["honor_level"] = honor_level
-
-            elif future is future_skin_inventory:
-                dat["champion_skin_inventory_data"] = future.result()
-
-            elif future is future_party_inventory1:
-                dat["party_inventory_token1"] = get_inventory_token(
-                    future.result()
-                )
-
-            elif future is future_party_inventory2:
-                dat["party_inventory_token2"] = get_inventory_token_v2(
-                    future.result()
-                )
-
-    owned_skins, normal_skins, permanent_skins = get_skins(
-        dat["champion_skin_inventory_data"], dat["loot_data"]
-    )
-    account_data["owned_skins"] = owned_skins
-    account_data["normal_skins"] = normal_skins
-    account_data["permanent_skins"] = permanent_skins
-
-    party_data = get_party_data(
-        dat["ledge_token"],
-        dat["ledge_url"],
-        account_data["puuid"],
-        dat["account_id"],
-        dat["region"],
-        id_token,
-        dat["entitlements_token"],
-        dat["userinfo_token"],
-        dat["summoner_token"],
-        dat["ranked_overview_token"],
-        dat["party_inventory_token1"],
-        dat["party_inventory_token2"],
-    )
-    party_id = get_party_id(party_data)
-    party_restrictions = get_party_restrictions(
-        dat["ledge_token"],
-        dat["ledge_url"],
-        party_id,
-    )
-    account_data["party_restrictions"] = party_restrictions[
-        "partyRestrictions"
-    ]
-    #   {
-    #     "accountId": ...,
-    #     "reason": "GAME_BASED_RANK_RESTRICTED",
-    #     "queueId": 420
-    #     ...
-    #   }
-    # playable queue could be missing from available_queues
-    # due to 'GAME_VERSION_NOT_SUPPORTED' restriction
-    # so use party_restrictions instead of available_queues
-    # check for restrictions: 'GAME_BASED_RANK_RESTRICTED' ...
-    account_data["available_queues"] = party_restrictions["availableQueueIds"]
+    def update_session(run: GraphRun):
+        if "login" in run.values:
+            session.update_login(run.values["login"])
+        if on_run is not None:
+            on_run(run)
 
-    return account_data
+    return run_account_data_graph(
+        {
+            "username": username,
+            "password": password,
+            "captcha_solver": captcha_solver,
+            "ssid": session.ssid,
+            "clid": session.clid,
+            "proxy": session.proxy,
+            "client": client,
+        },
+        executor,
+        update_session,
+        fail_fast,
+        gate_first,
+        budget,
+        partial,
+        fields,
+    )
 
 
 def check_password(
@@ -2,8 +2,10 @@ import httpx
 from tenacity import retry
 from tenacity import retry_if_exception_type
 from tenacity import stop_after_attempt
+from tenacity import wait_random_exponential
 
 retry_on_read_timeout = retry(
     stop=stop_after_attempt(5),
+    wait=wait_random_exponential(multiplier=0.1, max=2),
     retry=retry_if_exception_type(httpx.ReadTimeout),
 )